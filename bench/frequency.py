@@ -0,0 +1,86 @@
+"""Compare per-guess latency of the pure Python and vectorized frequency guessers.
+
+Usage:
+    python -m bench.frequency [-f WORDFILE] [-n GAMES] [-s SEED]
+"""
+import argparse
+import random
+
+from guessers import FrequentLetterGuesser, VectorizedFrequentLetterGuesser
+from index import WordIndex
+from instrumentation import Instrumentation
+from run import load_words
+from simulation import play_game
+
+
+class GuessTimer(Instrumentation):
+    """Keeps the duration of each call to `guess`, ignoring all other measurements"""
+
+    def __init__(self):
+        super().__init__()
+        self.guess_durations = []
+
+    def time(self, phase, duration):
+        if phase == 'guess':
+            self.guess_durations.append(duration)
+
+    def count(self, name, amount=1):
+        pass
+
+    def observe(self, name, value):
+        pass
+
+
+def time_guesses(guesser_class, words, word_index, count_words, max_guesses=8):
+    """Play one game per word, timing each call to `guess`.
+
+    Args:
+        guesser_class (type): a FrequentLetterGuesser class
+        words (list of str): the words to guess
+        word_index (WordIndex): all potential words to guess
+        count_words (bool): whether to count words containing each letter,
+            rather than letter occurrences
+        max_guesses (int): a maximum number of guesses allowed per game
+
+    Return:
+        list of float: the duration of each guess, in seconds
+    """
+    guesser_class = type(guesser_class.__name__, (guesser_class,), {'count_words': count_words})
+    timer = GuessTimer()
+    for word in words:
+        play_game(guesser_class, word, word_index, max_guesses, instrumentation=timer)
+    return timer.guess_durations
+
+
+def summarize(durations):
+    durations = sorted(durations)
+    return 'median {:.3f}ms, p95 {:.3f}ms, mean {:.3f}ms over {} guesses'.format(
+        durations[len(durations) // 2] * 1000,
+        durations[int(len(durations) * 0.95)] * 1000,
+        sum(durations) / len(durations) * 1000,
+        len(durations),
+    )
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('-f', '--wordfile', default='/usr/share/dict/words')
+    parser.add_argument('-n', '--games', type=int, default=200)
+    parser.add_argument('-s', '--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    all_words = load_words(args.wordfile)
+    word_index = WordIndex(all_words)
+    words = random.Random(args.seed).sample(all_words, args.games)
+    for length in {len(word) for word in words}:
+        # Build bitsets and letter code matrices ahead of timing
+        word_index.bucket(length).prepare()
+
+    for guesser_class in (FrequentLetterGuesser, VectorizedFrequentLetterGuesser):
+        for count_words in (False, True):
+            durations = time_guesses(guesser_class, words, word_index, count_words)
+            print('{} (count_words={}): {}'.format(
+                guesser_class.__name__,
+                count_words,
+                summarize(durations),
+            ))
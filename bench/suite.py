@@ -0,0 +1,304 @@
+"""Benchmark every guesser and compare the results against a saved baseline.
+
+For each guesser in run.GUESSERS (but the manual one), each dictionary size
+and each seed, games are played on words sampled with that seed, measuring:
+the time to construct a guesser (cold, right after clearing caches, and the
+median of the rest), the wall time of each turn, the peak memory allocated
+over a few games, and the win rate.
+
+Usage:
+    python -m bench.suite [-f WORDFILE] [-n GAMES] [--seeds SEED ...]
+        [--sizes SIZE ...] [-g GUESSER ...] [-o RESULTS] [-b BASELINE]
+        [--tolerance RATIO]
+"""
+import argparse
+import json
+import platform
+import random
+import sys
+import tracemalloc
+
+import numpy as np
+
+from corpus import read_words
+from guessers.cache import DECISION_CACHE, MODEL_CACHE
+from index import WordIndex
+from instrumentation import Instrumentation
+from run import GUESSERS
+from simulation import percentile, play_game, sample_targets
+
+
+# Metrics for which a higher value is a regression, and those for which a
+# lower value is; all others are informative only
+HIGHER_IS_WORSE = (
+    'construct_cold_ms',
+    'construct_median_ms',
+    'guess_p50_ms',
+    'guess_p90_ms',
+    'guess_p99_ms',
+    'peak_memory_kb',
+)
+LOWER_IS_WORSE = ('win_rate',)
+
+# Win rates are compared in absolute terms, as they are already ratios
+WIN_RATE_TOLERANCE = 0.02
+
+
+class ConstructionTimer(Instrumentation):
+    """Keeps the duration of the last guesser construction, ignoring all other measurements"""
+
+    construct_duration = None
+
+    def time(self, phase, duration):
+        if phase == 'construct':
+            self.construct_duration = duration
+
+    def count(self, name, amount=1):
+        pass
+
+    def observe(self, name, value):
+        pass
+
+
+def play_timed(guesser_class, word, word_index, max_guesses):
+    """Play a single game, timing the guesser's construction and each turn.
+
+    Return:
+        a (construction duration, list of turn durations, has won) tuple,
+        with durations in seconds
+    """
+    timer = ConstructionTimer()
+    result = play_game(guesser_class, word, word_index, max_guesses, instrumentation=timer)
+    return timer.construct_duration, result.guess_durations, result.has_won
+
+
+def measure_peak_memory(guesser_class, targets, word_index, max_guesses):
+    """Measure the peak memory allocated while playing some games from cold caches.
+
+    Return:
+        int: the peak number of bytes allocated
+    """
+    MODEL_CACHE.clear()
+    DECISION_CACHE.clear()
+    tracemalloc.start()
+    try:
+        for word in targets:
+            play_timed(guesser_class, word, word_index, max_guesses)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def bench_guesser(guesser_class, word_index, seeds, n_games, max_guesses=8, memory_games=5):
+    """Benchmark a guesser over games on words sampled with each seed.
+
+    Args:
+        guesser_class (type): a class inheriting from guessers.base.BaseGuesser
+        word_index (WordIndex): all potential words to guess
+        seeds (iterable of int): seeds for the selection of words and guesses
+        n_games (int): the number of games to play per seed
+        max_guesses (int): a maximum number of guesses allowed per game
+        memory_games (int): the number of games over which to measure peak memory
+
+    Return:
+        a {str: float} dict of metrics
+    """
+    cold_durations = []
+    construct_durations = []
+    guess_durations = []
+    peak_memory = 0
+    wins = 0
+    games = 0
+    for seed in seeds:
+        targets = sample_targets(word_index, n_games, seed)
+        for length in {len(word) for word in targets}:
+            # Build the index's lazy structures outside of measurements
+            word_index.bucket(length).prepare()
+
+        peak_memory = max(
+            peak_memory,
+            measure_peak_memory(guesser_class, targets[:memory_games], word_index, max_guesses),
+        )
+
+        MODEL_CACHE.clear()
+        DECISION_CACHE.clear()
+        random.seed(seed)
+        for game_number, word in enumerate(targets):
+            construct_duration, durations, has_won = play_timed(
+                guesser_class,
+                word,
+                word_index,
+                max_guesses,
+            )
+            if game_number:
+                construct_durations.append(construct_duration)
+            else:
+                cold_durations.append(construct_duration)
+            guess_durations.extend(durations)
+            wins += has_won
+            games += 1
+
+    construct_durations.sort()
+    guess_durations.sort()
+    return {
+        'games': games,
+        'win_rate': wins / games if games else 0.0,
+        'mean_guess_count': len(guess_durations) / games if games else 0.0,
+        'construct_cold_ms': _milliseconds(max(cold_durations, default=0)),
+        'construct_median_ms': _milliseconds(percentile(construct_durations, 50)),
+        'guess_p50_ms': _milliseconds(percentile(guess_durations, 50)),
+        'guess_p90_ms': _milliseconds(percentile(guess_durations, 90)),
+        'guess_p99_ms': _milliseconds(percentile(guess_durations, 99)),
+        'peak_memory_kb': round(peak_memory / 1024, 1),
+    }
+
+
+def _milliseconds(duration):
+    return round((duration or 0) * 1000, 4)
+
+
+def run_suite(guesser_names, words, sizes, seeds, n_games, max_guesses=8):
+    """Benchmark guessers over dictionaries of several sizes.
+
+    Args:
+        guesser_names (iterable of str): keys of run.GUESSERS to benchmark
+        words (list of str): all words, from which smaller dictionaries are
+            sampled
+        sizes (iterable of int): dictionary sizes; 0 stands for all words
+        seeds (iterable of int): seeds for the selection of words and guesses
+        n_games (int): the number of games to play per seed
+        max_guesses (int): a maximum number of guesses allowed per game
+
+    Return:
+        a {str: dict} dict of '<guesser>@<size>' keys to metrics
+    """
+    results = {}
+    for size in sizes:
+        if size and size < len(words):
+            dictionary = random.Random(size).sample(words, size)
+        else:
+            dictionary = words
+        word_index = WordIndex(dictionary)
+        for guesser_name in guesser_names:
+            key = '{}@{}'.format(guesser_name, len(dictionary))
+            results[key] = bench_guesser(
+                GUESSERS[guesser_name],
+                word_index,
+                seeds,
+                n_games,
+                max_guesses,
+            )
+    return results
+
+
+def compare(results, baseline, tolerance=0.2):
+    """Flag metrics that regressed from a baseline.
+
+    Args:
+        results (dict): metrics per benchmark, as returned by run_suite
+        baseline (dict): the same, from a previous run
+        tolerance (float): the relative increase of durations and memory
+            tolerated before flagging them
+
+    Return:
+        list of str: a description of each regression
+    """
+    regressions = []
+    for key in sorted(set(results) & set(baseline)):
+        metrics, baseline_metrics = results[key], baseline[key]
+        for metric in HIGHER_IS_WORSE:
+            value, baseline_value = metrics.get(metric), baseline_metrics.get(metric)
+            if value is None or not baseline_value:
+                continue
+            if value > baseline_value * (1 + tolerance):
+                regressions.append('{} {}: {} -> {} (+{:.0%})'.format(
+                    key,
+                    metric,
+                    baseline_value,
+                    value,
+                    value / baseline_value - 1,
+                ))
+        for metric in LOWER_IS_WORSE:
+            value, baseline_value = metrics.get(metric), baseline_metrics.get(metric)
+            if value is None or baseline_value is None:
+                continue
+            if value < baseline_value - WIN_RATE_TOLERANCE:
+                regressions.append('{} {}: {:.3f} -> {:.3f}'.format(
+                    key,
+                    metric,
+                    baseline_value,
+                    value,
+                ))
+    return regressions
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('-f', '--wordfile', default='/usr/share/dict/words')
+    parser.add_argument('-n', '--games', type=int, default=100)
+    parser.add_argument('-c', '--count', type=int, default=8)
+    parser.add_argument('--seeds', type=int, nargs='+', default=[0, 1, 2])
+    parser.add_argument(
+        '--sizes',
+        type=int,
+        nargs='+',
+        default=[1000, 0],
+        help='dictionary sizes to sample; 0 for the whole word file'
+    )
+    parser.add_argument(
+        '-g',
+        '--guesser',
+        nargs='+',
+        choices=[name for name in GUESSERS if name != 'manual'],
+        help='names of the guessers to benchmark; defaults to all'
+    )
+    parser.add_argument('-o', '--output', help='path of a JSON file to write results to')
+    parser.add_argument('-b', '--baseline', help='path of a JSON results file to compare against')
+    parser.add_argument(
+        '--tolerance',
+        type=float,
+        default=0.2,
+        help='relative increase in durations and memory tolerated by the comparison'
+    )
+    args = parser.parse_args()
+
+    guesser_names = args.guesser or [name for name in GUESSERS if name != 'manual']
+    results = run_suite(
+        guesser_names,
+        list(read_words(args.wordfile)),
+        args.sizes,
+        args.seeds,
+        args.games,
+        args.count,
+    )
+    for key, metrics in results.items():
+        print('{}: {}'.format(key, ', '.join(
+            '{} {}'.format(metric, value) for metric, value in metrics.items()
+        )))
+
+    if args.output:
+        with open(args.output, 'w') as output_file:
+            json.dump(
+                {
+                    'meta': {
+                        'wordfile': args.wordfile,
+                        'games': args.games,
+                        'seeds': args.seeds,
+                        'sizes': args.sizes,
+                        'python': platform.python_version(),
+                        'numpy': np.__version__,
+                    },
+                    'results': results,
+                },
+                output_file,
+                indent=2,
+            )
+
+    if args.baseline:
+        with open(args.baseline) as baseline_file:
+            regressions = compare(results, json.load(baseline_file)['results'], args.tolerance)
+        for regression in regressions:
+            print('REGRESSION {}'.format(regression))
+        if regressions:
+            sys.exit(1)
+        print('No regressions against {}'.format(args.baseline))
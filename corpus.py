@@ -0,0 +1,132 @@
+import string
+import unicodedata
+
+
+# Letters allowed in words by default
+DEFAULT_ALPHABET = frozenset(string.ascii_lowercase)
+
+
+def normalize_word(word):
+    """Lowercase a word and strip accents from its letters (e.g. 'Café' -> 'cafe')"""
+    decomposed = unicodedata.normalize('NFKD', word.lower())
+    return ''.join(
+        character
+        for character in decomposed
+        if not unicodedata.combining(character)
+    )
+
+
+def stream_words(lines, alphabet=DEFAULT_ALPHABET):
+    """Lazily parse unique, normalized words from lines of text.
+
+    Each whitespace-delimited token is normalized, and dropped if it
+    contains anything outside the alphabet (apostrophes, hyphens, digits) or
+    has been seen before. Only one line and the set of unique words are held
+    in memory at a time.
+
+    Args:
+        lines (iterable of str): lines of text, e.g. an open file
+        alphabet (collection of str): the letters words may contain
+
+    Yield:
+        str
+    """
+    alphabet = frozenset(alphabet)
+    seen = set()
+    for line in lines:
+        for token in line.split():
+            word = _filter_word(token, alphabet)
+            if word is not None and word not in seen:
+                seen.add(word)
+                yield word
+
+
+def stream_weighted_words(lines, alphabet=DEFAULT_ALPHABET):
+    """Lazily parse unique, normalized words and their counts from lines of text.
+
+    Each line holds a word, optionally followed by a tab and its integer
+    count (e.g. its number of occurrences in a corpus); a missing count
+    stands for 1. Words are normalized and filtered as by `stream_words`,
+    and only the first occurrence of a word is kept, so frequency lists
+    sorted by count keep the count of their most frequent spelling. Lines
+    whose count is not a non-negative integer (e.g. a header, a fractional
+    count or extra columns) are skipped.
+
+    Args:
+        lines (iterable of str): lines of text, e.g. an open file
+        alphabet (collection of str): the letters words may contain
+
+    Yield:
+        (str, int) tuples
+    """
+    alphabet = frozenset(alphabet)
+    seen = set()
+    for line in lines:
+        token, _, count = line.partition('\t')
+        word = _filter_word(token.strip(), alphabet)
+        if not word or word in seen:
+            continue
+        count = _parse_count(count)
+        if count is None:
+            continue
+        seen.add(word)
+        yield word, count
+
+
+def _parse_count(count):
+    """Parse the count of a weighted word, returning None if it is malformed"""
+    count = count.strip()
+    if not count:
+        return 1
+    try:
+        count = int(count)
+    except ValueError:
+        return None
+    return count if count >= 0 else None
+
+
+def _filter_word(token, alphabet):
+    """Normalize a token, returning None if it contains letters outside the alphabet"""
+    word = token.lower()
+    if not alphabet.issuperset(word):
+        word = normalize_word(word)
+        if not alphabet.issuperset(word):
+            return None
+    return word
+
+
+def read_words(file_path, alphabet=DEFAULT_ALPHABET):
+    """Lazily parse unique, normalized words from a file.
+
+    Args:
+        file_path (str): path to a file of whitespace-delimited words
+        alphabet (collection of str): the letters words may contain
+
+    Yield:
+        str
+    """
+    with open(file_path, encoding='utf-8', errors='replace') as word_file:
+        yield from stream_words(word_file, alphabet)
+
+
+def read_weighted_words(file_path, alphabet=DEFAULT_ALPHABET):
+    """Lazily parse unique, normalized words and their counts from a file.
+
+    Args:
+        file_path (str): path to a file of `word<TAB>count` lines
+        alphabet (collection of str): the letters words may contain
+
+    Yield:
+        (str, int) tuples
+    """
+    with open(file_path, encoding='utf-8', errors='replace') as word_file:
+        yield from stream_weighted_words(word_file, alphabet)
+
+
+def is_weighted(file_path):
+    """Check whether a word file holds `word<TAB>count` lines"""
+    with open(file_path, encoding='utf-8', errors='replace') as word_file:
+        for line in word_file:
+            if line.strip():
+                return '\t' in line
+    return False
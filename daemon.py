@@ -0,0 +1,309 @@
+"""Keep a word index, trained models and worker processes warm across simulations.
+
+Each `python run.py --games N` run reads and indexes its word file, trains
+its models and starts its worker processes before playing its first game.
+The daemon does all of this once, then plays the simulations submitted on
+its Unix socket, e.g. by `python run.py --daemon PATH --games N`.
+
+Clients send one job per line, as a JSON object, and get one JSON object
+back per job:
+
+    {"guessers": ["frequent", "markov2"], "games": 1000, "count": 8, "seed": 0,
+     "sweep": false, "lockstep": false, "adversarial": false, "word_penalty": 1,
+     "instrument": false}
+
+All keys are optional. Guessers default to all of run.GUESSERS but the
+manual one, games to 100, the number of guesses allowed to 8, and the
+failures counted for a wrong word guess to 1. A
+successful reply is `{"results": [RESULT, ...], "duration_ms": MS}`, with
+one result per guesser, in the order requested:
+
+    {"guesser": NAME, "summary": TEXT, "game_count": N, "win_rate": RATE,
+     "mean_guess_count": MEAN, "instrumentation": MEASUREMENTS or null}
+
+An invalid or failed job gets `{"error": MESSAGE}`. Jobs are played one at
+a time, each spread across all worker processes.
+
+Usage:
+    python daemon.py --socket PATH [-f WORDFILE] [-a ALPHABET] [-p PROCESSES]
+        [--warm GUESSER ...] [--budget MS] [-m MODEL_CACHE] [-t TABLE]
+"""
+import argparse
+import asyncio
+import functools
+import json
+import os
+import signal
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from corpus import DEFAULT_ALPHABET
+from guessers.base import BaseGuesser
+from guessers.cache import MODEL_CACHE
+from instrumentation import Instrumentation
+from run import GUESSERS, evaluate_guessers, load_word_index
+from simulation import start_pool
+
+
+# Keys of a job, and their default values
+JOB_DEFAULTS = {
+    'guessers': None,
+    'games': 100,
+    'count': 8,
+    'seed': None,
+    'sweep': False,
+    'lockstep': False,
+    'adversarial': False,
+    'word_penalty': 1,
+    'instrument': False,
+}
+
+
+class JobError(Exception):
+    """Exception raised when a client submits an invalid job"""
+    pass
+
+
+def parse_job(line):
+    """Parse and validate a job sent by a client.
+
+    Args:
+        line (bytes or str): a JSON object, as described in the module docstring
+
+    Return:
+        dict: every key of JOB_DEFAULTS, with guessers as a list of names
+
+    Raise:
+        JobError: if the job is not a JSON object of valid keys and values
+    """
+    try:
+        request = json.loads(line)
+    except ValueError:
+        raise JobError('jobs must be JSON objects')
+    if not isinstance(request, dict):
+        raise JobError('jobs must be JSON objects')
+    unknown_keys = set(request).difference(JOB_DEFAULTS)
+    if unknown_keys:
+        raise JobError('unknown keys {}'.format(', '.join(sorted(unknown_keys))))
+
+    job = dict(JOB_DEFAULTS, **request)
+    if job['guessers'] is None:
+        job['guessers'] = [name for name in GUESSERS if name != 'manual']
+    if not isinstance(job['guessers'], list) or not job['guessers']:
+        raise JobError('guessers must be a list of names')
+    for guesser_name in job['guessers']:
+        if not isinstance(guesser_name, str):
+            raise JobError('guessers must be a list of names')
+        # Only registered guessers, rather than any dotted path a client sends
+        if guesser_name not in GUESSERS or guesser_name == 'manual':
+            raise JobError('unknown guesser {}'.format(guesser_name))
+    for key in ('games', 'count'):
+        if not _is_integer(job[key]) or job[key] < 1:
+            raise JobError('{} must be a positive integer'.format(key))
+    if not _is_integer(job['word_penalty']) or job['word_penalty'] < 0:
+        raise JobError('word_penalty must be a non-negative integer')
+    if job['seed'] is not None and not _is_integer(job['seed']):
+        raise JobError('seed must be an integer')
+    for key in ('sweep', 'lockstep', 'adversarial', 'instrument'):
+        if not isinstance(job[key], bool):
+            raise JobError('{} must be true or false'.format(key))
+    return job
+
+
+def _is_integer(value):
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+def warm_models(word_index, guesser_classes):
+    """Construct each guesser for each word length, training the models they cache.
+
+    Models cached before the worker processes are started are inherited by
+    all of them, rather than trained by each.
+    """
+    for guesser_class in guesser_classes:
+        for length in word_index.lengths:
+            guesser_class(word_length=length, potential_words=word_index)
+
+
+class EvaluationDaemon:
+    """Play simulations submitted by clients, on warm worker processes.
+
+    Args:
+        word_index (WordIndex): all potential words to guess, shared by all jobs
+        pool (multiprocessing.pool.Pool): workers started with
+            simulation.start_pool for the word index
+        executor (concurrent.futures.Executor): runs jobs; a single thread
+            if omitted, so that jobs take turns on the pool
+    """
+
+    def __init__(self, word_index, pool, executor=None):
+        self.word_index = word_index
+        self.pool = pool
+        self.executor = executor or ThreadPoolExecutor(1)
+        self.job_count = 0
+
+    async def handle(self, reader, writer):
+        """Play the jobs of a connection until it closes"""
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                reply = await self.submit(line)
+                writer.write('{}\n'.format(json.dumps(reply)).encode('utf-8'))
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def submit(self, line):
+        """Validate and play a job, and describe its results as a reply"""
+        try:
+            job = parse_job(line)
+        except JobError as error:
+            return {'error': str(error)}
+        try:
+            return await asyncio.get_event_loop().run_in_executor(
+                self.executor,
+                functools.partial(self.play, **job),
+            )
+        except Exception as error:
+            return {'error': 'job failed: {!r}'.format(error)}
+
+    def play(
+        self,
+        guessers,
+        games,
+        count,
+        seed,
+        sweep,
+        lockstep,
+        adversarial,
+        word_penalty,
+        instrument,
+    ):
+        """Play a job's games across the worker processes.
+
+        Return:
+            dict: the reply to the job
+        """
+        start = time.perf_counter()
+        results = evaluate_guessers(
+            guessers,
+            self.word_index,
+            games,
+            max_guesses=count,
+            seed=seed,
+            sweep=sweep,
+            lockstep=lockstep,
+            instrumentation_class=Instrumentation if instrument else None,
+            adversarial=adversarial,
+            word_penalty=word_penalty,
+            pool=self.pool,
+        )
+        self.job_count += 1
+        return {
+            'results': [
+                _describe(guesser_name, result)
+                for guesser_name, result in results.items()
+            ],
+            'duration_ms': round((time.perf_counter() - start) * 1000, 3),
+        }
+
+    def start(self, path):
+        """Start listening on a Unix socket.
+
+        Return:
+            a coroutine resolving to an asyncio server
+        """
+        return asyncio.start_unix_server(self.handle, path)
+
+
+def _describe(guesser_name, result):
+    """Describe a SimulationResult as JSON-serializable data"""
+    summary = result.summary()
+    instrumentation = None
+    if result.instrumentation is not None:
+        summary = '{}\n{}'.format(summary, result.instrumentation.summary())
+        instrumentation = result.instrumentation.to_dict()
+    return {
+        'guesser': guesser_name,
+        'summary': summary,
+        'game_count': result.game_count,
+        'win_rate': result.win_rate,
+        'mean_guess_count': result.mean_guess_count,
+        'instrumentation': instrumentation,
+    }
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        '--socket',
+        metavar='PATH',
+        required=True,
+        help='path of the Unix socket to listen on'
+    )
+    parser.add_argument('-f', '--wordfile', default='/usr/share/dict/words')
+    parser.add_argument('-a', '--alphabet', default=''.join(sorted(DEFAULT_ALPHABET)))
+    parser.add_argument(
+        '-p',
+        '--processes',
+        type=int,
+        help='number of worker processes, defaulting to the number of CPUs'
+    )
+    parser.add_argument(
+        '--warm',
+        nargs='+',
+        default=[],
+        metavar='GUESSER',
+        help='guessers whose models to train for every word length '
+             'before starting workers'
+    )
+    parser.add_argument(
+        '--budget',
+        type=float,
+        metavar='MS',
+        help='deadline of each guess in milliseconds, '
+             'after which guessers settle for a cheaper guess'
+    )
+    parser.add_argument(
+        '-m',
+        '--model-cache',
+        help='directory of models persisted across runs'
+    )
+    parser.add_argument(
+        '-t',
+        '--table',
+        help='path to a decision table for the table guesser'
+    )
+    args = parser.parse_args()
+    for guesser_name in args.warm:
+        if guesser_name not in GUESSERS:
+            parser.error('unknown guesser {} (see run.py --list)'.format(guesser_name))
+
+    MODEL_CACHE.directory = args.model_cache
+    if args.table:
+        GUESSERS['table'].table_path = args.table
+    if args.budget is not None:
+        BaseGuesser.time_budget = args.budget / 1000
+
+    word_index = load_word_index(args.wordfile, args.alphabet)
+    warm_models(word_index, [GUESSERS[guesser_name] for guesser_name in args.warm])
+    pool = start_pool(word_index, args.processes)
+    daemon = EvaluationDaemon(word_index, pool)
+    loop = asyncio.get_event_loop()
+    listener = loop.run_until_complete(daemon.start(args.socket))
+    loop.add_signal_handler(signal.SIGTERM, loop.stop)
+    print('Playing jobs on {}'.format(args.socket))
+    try:
+        loop.run_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        listener.close()
+        loop.run_until_complete(listener.wait_closed())
+        pool.terminate()
+        if os.path.exists(args.socket):
+            os.remove(args.socket)
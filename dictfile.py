@@ -0,0 +1,127 @@
+import json
+import mmap
+import struct
+
+import numpy as np
+
+from index import WordBucket, WordIndex
+
+
+# Identifies a compiled dictionary file, and the version of its layout
+MAGIC = b'HANGDICT\x01'
+
+# Little-endian byte length of the JSON header following the magic bytes
+HEADER_LENGTH = struct.Struct('<I')
+
+# Word weights are stored as little-endian 64-bit integers
+WEIGHT_DTYPE = np.dtype('<i8')
+
+
+def compile_dict(word_index, path):
+    """Write a word index to a pre-bucketed binary dictionary.
+
+    The file starts with MAGIC and a JSON header describing each bucket (its
+    word length and count, alphabet, and the offset of its rows), followed by
+    each bucket's letter matrix as fixed-width rows of uint8 letter codes,
+    and then the weights of weighted buckets as 8-byte aligned int64 arrays.
+    Loading it requires neither parsing nor bucketing any words.
+
+    Args:
+        word_index (WordIndex): the words to compile
+        path (str): the path of the file to write
+    """
+    buckets = [word_index.bucket(length) for length in word_index.lengths]
+    entries = [
+        {
+            'length': bucket.length,
+            'count': len(bucket),
+            'alphabet': ''.join(bucket.alphabet),
+        }
+        for bucket in buckets
+    ]
+
+    # Offsets depend on the header's size, which depends on the offsets
+    offset = 0
+    while True:
+        data_offset = offset
+        for entry, bucket in zip(entries, buckets):
+            entry['offset'] = data_offset
+            data_offset += bucket.matrix.size
+        for entry, bucket in zip(entries, buckets):
+            if bucket.weights is not None:
+                data_offset += -data_offset % WEIGHT_DTYPE.itemsize
+                entry['weights_offset'] = data_offset
+                data_offset += len(bucket) * WEIGHT_DTYPE.itemsize
+        header = json.dumps({'buckets': entries}, separators=(',', ':')).encode('utf-8')
+        header_end = len(MAGIC) + HEADER_LENGTH.size + len(header)
+        if header_end == offset:
+            break
+        offset = header_end
+
+    with open(path, 'wb') as dict_file:
+        dict_file.write(MAGIC)
+        dict_file.write(HEADER_LENGTH.pack(len(header)))
+        dict_file.write(header)
+        for bucket in buckets:
+            dict_file.write(np.ascontiguousarray(bucket.matrix, dtype=np.uint8).tobytes())
+        for entry, bucket in zip(entries, buckets):
+            if bucket.weights is not None:
+                dict_file.write(b'\0' * (entry['weights_offset'] - dict_file.tell()))
+                dict_file.write(np.asarray(bucket.weights, dtype=WEIGHT_DTYPE).tobytes())
+
+
+def is_compiled(path):
+    """Check whether a file is a dictionary written by compile_dict"""
+    with open(path, 'rb') as dict_file:
+        return dict_file.read(len(MAGIC)) == MAGIC
+
+
+def load_dict(path):
+    """Memory-map a dictionary written by compile_dict.
+
+    Each bucket's letter matrix is a read-only view of the mapped file, so
+    pages are only read as they are used, and are shared by every process
+    mapping the same file. Words are only decoded when a guesser needs them.
+
+    Args:
+        path (str): the path of the compiled dictionary
+
+    Return:
+        WordIndex
+
+    Raise:
+        ValueError: if the file is not a compiled dictionary
+    """
+    with open(path, 'rb') as dict_file:
+        data = mmap.mmap(dict_file.fileno(), 0, access=mmap.ACCESS_READ)
+    if data[:len(MAGIC)] != MAGIC:
+        data.close()
+        raise ValueError('{} is not a compiled dictionary'.format(path))
+
+    header_start = len(MAGIC) + HEADER_LENGTH.size
+    header_length, = HEADER_LENGTH.unpack_from(data, len(MAGIC))
+    header = json.loads(data[header_start:header_start + header_length].decode('utf-8'))
+
+    buckets = []
+    for entry in header['buckets']:
+        matrix = np.frombuffer(
+            data,
+            dtype=np.uint8,
+            count=entry['count'] * entry['length'],
+            offset=entry['offset'],
+        ).reshape(entry['count'], entry['length'])
+        weights = None
+        if 'weights_offset' in entry:
+            weights = np.frombuffer(
+                data,
+                dtype=WEIGHT_DTYPE,
+                count=entry['count'],
+                offset=entry['weights_offset'],
+            )
+        buckets.append(WordBucket(
+            entry['length'],
+            alphabet=list(entry['alphabet']),
+            matrix=matrix,
+            weights=weights,
+        ))
+    return WordIndex.from_buckets(buckets)
@@ -1,68 +1,283 @@
+import functools
+
+import numpy as np
+
+from index import WordIndex
+
+
 class CheaterError(Exception):
     """Exception raised when untowards behavior has been noticed"""
     pass
 
 
+class WordGuess(str):
+    """A guess of the whole word, as opposed to a batch of its letters.
+
+    A word guess is checked against the word in a single step: a right one
+    reveals every remaining letter, and a wrong one reveals nothing and
+    costs the game's `word_penalty` in failures.
+    """
+    __slots__ = ()
+
+
 class Game:
-    """Represents a single instance of a Hangman game"""
+    """Represents a single instance of a Hangman game.
+
+    The obscured word, the letters left to find and the positions of each
+    letter are kept up to date as guesses are processed, so that inspecting
+    the state of a game between turns costs next to nothing.
+
+    Every incorrect letter counts as one failure, and every incorrect word
+    guess (see WordGuess) as `word_penalty` failures.
+    """
+    __slots__ = (
+        '_word',
+        'max_failures',
+        'word_penalty',
+        'correct_guesses',
+        'incorrect_guesses',
+        '_failures',
+        '_positions',
+        '_remaining_letters',
+        '_revealed',
+        '_masked_word',
+    )
 
-    def __init__(self, word, max_failures=8):
+    def __init__(self, word, max_failures=8, word_penalty=1):
         self._word = word.lower()
         self.max_failures = max_failures
+        self.word_penalty = word_penalty
         self.correct_guesses = set()
         self.incorrect_guesses = set()
+        self._failures = 0
+
+        self._positions = {}
+        for position, letter in enumerate(self._word):
+            self._positions.setdefault(letter, []).append(position)
+        self._remaining_letters = set(self._positions)
+        self._revealed = ['.'] * len(self._word)
+        self._masked_word = ''.join(self._revealed)
 
     @property
     def word(self):
         """Obscures unguessed letters from the word to be guessed"""
-        return ''.join(
-            letter if letter in self.correct_guesses else '.'
-            for letter in self._word
-        )
+        return self._masked_word
+
+    @property
+    def solution(self):
+        """The word to guess"""
+        return self._word
 
     @property
     def failure_count(self):
-        return len(self.incorrect_guesses)
+        return self._failures
 
     @property
     def remaining_guess_count(self):
-        return self.max_failures - self.failure_count
+        return self.max_failures - self._failures
 
     @property
     def is_game_over(self):
-        return self.has_won or not self.remaining_guess_count
+        return not self._remaining_letters or self._failures >= self.max_failures
 
     @property
     def has_won(self):
-        return set(self._word) == self.correct_guesses
+        return not self._remaining_letters
 
     def process_guess(self, letters):
-        """Given a guessed letter, or collection of letters, update the state
-        of the game.
+        """Given a guessed letter, collection of letters or whole word, update
+        the state of the game.
+
+        Letters are processed in a single pass, rebuilding the obscured word
+        at most once. A WordGuess is checked as a whole (see _process_word).
 
         Args:
-            letters (str): any letters the player is trying to guess
+            letters (str): any letters the player is trying to guess, or a
+                WordGuess
 
         Returns:
-            a {str: bool} dict indicating letter correctness
+            a {str: list of int} dict of the positions at which each letter
+            was revealed, empty for incorrect letters; a wrong word guess
+            maps to an empty list
 
         Raises:
             CheaterError: if any of the letter surpass the number of allowable guesses
         """
-        letter_correctness = {}
+        if isinstance(letters, WordGuess):
+            return self._process_word(letters)
+
+        letter_positions = {}
         for letter in letters:
-            if letter in self.correct_guesses.union(self.incorrect_guesses):
+            if letter in self.correct_guesses or letter in self.incorrect_guesses:
                 continue
 
-            if not self.remaining_guess_count:
-                raise CheaterError(
-                    'Attempt to make guesses after {} failures'.format(self.max_failures)
-                )
-
-            if letter in self._word:
+            self._check_failures()
+            positions = self._locate(letter)
+            if positions:
                 self.correct_guesses.add(letter)
-                letter_correctness[letter] = True
+                self._remaining_letters.discard(letter)
+                for position in positions:
+                    self._revealed[position] = letter
+                letter_positions[letter] = list(positions)
             else:
                 self.incorrect_guesses.add(letter)
-                letter_correctness[letter] = False
-        return letter_correctness
+                self._failures += 1
+                letter_positions[letter] = []
+
+        if any(letter_positions.values()):
+            self._masked_word = ''.join(self._revealed)
+        return letter_positions
+
+    def _process_word(self, word):
+        """Check a whole word guess in one step.
+
+        A right guess reveals all remaining letters at once, and is reported
+        as those letters. A wrong guess (or one after the game was won, or a
+        repeated one) reveals nothing.
+        """
+        if not self._remaining_letters or word in self.incorrect_guesses:
+            return {}
+        self._check_failures()
+        if not self._is_solution(word):
+            self.incorrect_guesses.add(word)
+            self._failures += self.word_penalty
+            return {word: []}
+
+        letter_positions = {}
+        for position, letter in enumerate(word):
+            if self._revealed[position] == '.':
+                letter_positions.setdefault(letter, []).append(position)
+        self.correct_guesses.update(letter_positions)
+        self._remaining_letters.clear()
+        self._revealed = list(word)
+        self._masked_word = str(word)
+        return letter_positions
+
+    def _check_failures(self):
+        if self._failures >= self.max_failures:
+            raise CheaterError(
+                'Attempt to make guesses after {} failures'.format(self.max_failures)
+            )
+
+    def _is_solution(self, word):
+        return word == self._word
+
+    def _locate(self, letter):
+        """Return the positions of a letter in the word"""
+        return self._positions.get(letter)
+
+
+class AdversarialGame(Game):
+    """A game that puts off choosing its word for as long as it can.
+
+    Rather than committing to a word up front, the game keeps every word of
+    the appropriate length consistent with the guesses so far, as an array
+    of row indices into the bucket's letter matrix. Each new letter splits
+    them into classes by the positions at which it would be revealed, and
+    only the largest class is kept, so every guess reveals as little as
+    possible. Ties go to the class revealing fewest positions (a miss
+    first), then to the lowest positions.
+
+    The positions left to reveal stand in for the letters left to find.
+
+    Args:
+        words (list of str or WordIndex): all words the game may settle on
+        word_length (int): the length of the word to guess
+        max_failures (int): a maximum number of incorrect guesses
+        word_penalty (int): the failures counted for a wrong word guess
+
+    Raise:
+        ValueError: if there is no word of the given length
+    """
+    __slots__ = ('_bucket', '_candidates')
+
+    def __init__(self, words, word_length, max_failures=8, word_penalty=1):
+        word_index = words if isinstance(words, WordIndex) else WordIndex(words)
+        self._bucket = word_index.bucket(word_length)
+        if not len(self._bucket):
+            raise ValueError('No potential word of length {}'.format(word_length))
+        self._candidates = np.arange(len(self._bucket))
+
+        self._word = None
+        self.max_failures = max_failures
+        self.word_penalty = word_penalty
+        self.correct_guesses = set()
+        self.incorrect_guesses = set()
+        self._failures = 0
+        self._positions = None
+        self._remaining_letters = set(range(word_length))
+        self._revealed = ['.'] * word_length
+        self._masked_word = ''.join(self._revealed)
+
+    @property
+    def candidate_count(self):
+        """The number of words still consistent with all guesses"""
+        return len(self._candidates)
+
+    @property
+    def solution(self):
+        """The first word still consistent with all guesses"""
+        return self._bucket.select(1 << int(self._candidates[0]))[0]
+
+    def _is_solution(self, word):
+        """Accept a word guess only once it is the last candidate left; otherwise drop it"""
+        codes = self._bucket.codes
+        if len(word) != len(self._revealed) or any(letter not in codes for letter in word):
+            return False
+        row = np.array([codes[letter] for letter in word], dtype=self._bucket.matrix.dtype)
+        matches = (np.take(self._bucket.matrix, self._candidates, axis=0) == row).all(axis=1)
+        if matches.all():
+            return True
+        self._candidates = self._candidates[~matches]
+        return False
+
+    def _locate(self, letter):
+        """Keep the largest class of candidates revealing the letter at the same positions"""
+        code = self._bucket.codes.get(letter)
+        if code is None:
+            return []
+
+        hits = np.take(self._bucket.matrix, self._candidates, axis=0) == code
+        length = hits.shape[1]
+        if length <= MAX_DENSE_LENGTH:
+            # Exact in float32, which is much faster to multiply than integers
+            reveal_masks = (hits.astype(np.float32) @ _position_bits(length)).astype(np.int64)
+            counts = np.bincount(reveal_masks, minlength=1 << length)
+            order = _mask_order(length)
+            mask = int(order[counts[order].argmax()])
+            self._candidates = self._candidates[reveal_masks == mask]
+            positions = [position for position in range(length) if mask >> position & 1]
+        else:
+            patterns, classes, counts = np.unique(
+                hits,
+                axis=0,
+                return_inverse=True,
+                return_counts=True,
+            )
+            # Order patterns as the integer masks of the dense case
+            best = np.lexsort(tuple(patterns.T) + (patterns.sum(axis=1), -counts))[0]
+            self._candidates = self._candidates[classes.ravel() == best]
+            positions = np.flatnonzero(patterns[best]).tolist()
+
+        self._remaining_letters.difference_update(positions)
+        return positions
+
+
+# Longest words whose classes are counted with a bincount over every
+# possible reveal mask
+MAX_DENSE_LENGTH = 16
+
+
+@functools.lru_cache(maxsize=None)
+def _position_bits(length):
+    return (1 << np.arange(length)).astype(np.float32)
+
+
+@functools.lru_cache(maxsize=None)
+def _mask_order(length):
+    """Order all reveal masks of a word length by revealed positions, then by value"""
+    masks = np.arange(1 << length)
+    revealed_counts = np.zeros(len(masks), dtype=np.int64)
+    for position in range(length):
+        revealed_counts += masks >> position & 1
+    return masks[np.lexsort((masks, revealed_counts))]
@@ -1,14 +1,35 @@
-from guessers.exc import TableFlipError  # noqa
-
-from guessers.manual import ManualGuesser  # noqa
-from guessers.markov import (  # noqa
-    SingleStateMarkovGuesser,
-    DoubleStateMarkovGuesser,
-)
-from guessers.naive import OrderedRandomGuesser, RandomGuesser  # noqa
-from guessers.derived import (  # noqa
-    DerivedAlphabetGuesser,
-    OrderedDerivedAlphabetGuesser,
-    RederivedAlphabetGuesser,
-)
-from guessers.probability import FrequentLetterGuesser  # noqa
+import importlib
+
+
+# Public names of the package, and the modules they are imported from on first access,
+# so that importing one guesser does not import all of them
+_EXPORTS = {
+    'TableFlipError': 'guessers.exc',
+    'ManualGuesser': 'guessers.manual',
+    'SingleStateMarkovGuesser': 'guessers.markov',
+    'DoubleStateMarkovGuesser': 'guessers.markov',
+    'IncrementalSingleStateMarkovGuesser': 'guessers.markov',
+    'IncrementalDoubleStateMarkovGuesser': 'guessers.markov',
+    'OrderedRandomGuesser': 'guessers.naive',
+    'RandomGuesser': 'guessers.naive',
+    'DerivedAlphabetGuesser': 'guessers.derived',
+    'OrderedDerivedAlphabetGuesser': 'guessers.derived',
+    'RederivedAlphabetGuesser': 'guessers.derived',
+    'EntropyGuesser': 'guessers.entropy',
+    'MemoizedGuesser': 'guessers.memo',
+    'memoize': 'guessers.memo',
+    'FrequentLetterGuesser': 'guessers.probability',
+    'VectorizedFrequentLetterGuesser': 'guessers.probability',
+    'TableGuesser': 'guessers.table',
+}
+
+
+def __getattr__(name):
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError('module {!r} has no attribute {!r}'.format(__name__, name))
+    return getattr(importlib.import_module(module_name), name)
+
+
+def __dir__():
+    return sorted(set(globals()).union(_EXPORTS))
@@ -1,17 +1,90 @@
 import abc
+import time
+
+from game import WordGuess
+
+
+class BudgetStats:
+    """Counts of guesses made under a time budget, and of those cut short.
+
+    A guess is partial when its strategy ran out of time and settled for
+    the best answer found so far, and a fallback when it ran out of time
+    before finding any and used a cheaper strategy instead.
+    """
+
+    def __init__(self):
+        self.guesses = 0
+        self.partial = 0
+        self.fallbacks = 0
+
+    def clear(self):
+        self.guesses = self.partial = self.fallbacks = 0
+
+    def merge(self, guesses=0, partial=0, fallbacks=0):
+        """Add the counts of another process, e.g. a pool worker"""
+        self.guesses += guesses
+        self.partial += partial
+        self.fallbacks += fallbacks
+
+
+# Shared by all guessers in a process
+BUDGET_STATS = BudgetStats()
 
 
 class BaseGuesser(abc.ABC):
-    """Abstract base class defining the required structure for all guessers."""
+    """Abstract base class defining the required structure for all guessers.
+
+    A guesser is `deterministic` if its guesses only depend on the word
+    list, the word guessed so far and the letters guessed, which allows its
+    decisions to be memoized (see guessers.memo). Settings of a class that
+    its decisions also depend on are listed by `decision_key`.
+
+    Setting `time_budget` (in seconds) gives each guess a deadline. Guessers
+    whose cost grows with their candidates call `_start_deadline` when a
+    guess starts, check `_out_of_time` as they compute, and settle for a
+    cheaper answer once it passes; others ignore it.
+    """
+    deterministic = False
+    time_budget = None
+    _deadline = None
 
     def __init__(self, *args, **kwargs):
         return
 
     @abc.abstractmethod
     def guess(self, *args, **kwargs):
-        """Return a letter to match against a game's word"""
+        """Return a letter to match against a game's word.
+
+        A string of several letters is a batch, processed in a single pass,
+        and a WordGuess (see `guess_word`) guesses the whole word at once.
+        """
         pass
 
+    @classmethod
+    def decision_key(cls):
+        """Identify the settings a deterministic guesser's decisions depend on
+
+        Return:
+            tuple, part of the keys of memoized decisions
+        """
+        return ()
+
+    @staticmethod
+    def guess_word(word):
+        """Mark a guess as the whole word, to be checked in a single step"""
+        return WordGuess(word)
+
     def update_state(self, letter_match, guessed_word):
         """Update any internal guesser state to make future guesses more accurate"""
         pass
+
+    def _start_deadline(self):
+        """Start the time budget of a guess, if any"""
+        if self.time_budget is None:
+            self._deadline = None
+        else:
+            self._deadline = time.perf_counter() + self.time_budget
+            BUDGET_STATS.guesses += 1
+
+    def _out_of_time(self):
+        return self._deadline is not None and time.perf_counter() >= self._deadline
@@ -0,0 +1,203 @@
+import os
+import pickle
+import tempfile
+import threading
+from collections import OrderedDict
+
+
+class ModelCache:
+    """A least-recently-used cache of trained models, shared within a process.
+
+    Models are keyed by a tuple identifying their training data. When a
+    directory is set, models are also pickled there, so that they survive
+    across runs. Lookups are counted, including those served from disk as misses.
+
+    Lookups may come from several threads (e.g. those of server.GameServer).
+    Models are built outside of the lock, so a model missed by two threads
+    at once may be built twice, but only the first one built is kept.
+    Persisted models are written to a temporary file and then renamed, so
+    that other processes never load a partially written model.
+    """
+
+    def __init__(self, max_size=64, directory=None):
+        self.max_size = max_size
+        self.directory = directory
+        self.hits = 0
+        self.misses = 0
+        self._models = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._models)
+
+    def __contains__(self, key):
+        return key in self._models
+
+    def get(self, key, build):
+        """Retrieve a model, building (and storing) it if necessary.
+
+        Args:
+            key (tuple): identifies the model; its items form the file name
+                of persisted models
+            build (callable): trains the model when it is not cached
+
+        Return:
+            the cached model
+        """
+        with self._lock:
+            if key in self._models:
+                self.hits += 1
+                self._models.move_to_end(key)
+                return self._models[key]
+            self.misses += 1
+
+        path = self._path(key)
+        if path and os.path.exists(path):
+            with open(path, 'rb') as model_file:
+                model = pickle.load(model_file)
+        else:
+            model = build()
+            if path:
+                self._persist(path, model)
+
+        with self._lock:
+            model = self._models.setdefault(key, model)
+            self._models.move_to_end(key)
+            while len(self._models) > self.max_size:
+                self._models.popitem(last=False)
+        return model
+
+    def clear(self):
+        self._models.clear()
+
+    def _persist(self, path, model):
+        """Atomically pickle a model to a file of the cache directory"""
+        os.makedirs(self.directory, exist_ok=True)
+        descriptor, temporary_path = tempfile.mkstemp(
+            dir=self.directory,
+            prefix='.{}.'.format(os.path.basename(path)),
+        )
+        try:
+            with os.fdopen(descriptor, 'wb') as model_file:
+                pickle.dump(model, model_file)
+            os.replace(temporary_path, path)
+        except BaseException:
+            os.remove(temporary_path)
+            raise
+
+    def _path(self, key):
+        if not self.directory:
+            return None
+        return os.path.join(
+            self.directory,
+            '{}.pickle'.format('-'.join(str(part) for part in key))
+        )
+
+
+class DecisionCache:
+    """A least-recently-used cache of guesses, shared by games within a process.
+
+    Lookups are counted, so that the share of guesses served from the cache
+    can be reported. The whole cache can be saved to and loaded from a file.
+    Lookups and insertions are thread-safe.
+
+    A worker process can record the guesses it puts in its cache, so that
+    they can be merged into its parent's cache along with its lookup counts.
+    """
+
+    def __init__(self, max_size=1 << 20):
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._guesses = OrderedDict()
+        self._recorded = None
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._guesses)
+
+    def __contains__(self, key):
+        return key in self._guesses
+
+    @property
+    def hit_rate(self):
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def get(self, key):
+        """Retrieve a guess, or None if it is not cached"""
+        with self._lock:
+            guess = self._guesses.get(key)
+            if guess is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+                self._guesses.move_to_end(key)
+        return guess
+
+    def put(self, key, guess):
+        with self._lock:
+            self._put(key, guess)
+            if self._recorded is not None:
+                self._recorded.append((key, guess))
+
+    def _put(self, key, guess):
+        self._guesses[key] = guess
+        self._guesses.move_to_end(key)
+        while len(self._guesses) > self.max_size:
+            self._guesses.popitem(last=False)
+
+    def record(self):
+        """Start recording the guesses put in the cache, for `pop_recorded`"""
+        with self._lock:
+            self._recorded = []
+
+    def pop_recorded(self):
+        """Return the guesses put since the last call, if recording, and forget them
+
+        Return:
+            list of (key, guess) tuples
+        """
+        with self._lock:
+            recorded = self._recorded or []
+            if self._recorded is not None:
+                self._recorded = []
+        return recorded
+
+    def merge(self, guesses, hits=0, misses=0):
+        """Add the guesses and lookup counts of another process's cache.
+
+        Args:
+            guesses (iterable of (tuple, str)): keys and guesses, e.g. from
+                `pop_recorded`
+            hits (int): the number of lookups the other cache served
+            misses (int): the number of lookups the other cache missed
+        """
+        with self._lock:
+            for key, guess in guesses:
+                self._put(key, guess)
+            self.hits += hits
+            self.misses += misses
+
+    def clear(self):
+        self._guesses.clear()
+        self.hits = self.misses = 0
+
+    def save(self, path):
+        """Pickle the cached guesses to a file"""
+        with open(path, 'wb') as cache_file:
+            pickle.dump(list(self._guesses.items()), cache_file)
+
+    def load(self, path):
+        """Add the guesses pickled by `save` to the cache"""
+        with open(path, 'rb') as cache_file:
+            for key, guess in pickle.load(cache_file):
+                self.put(key, guess)
+
+
+# Markov chains trained by guessers, keyed by (bucket digest, state size, word length)
+MODEL_CACHE = ModelCache()
+
+# Guesses of memoized guessers, keyed by (guesser, decision key, bucket digest, pattern,
+# guessed letters)
+DECISION_CACHE = DecisionCache()
@@ -1,8 +1,9 @@
 import random
-import re
 
+from game import WordGuess
 from guessers.base import BaseGuesser
 from guessers.exc import TableFlipError
+from index import CandidateSet, WordIndex
 
 
 class BaseDerivedAlphabetGuesser(BaseGuesser):
@@ -11,22 +12,31 @@ class BaseDerivedAlphabetGuesser(BaseGuesser):
 
     @staticmethod
     def _cull_words(word_length, potential_words, absent_letters):
-        """Extract all potential matches from a list of words"""
+        """Extract all potential matches from a list of words or a WordIndex"""
+        if isinstance(potential_words, WordIndex):
+            return potential_words.match('.' * word_length, absent_letters)
         return [
             word
             for word in potential_words
             if len(word) == word_length and not set(word).intersection(absent_letters)
         ]
 
-    @staticmethod
-    def _derive_alphabet(potential_words):
-        """Extract all unique letters in the given list of words"""
-        return set(''.join(potential_words))
+    @classmethod
+    def _bucket(cls, word_length, potential_words):
+        """Retrieve the bucket of words of the appropriate length.
+
+        The bucket of a WordIndex is shared by all guessers, along with its
+        lazily computed alphabet and letter counts. A list of words is culled
+        and indexed anew.
+        """
+        if isinstance(potential_words, WordIndex):
+            return potential_words.bucket(word_length)
+        return WordIndex(cls._cull_words(word_length, potential_words, set())).bucket(word_length)
 
     def update_state(self, letter_match, guessed_word):
         """Record letters not present in the word to guess"""
-        for letter, is_correct in letter_match.items():
-            if not is_correct:
+        for letter, positions in letter_match.items():
+            if not positions:
                 self.incorrect_guesses.add(letter)
 
 
@@ -34,13 +44,16 @@ class DerivedAlphabetGuesser(BaseDerivedAlphabetGuesser):
     """Restrict guesses to only letters in words of appropriate length"""
     def __init__(self, word_length, potential_words, *args, **kwargs):
         super().__init__()
-        self.potential_words = self._cull_words(
-            word_length,
-            potential_words,
-            self.incorrect_guesses
-        )
-        self.alphabet = list(self._derive_alphabet(potential_words))
-        random.shuffle(self.alphabet)
+        bucket = self._bucket(word_length, potential_words)
+        self.potential_words = bucket.words
+        self.alphabet = self._order_alphabet(bucket.alphabet)
+
+    @staticmethod
+    def _order_alphabet(alphabet):
+        """Shuffle the letters to guess; the last one is guessed first"""
+        alphabet = list(alphabet)
+        random.shuffle(alphabet)
+        return alphabet
 
     def guess(self, *args, **kwargs):
         return self.alphabet.pop()
@@ -48,23 +61,15 @@ class DerivedAlphabetGuesser(BaseDerivedAlphabetGuesser):
 
 class OrderedDerivedAlphabetGuesser(DerivedAlphabetGuesser):
     """Guess only letters in words of appropriate length, starting with vowels."""
-    def __init__(self, word_length, potential_words, *args, **kwargs):
-        super().__init__(word_length, potential_words, *args, **kwargs)
-        self.potential_words = self._cull_words(
-            word_length,
-            potential_words,
-            self.incorrect_guesses
-        )
-        alphabet = self._derive_alphabet(potential_words)
-        vowels = set('aeiou').intersection(alphabet)
-        consonants = set(alphabet).difference(vowels)
-
-        vowels = list(vowels)
-        consonants = list(consonants)
+    @staticmethod
+    def _order_alphabet(alphabet):
+        """Shuffle consonants and vowels separately, so that vowels are guessed first"""
+        vowels = [letter for letter in alphabet if letter in 'aeiou']
+        consonants = [letter for letter in alphabet if letter not in 'aeiou']
 
         random.shuffle(vowels)
         random.shuffle(consonants)
-        self.alphabet = consonants + vowels
+        return consonants + vowels
 
 
 class RederivedAlphabetGuesser(BaseDerivedAlphabetGuesser):
@@ -75,36 +80,48 @@ class RederivedAlphabetGuesser(BaseDerivedAlphabetGuesser):
     """
     def __init__(self, word_length, potential_words, *args, **kwargs):
         super().__init__()
-        self.potential_words = self._cull_words(
-            word_length,
-            potential_words,
-            self.incorrect_guesses,
-        )
+        self.candidates = self._index_words(word_length, potential_words)
+
+    @property
+    def potential_words(self):
+        return self.candidates.words
 
     def update_state(self, letter_match, guessed_word):
         """Record incorrect guesses and recompute potential words"""
-        for letter, is_correct in letter_match.items():
-            if not is_correct:
+        for letter, positions in letter_match.items():
+            if not positions:
                 self.incorrect_guesses.add(letter)
 
-        self.potential_words = self._match_words(
-            guessed_word,
-            self.potential_words,
-        )
-        if not self.potential_words:
+        self._match_words(letter_match, guessed_word)
+        if not self.candidates:
             raise TableFlipError('No possible solution found')
 
-    @staticmethod
-    def _match_words(guessed_word, potential_words):
-        """Extract words that match the pattern of the word guessed so far"""
-        pattern = re.compile(guessed_word)
-        return [word for word in potential_words if pattern.match(word)]
+    @classmethod
+    def _index_words(cls, word_length, potential_words):
+        """Gather all words of the appropriate length into a set of candidates"""
+        return CandidateSet(cls._bucket(word_length, potential_words))
+
+    def _match_words(self, letter_match, guessed_word):
+        """Discard candidates that do not match the latest guessed letters.
+
+        Args:
+            letter_match (dict): a dict of guessed letters to the positions at
+                which they were revealed, as returned by game.Game.process_guess;
+                a wrong WordGuess discards that word
+            guessed_word (str): the word guessed so far, with '.' for unknown letters
+        """
+        for letter, positions in letter_match.items():
+            if isinstance(letter, WordGuess):
+                if not positions:
+                    self.candidates.exclude(letter)
+                continue
+            self.candidates.narrow(letter, positions)
 
     def guess(self, guessed_word, *args, **kwargs):
         guess = None
-        if len(self.potential_words) == 1:
-            guess = self.potential_words[0]
+        if len(self.candidates) == 1:
+            guess = self.guess_word(self.potential_words[0])
         else:
-            self.alphabet = self._derive_alphabet(self.potential_words)
+            self.alphabet = self.candidates.alphabet
             guess = random.choice(list(self.alphabet))
         return guess
@@ -0,0 +1,109 @@
+import numpy as np
+
+from guessers.base import BUDGET_STATS
+from guessers.probability import BUDGET_CHUNK_SIZE, FrequentLetterGuesser
+
+
+# Largest (alphabet size x reveal masks) table counted with a single bincount;
+# beyond it, allocating and scanning the mostly empty table costs more than
+# sorting the keys (e.g. twice as much for 15 or 16-letter words and 26 letters)
+MAX_DENSE_KEYS = 1 << 19
+
+
+def letter_entropies(rows, alphabet_size):
+    """Compute the information each letter would reveal about a set of candidates.
+
+    Guessing a letter partitions the candidates by the mask of positions at
+    which it is revealed. Each candidate's reveal mask for every letter is
+    computed at once, hashed together with the letter into a single integer
+    key, and all partitions are counted in one pass.
+
+    Args:
+        rows (numpy.ndarray): the candidates' rows of a bucket's letter matrix
+        alphabet_size (int): the number of letters in the bucket's alphabet
+
+    Return:
+        a float array of the entropy (in bits) of each letter's partition,
+        indexed by letter code
+    """
+    word_count, length = rows.shape
+    if not word_count or not alphabet_size:
+        return np.zeros(alphabet_size)
+    return _entropies(_partition_keys(rows, alphabet_size), word_count, alphabet_size, length)
+
+
+def _partition_keys(rows, alphabet_size):
+    """Key each candidate's reveal mask for every letter, together with the letter"""
+    word_count, length = rows.shape
+    # keys[row, code] = code << length | reveal mask of code in row
+    keys = np.tile(np.arange(alphabet_size, dtype=np.int64) << length, word_count)
+    row_offsets = np.arange(0, word_count * alphabet_size, alphabet_size)
+    for position in range(length):
+        keys[row_offsets + rows[:, position]] += 1 << position
+    return keys
+
+
+def _entropies(keys, word_count, alphabet_size, length):
+    """Compute each letter's entropy from the partition keys of `word_count` candidates"""
+    if alphabet_size << length <= MAX_DENSE_KEYS:
+        counts = np.bincount(keys, minlength=alphabet_size << length)
+        codes = np.repeat(np.arange(alphabet_size), 1 << length)
+        codes, counts = codes[counts > 0], counts[counts > 0]
+    else:
+        unique_keys, counts = np.unique(keys, return_counts=True)
+        codes = unique_keys >> length
+
+    # H = log2(n) - sum(c * log2(c)) / n, summed per letter
+    weighted = np.bincount(codes, counts * np.log2(counts), minlength=alphabet_size)
+    return np.round(np.log2(word_count) - weighted / word_count, 12)
+
+
+class EntropyGuesser(FrequentLetterGuesser):
+    """Guess the letter that best partitions the remaining candidates.
+
+    The expected information of a guess is the entropy of the partition of
+    candidates by the pattern it would reveal.
+
+    Under a `time_budget`, partitions are keyed over chunks of candidates
+    until the deadline passes, and entropies are estimated from the chunks
+    keyed so far.
+    """
+
+    def guess(self, guessed_word, *args, **kwargs):
+        self._start_deadline()
+        if len(self.candidates) == 1:
+            return self.guess_word(self.potential_words[0])
+
+        bucket = self.candidates.bucket
+        rows = bucket.matrix[self.candidates.selector]
+        if self._deadline is None:
+            entropies = letter_entropies(rows, len(bucket.alphabet))
+        else:
+            entropies = self._estimate_entropies_until_deadline(rows, len(bucket.alphabet))
+            if entropies is None:
+                return self._select_fallback_letter()
+        codes = bucket.codes
+        entropies[[codes[letter] for letter in self.guesses if letter in codes]] = 0
+        if not entropies.any():
+            # Every unguessed letter reveals the same pattern in all candidates
+            return self._select_most_frequent_candidate_letter()
+        return bucket.alphabet[entropies.argmax()]
+
+    def _estimate_entropies_until_deadline(self, rows, alphabet_size):
+        """Compute letter entropies over the chunks of rows keyed before the deadline.
+
+        Return:
+            a float array of entropies, indexed by letter code, or None if
+            the deadline passed before any chunk was keyed
+        """
+        chunk_keys = []
+        for start in range(0, len(rows), BUDGET_CHUNK_SIZE):
+            if self._out_of_time():
+                BUDGET_STATS.partial += bool(chunk_keys)
+                break
+            chunk = rows[start:start + BUDGET_CHUNK_SIZE]
+            chunk_keys.append(_partition_keys(chunk, alphabet_size))
+        if not chunk_keys:
+            return None
+        word_count = min(len(chunk_keys) * BUDGET_CHUNK_SIZE, len(rows))
+        return _entropies(np.concatenate(chunk_keys), word_count, alphabet_size, rows.shape[1])
@@ -1,29 +1,65 @@
-import markovify
-
+from guessers.cache import MODEL_CACHE
+from guessers.ngram import BEGIN, TransitionTable
 from guessers.probability import FrequentLetterGuesser
 
 
 class SingleStateMarkovGuesser(FrequentLetterGuesser):
-    """Uses a single-state Markov chain to guess subsequent letters"""
+    """Uses a single-state Markov chain to guess subsequent letters.
+
+    When `incremental` is set, chains follow the remaining candidate words:
+    the transitions of words eliminated by each guess are subtracted from a
+    private copy of the trained chain.
+
+    Only falling back to the most frequent candidate letter takes time in
+    proportion to the candidates, and it honours the `time_budget`.
+    """
+    incremental = False
+
     def __init__(self, word_length, potential_words, *args, **kwargs):
         super().__init__(word_length, potential_words, *args, **kwargs)
-        self.potential_word_letters = [list(word) for word in potential_words]
-        self.markov_model_1 = markovify.Chain(
-            self.potential_word_letters,
-            state_size=1
+        self._live_chains = []
+        self.markov_model_1 = self._train_chain(state_size=1)
+        self.alphabet = self.candidates.alphabet
+
+    def _train_chain(self, state_size):
+        """Retrieve a Markov chain trained on all words of the appropriate length.
+
+        Chains are cached per process, so each is only trained once per
+        bucket of words.
+
+        :param state_size: the number of letters in each state of the chain
+        :type state_size: int
+        :rtype: guessers.ngram.TransitionTable
+        """
+        bucket = self.candidates.bucket
+        chain = MODEL_CACHE.get(
+            ('ngram', bucket.digest, state_size, bucket.length),
+            lambda: TransitionTable(bucket, state_size),
         )
-        self.alphabet = self._derive_alphabet(self.potential_words)
+        if self.incremental:
+            chain = chain.copy()
+            self._live_chains.append(chain)
+        return chain
 
     def update_state(self, letter_match, guessed_word):
+        previous_mask = self.candidates.mask
         super().update_state(letter_match, guessed_word)
-        self.alphabet = self._derive_alphabet(self.potential_words)
+        self.alphabet = self.candidates.alphabet
+
+        eliminated_mask = previous_mask & ~self.candidates.mask
+        if self._live_chains and eliminated_mask:
+            bucket = self.candidates.bucket
+            eliminated_rows = bucket.selector(eliminated_mask)
+            for chain in self._live_chains:
+                chain.remove(bucket, eliminated_rows)
 
     def guess(self, guessed_word, *args, **kwargs):
+        self._start_deadline()
         guess = None
 
         # When only one potential word remains, return it
-        if len(self.potential_words) == 1:
-            return self.potential_words[0]
+        if len(self.candidates) == 1:
+            return self.guess_word(self.potential_words[0])
 
         else:
             # If guessed_word contains a non-terminating string of guessed
@@ -47,7 +83,7 @@ class SingleStateMarkovGuesser(FrequentLetterGuesser):
             else:
                 guess = self._select_most_frequent_follower(
                     self.markov_model_1,
-                    (markovify.chain.BEGIN,)
+                    (BEGIN,)
                 )
 
         return guess
@@ -55,40 +91,38 @@ class SingleStateMarkovGuesser(FrequentLetterGuesser):
     def _select_most_frequent_follower(self, chain, letter_series):
         """Return the letter that most frequently follows the given letter series.
 
+        When no unguessed letter ever follows the series, fall back to the
+        most frequent unguessed letter among the remaining candidates.
+
         :param chain: a trained Markov model
-        :type chain: markovify.Chain
+        :type chain: guessers.ngram.TransitionTable
         :param letter_series: a letter or string of letters
         :type letter_series: str
         :return: most frequent, unguessed letter following the letter series
         :rtype: str
         """
-        potential_letter_frequency = (
-            (letter, frequency)
-            for letter, frequency in chain.model[tuple(letter_series)].items()
-            if letter not in self.guesses and letter in self.alphabet
+        letter = chain.most_frequent_follower(
+            tuple(letter_series),
+            self.alphabet.difference(self.guesses),
         )
-        return sorted(
-            potential_letter_frequency,
-            key=lambda t: t[1],
-            reverse=True
-        )[0][0]
+        if letter is None:
+            letter = self._select_most_frequent_candidate_letter()
+        return letter
 
 
 class DoubleStateMarkovGuesser(SingleStateMarkovGuesser):
     """Uses multiple Markov chains to guess subsequent letters"""
     def __init__(self, word_length, potential_words, *args, **kwargs):
         super().__init__(word_length, potential_words, *args, **kwargs)
-        self.markov_model_2 = markovify.Chain(
-            self.potential_word_letters,
-            state_size=2
-        )
+        self.markov_model_2 = self._train_chain(state_size=2)
 
     def guess(self, guessed_word, *args, **kwargs):
+        self._start_deadline()
         guess = None
 
         # When only one potential word remains, return it
-        if len(self.potential_words) == 1:
-            return self.potential_words[0]
+        if len(self.candidates) == 1:
+            return self.guess_word(self.potential_words[0])
 
         else:
             # If guessed_word contains a non-terminating string of guessed
@@ -118,7 +152,17 @@ class DoubleStateMarkovGuesser(SingleStateMarkovGuesser):
             else:
                 guess = self._select_most_frequent_follower(
                     self.markov_model_1,
-                    (markovify.chain.BEGIN,)
+                    (BEGIN,)
                 )
 
         return guess
+
+
+class IncrementalSingleStateMarkovGuesser(SingleStateMarkovGuesser):
+    """Uses a single-state Markov chain of the remaining candidates"""
+    incremental = True
+
+
+class IncrementalDoubleStateMarkovGuesser(DoubleStateMarkovGuesser):
+    """Uses multiple Markov chains of the remaining candidates"""
+    incremental = True
@@ -0,0 +1,88 @@
+import hashlib
+
+from guessers.base import BaseGuesser
+from guessers.cache import DECISION_CACHE
+from index import WordIndex
+
+
+class MemoizedGuesser(BaseGuesser):
+    """Serve a deterministic guesser's guesses from a cache shared across games.
+
+    Games of the same word length that reach the same state (the same word
+    guessed so far, and the same wrong letters) get the same guess from a
+    deterministic guesser, so each distinct state only needs to be decided
+    once per process. The wrapped guesser still follows every game, so that
+    it can decide states that are not cached yet.
+
+    Guesses made under a time budget depend on how fast they were computed,
+    so they are neither served from nor stored in the cache.
+
+    Subclasses are created by `memoize`, which sets `guesser_class`.
+    """
+    deterministic = True
+    guesser_class = None
+    cache = DECISION_CACHE
+
+    def __init__(self, word_length, potential_words, *args, **kwargs):
+        self.guesser = self.guesser_class(word_length, potential_words, *args, **kwargs)
+        self.guesses = set()
+        self._key = (
+            '{}.{}'.format(self.guesser_class.__module__, self.guesser_class.__qualname__),
+            self.guesser_class.decision_key(),
+            _digest(word_length, potential_words),
+        )
+
+    def guess(self, guessed_word, *args, **kwargs):
+        if self.guesser.time_budget is not None:
+            return self.guesser.guess(guessed_word, *args, **kwargs)
+        key = self._key + (guessed_word, ''.join(sorted(self.guesses)))
+        guess = self.cache.get(key)
+        if guess is None:
+            guess = self.guesser.guess(guessed_word, *args, **kwargs)
+            self.cache.put(key, guess)
+        return guess
+
+    def update_state(self, letter_match, guessed_word):
+        self.guesses.update(letter_match)
+        self.guesser.update_state(letter_match, guessed_word)
+
+
+def _digest(word_length, potential_words):
+    """Identify the potential words of the appropriate length"""
+    if isinstance(potential_words, WordIndex):
+        return potential_words.bucket(word_length).digest
+    digest = hashlib.sha1()
+    for word in potential_words:
+        if len(word) == word_length:
+            digest.update(word.encode('utf-8') + b'\n')
+    return digest.hexdigest()
+
+
+def memoize(guesser_class):
+    """Create a guesser class serving the given one's guesses from DECISION_CACHE.
+
+    Memoized classes are registered in this module, so that they can be
+    pickled by reference like any other guesser class (e.g. to be shipped to
+    worker processes).
+
+    Args:
+        guesser_class (type): a class inheriting from guessers.base.BaseGuesser
+
+    Return:
+        type
+
+    Raise:
+        ValueError: if the guesser's guesses are not deterministic
+    """
+    if not guesser_class.deterministic:
+        raise ValueError('{} is not deterministic'.format(guesser_class.__name__))
+    name = 'Memoized{}'.format(guesser_class.__name__)
+    memoized_class = globals().get(name)
+    if memoized_class is None or memoized_class.guesser_class is not guesser_class:
+        memoized_class = type(name, (MemoizedGuesser,), {
+            '__doc__': 'Memoized {}'.format(guesser_class.__name__),
+            '__module__': __name__,
+            'guesser_class': guesser_class,
+        })
+        globals()[name] = memoized_class
+    return memoized_class
@@ -0,0 +1,135 @@
+import numpy as np
+
+
+# Marks the beginning (or end) of a word in a state of letters
+BEGIN = '__BEGIN__'
+
+
+class TransitionTable:
+    """Counts of the letters following each series of letters in a bucket of words.
+
+    Counts live in a NumPy array with one axis per letter of the state plus
+    one for the follower, indexed by letter code + 1; index 0 stands for the
+    beginning or end of a word. For a 26-letter alphabet, a single-state table
+    is therefore a 27x27 array, and a double-state table 27x27x27.
+
+    The transitions of a weighted bucket's words count as many times as their
+    weight. A copy of the table can follow a shrinking set of candidate words
+    by subtracting the transitions of eliminated words instead of being
+    retrained; those are recomputed from the bucket's letter matrix, rather
+    than kept for every word of every table.
+    """
+
+    def __init__(self, bucket, state_size):
+        """Count all transitions in a single pass over the bucket's letter matrix.
+
+        Args:
+            bucket (index.WordBucket): the words to train on
+            state_size (int): the number of letters in each state
+        """
+        self.alphabet = bucket.alphabet
+        self.codes = bucket.codes
+        self.state_size = state_size
+
+        size = len(self.alphabet) + 1
+        self.counts = self._count(
+            self._transitions(bucket.matrix),
+            bucket.weights,
+            size ** (state_size + 1),
+        )
+        self.counts = self.counts.reshape((size,) * (state_size + 1))
+
+    def _transitions(self, matrix):
+        """Compute the flattened transition indices of each row of a letter matrix.
+
+        Args:
+            matrix (numpy.ndarray): letter codes, one row per word
+
+        Return:
+            numpy.ndarray: a (word count, word length + 1) array of indices
+        """
+        size = len(self.alphabet) + 1
+        word_count, length = matrix.shape
+        padded = np.zeros((word_count, self.state_size + length + 1), dtype=np.int64)
+        padded[:, self.state_size:self.state_size + length] = matrix.astype(np.int64) + 1
+
+        transitions = np.zeros((word_count, length + 1), dtype=np.int64)
+        for offset in range(self.state_size + 1):
+            transitions *= size
+            transitions += padded[:, offset:offset + length + 1]
+        return transitions
+
+    @staticmethod
+    def _count(transitions, weights, size):
+        """Count (weighted) occurrences of flattened transition indices"""
+        if weights is None:
+            return np.bincount(transitions.ravel(), minlength=size)
+        repeated_weights = np.repeat(weights, transitions.shape[1])
+        counts = np.bincount(transitions.ravel(), weights=repeated_weights, minlength=size)
+        return counts.astype(np.int64)
+
+    def copy(self):
+        """Return a table sharing this one's alphabet, with its own counts"""
+        table = TransitionTable.__new__(TransitionTable)
+        table.__dict__.update(self.__dict__)
+        table.counts = self.counts.copy()
+        return table
+
+    def remove(self, bucket, rows):
+        """Subtract the transitions of some of the words from the counts.
+
+        Args:
+            bucket (index.WordBucket): the words the table was trained on
+            rows (numpy.ndarray): a bool array selecting the words to remove
+        """
+        eliminated = bucket.matrix[rows]
+        if len(eliminated):
+            self.counts -= self._count(
+                self._transitions(eliminated),
+                None if bucket.weights is None else bucket.weights[rows],
+                self.counts.size,
+            ).reshape(self.counts.shape)
+
+    def followers(self, state):
+        """Count the letters following a state.
+
+        Args:
+            state (tuple of str): `state_size` letters, or BEGIN
+
+        Return:
+            an array of counts, indexed by letter code + 1 (0 is the word end),
+            or None if the state contains unknown letters
+        """
+        if state == (BEGIN,):
+            state = (BEGIN,) * self.state_size
+        indices = []
+        for letter in state:
+            if letter == BEGIN:
+                indices.append(0)
+            elif letter in self.codes:
+                indices.append(self.codes[letter] + 1)
+            else:
+                return None
+        return self.counts[tuple(indices)]
+
+    def most_frequent_follower(self, state, letters):
+        """Select the letter from a set that most frequently follows a state.
+
+        Ties go to the alphabetically first letter.
+
+        Args:
+            state (tuple of str): `state_size` letters, or BEGIN
+            letters (collection of str): the letters to choose from
+
+        Return:
+            str, or None if none of the letters ever follow the state
+        """
+        counts = self.followers(state)
+        if counts is None:
+            return None
+        allowed = np.zeros(len(counts), dtype=bool)
+        allowed[[self.codes[letter] + 1 for letter in letters if letter in self.codes]] = True
+        candidate_counts = np.where(allowed, counts, 0)
+        if not candidate_counts.any():
+            return None
+        return self.alphabet[candidate_counts.argmax() - 1]
@@ -1,11 +1,60 @@
+import itertools
 from collections import defaultdict
 
+import numpy as np
+
+from guessers.base import BUDGET_STATS
 from guessers.derived import RederivedAlphabetGuesser
 from guessers.exc import TableFlipError
 
 
+# Number of candidates counted between checks of a guess's deadline
+BUDGET_CHUNK_SIZE = 4096
+
+
+def count_candidate_letters(bucket, selector, count_words=False):
+    """Count the letters of some of a bucket's words, weighted if the bucket is.
+
+    Args:
+        bucket (index.WordBucket): the words' bucket
+        selector (numpy.ndarray): a bool or index array selecting the words'
+            rows of the bucket matrix
+        count_words (bool): whether to count the words containing each
+            letter rather than its occurrences
+
+    Return:
+        an array of counts, indexed by letter code
+    """
+    weights = None if bucket.weights is None else bucket.weights[selector]
+    if count_words:
+        presence = bucket.presence[selector]
+        if weights is None:
+            return np.count_nonzero(presence, axis=0)
+        return weights @ presence
+    return np.bincount(
+        bucket.matrix[selector].ravel(),
+        weights=None if weights is None else np.repeat(weights, bucket.length),
+        minlength=len(bucket.alphabet),
+    )
+
+
 class FrequentLetterGuesser(RederivedAlphabetGuesser):
-    """Guess the most frequent letter in words of the appropriate length"""
+    """Guess the most frequent letter in words of the appropriate length.
+
+    Letters are scored by their total number of occurrences, or by the number
+    of words containing them when `count_words` is set. Words of a weighted
+    index count as many times as their weight. Ties go to the alphabetically
+    first letter.
+
+    Under a `time_budget`, letters are counted over chunks of candidates
+    until the deadline passes, and the most frequent letter of the chunks
+    counted so far is guessed. If the deadline passes before the first
+    chunk, the guess falls back to the bucket's precomputed letter order.
+    """
+    deterministic = True
+    vectorized = False
+    count_words = False
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.correct_guesses = set()
@@ -16,32 +65,37 @@ class FrequentLetterGuesser(RederivedAlphabetGuesser):
 
     def update_state(self, letter_match, guessed_word):
         """Record all guesses and rederive potential words"""
-        for letter, is_correct in letter_match.items():
-            if is_correct:
+        for letter, positions in letter_match.items():
+            if positions:
                 self.correct_guesses.add(letter)
             else:
                 self.incorrect_guesses.add(letter)
 
-        self.potential_words = self._match_words(
-            guessed_word,
-            self.potential_words,
-        )
-        if not self.potential_words:
+        self._match_words(letter_match, guessed_word)
+        if not self.candidates:
             raise TableFlipError('No possible solution found')
 
     def guess(self, guessed_word, *args, **kwargs):
+        self._start_deadline()
         guess = None
-        if len(self.potential_words) == 1:
-            guess = self.potential_words[0]
+        if len(self.candidates) == 1:
+            guess = self.guess_word(self.potential_words[0])
+        elif self.vectorized:
+            guess = self._select_most_frequent_candidate_letter()
         else:
-            guess = self._select_most_frequent_letter(self.potential_words)
+            guess = self._select_most_frequent_letter(
+                self.potential_words,
+                self.candidates.weights,
+            )
         return guess
 
-    def _select_most_frequent_letter(self, potential_words):
+    def _select_most_frequent_letter(self, potential_words, weights=None):
         """Select most frequent unguessed letter in the given words.
 
         Args:
             potential words (list of str): an iterable of words
+            weights (iterable of int): the weight of each word; all words
+                weigh 1 if omitted
 
         Return:
             str
@@ -49,11 +103,99 @@ class FrequentLetterGuesser(RederivedAlphabetGuesser):
         Raise:
             TableFlipError: if all letters have been guessed previously
         """
+        guesses = self.guesses
         letter_counts = defaultdict(int)
-        for word in potential_words:
-            for letter in word:
-                if letter not in self.guesses:
-                    letter_counts[letter] += 1
+        if weights is None:
+            weights = itertools.repeat(1)
+        for index, (word, weight) in enumerate(zip(potential_words, weights)):
+            if not index % BUDGET_CHUNK_SIZE and self._out_of_time():
+                if not index:
+                    return self._select_fallback_letter()
+                BUDGET_STATS.partial += 1
+                break
+            for letter in (set(word) if self.count_words else word):
+                if letter not in guesses:
+                    letter_counts[letter] += weight
         if not letter_counts:
             raise TableFlipError('No possible solution found')
-        return sorted(list(letter_counts.items()), key=lambda t: t[1], reverse=True)[0][0]
+        return max(sorted(letter_counts.items()), key=lambda t: t[1])[0]
+
+    def _select_most_frequent_candidate_letter(self):
+        """Select most frequent unguessed letter in the remaining candidates.
+
+        Equivalent to `_select_most_frequent_letter`, but counts letters over
+        the candidates' rows of the bucket's letter code matrix. Before any
+        candidate is discarded, the bucket's own letter counts are used.
+
+        Return:
+            str
+
+        Raise:
+            TableFlipError: if all letters have been guessed previously
+        """
+        bucket = self.candidates.bucket
+        if self.candidates.mask == bucket.full_mask:
+            letter_counts = bucket.word_counts if self.count_words else bucket.letter_counts
+            letter_counts = letter_counts.copy()
+        elif self._deadline is None:
+            letter_counts = count_candidate_letters(
+                bucket,
+                self.candidates.selector,
+                self.count_words,
+            )
+        else:
+            letter_counts = self._count_candidate_letters_until_deadline()
+            if letter_counts is None:
+                return self._select_fallback_letter()
+        codes = bucket.codes
+        letter_counts[[codes[letter] for letter in self.guesses if letter in codes]] = 0
+        if not letter_counts.any():
+            raise TableFlipError('No possible solution found')
+        return bucket.alphabet[letter_counts.argmax()]
+
+    def _count_candidate_letters_until_deadline(self):
+        """Count the candidates' letters chunk by chunk, until the guess's deadline.
+
+        Return:
+            an array of counts, indexed by letter code, or None if the
+            deadline passed before any chunk was counted
+        """
+        bucket = self.candidates.bucket
+        rows = np.flatnonzero(self.candidates.selector)
+        letter_counts = None
+        for start in range(0, len(rows), BUDGET_CHUNK_SIZE):
+            if self._out_of_time():
+                BUDGET_STATS.partial += letter_counts is not None
+                break
+            chunk_counts = count_candidate_letters(
+                bucket,
+                rows[start:start + BUDGET_CHUNK_SIZE],
+                self.count_words,
+            )
+            letter_counts = chunk_counts if letter_counts is None else letter_counts + chunk_counts
+        return letter_counts
+
+    def _select_fallback_letter(self):
+        """Select the first letter of the bucket's letter order left to guess.
+
+        The letter order is computed once per bucket, which makes this a
+        cheap substitute for guesses that ran out of time.
+
+        Return:
+            str
+
+        Raise:
+            TableFlipError: if all letters of the candidates have been guessed
+        """
+        BUDGET_STATS.fallbacks += 1
+        alphabet = self.candidates.alphabet
+        guesses = self.guesses
+        for letter in self.candidates.bucket.letter_order:
+            if letter in alphabet and letter not in guesses:
+                return letter
+        raise TableFlipError('No possible solution found')
+
+
+class VectorizedFrequentLetterGuesser(FrequentLetterGuesser):
+    """Guess the most frequent letter, counted with vectorized array operations"""
+    vectorized = True
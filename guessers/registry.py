@@ -0,0 +1,112 @@
+import importlib
+from collections import OrderedDict
+from collections.abc import MutableMapping
+
+
+# Entry point group under which installed distributions may declare guessers,
+# e.g. `my-guesser = my_package.guessers:MyGuesser`
+ENTRY_POINT_GROUP = 'hangman.guessers'
+
+
+def load_guesser(path):
+    """Import a guesser class from its dotted path.
+
+    Args:
+        path (str): the path of the class, as 'package.module:ClassName'
+
+    Return:
+        type
+
+    Raise:
+        ValueError: if the path does not name an attribute of a module
+    """
+    module_name, _, attribute = path.partition(':')
+    if not module_name or not attribute:
+        raise ValueError('invalid guesser path {}'.format(path))
+    guesser = importlib.import_module(module_name)
+    for name in attribute.split('.'):
+        guesser = getattr(guesser, name)
+    return guesser
+
+
+def _entry_points(group):
+    """List the entry points of a group across installed distributions"""
+    try:
+        from importlib import metadata
+    except ImportError:  # Python < 3.8
+        return []
+    entry_points = metadata.entry_points()
+    if hasattr(entry_points, 'select'):
+        return list(entry_points.select(group=group))
+    return list(entry_points.get(group, ()))
+
+
+class GuesserRegistry(MutableMapping):
+    """Map names to guesser classes, importing each class on first lookup.
+
+    Guessers are declared by dotted path ('package.module:ClassName'), or
+    directly as classes. Guessers declared by installed distributions under
+    the `entry_point_group` are added after the given ones, the first time
+    the registry is listed or asked for a name it does not know. Looking up
+    an unregistered dotted path imports it without registering it.
+
+    Args:
+        guessers (iterable of (str, str or type)): names and guessers, in
+            the order they are listed
+        entry_point_group (str): the entry point group of third-party
+            guessers; None to ignore installed distributions
+    """
+
+    def __init__(self, guessers=(), entry_point_group=ENTRY_POINT_GROUP):
+        self._guessers = OrderedDict(guessers)
+        self.entry_point_group = entry_point_group
+        self._discovered = entry_point_group is None
+
+    def __getitem__(self, name):
+        if name not in self._guessers:
+            self._discover()
+        guesser = self._guessers.get(name)
+        if guesser is None:
+            if ':' not in name:
+                raise KeyError(name)
+            return load_guesser(name)
+        if isinstance(guesser, str):
+            guesser = self._guessers[name] = load_guesser(guesser)
+        return guesser
+
+    def __setitem__(self, name, guesser):
+        self._guessers[name] = guesser
+
+    def __delitem__(self, name):
+        self._discover()
+        del self._guessers[name]
+
+    def __contains__(self, name):
+        if name not in self._guessers:
+            self._discover()
+        return name in self._guessers
+
+    def __iter__(self):
+        self._discover()
+        return iter(list(self._guessers))
+
+    def __len__(self):
+        self._discover()
+        return len(self._guessers)
+
+    def path(self, name):
+        """Return the dotted path of a registered guesser, without importing it"""
+        if name not in self._guessers:
+            self._discover()
+        guesser = self._guessers[name]
+        if isinstance(guesser, str):
+            return guesser
+        return '{}:{}'.format(guesser.__module__, guesser.__qualname__)
+
+    def _discover(self):
+        """Register the guessers of installed distributions, without importing them"""
+        if self._discovered:
+            return
+        self._discovered = True
+        for entry_point in _entry_points(self.entry_point_group):
+            self._guessers.setdefault(entry_point.name, entry_point.value)
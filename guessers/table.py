@@ -0,0 +1,200 @@
+import gzip
+import json
+
+import numpy as np
+
+from guessers.base import BaseGuesser
+from guessers.cache import ModelCache
+from guessers.entropy import letter_entropies
+from guessers.probability import VectorizedFrequentLetterGuesser
+
+
+# Loaded decision tables, keyed by path
+TABLE_CACHE = ModelCache(max_size=4)
+
+
+def state_key(guessed_word, incorrect_guesses):
+    """Identify a game state by its revealed pattern and wrong letters"""
+    return '{}:{}'.format(guessed_word, ''.join(sorted(incorrect_guesses)))
+
+
+def partition(rows, code):
+    """Group candidate words by the positions at which a letter would be revealed.
+
+    Args:
+        rows (numpy.ndarray): the candidates' rows of a bucket's letter matrix
+        code (int): the guessed letter's code
+
+    Return:
+        a (masks, inverse, counts) tuple: each distinct reveal mask, packed
+        into a row of bytes; the index of each candidate's mask; and the
+        number of candidates per mask
+    """
+    masks = np.packbits(rows == code, axis=1)
+    return np.unique(masks, axis=0, return_inverse=True, return_counts=True)
+
+
+def best_letter(rows, guessed_codes, alphabet_size, criterion='information'):
+    """Select the best unguessed letter for a set of candidates.
+
+    'information' maximizes the entropy of the partition the letter induces;
+    'misses' maximizes the number of candidates containing the letter, so
+    that the chance of a miss is lowest. Ties go to the alphabetically first
+    letter.
+
+    Args:
+        rows (numpy.ndarray): the candidates' rows of a bucket's letter matrix
+        guessed_codes (collection of int): codes of letters already guessed
+        alphabet_size (int): the number of letters in the bucket's alphabet
+        criterion (str): 'information' or 'misses'
+
+    Return:
+        int: the code of the selected letter, or None if all letters present
+        in the candidates have been guessed
+    """
+    present = np.zeros((len(rows), alphabet_size), dtype=bool)
+    present[np.arange(len(rows))[:, None], rows] = True
+    if criterion == 'misses':
+        scores = np.count_nonzero(present, axis=0).astype(float)
+    else:
+        scores = letter_entropies(rows, alphabet_size)
+    scores[~present.any(axis=0)] = -np.inf
+    scores[list(guessed_codes)] = -np.inf
+    if not np.isfinite(scores).any():
+        return None
+    return int(scores.argmax())
+
+
+def build_table(word_index, max_failures=8, lengths=None, criterion='information'):
+    """Walk the game tree of each word length, recording the best guess per state.
+
+    Starting from a fully obscured word, the best letter is guessed and the
+    candidates are split by the pattern it would reveal; each part is a
+    reachable state, which is walked in turn until a single candidate
+    remains (recorded as a whole-word guess) or the game is lost.
+
+    Args:
+        word_index (WordIndex): all potential words to guess
+        max_failures (int): the number of incorrect guesses that loses a game
+        lengths (iterable of int): the word lengths to walk; defaults to all
+        criterion (str): 'information' to maximize the expected information
+            of each guess, or 'misses' to minimize its chance of missing
+
+    Return:
+        a {str: str} dict of state keys to guesses
+    """
+    table = {}
+    for length in lengths or word_index.lengths:
+        bucket = word_index.bucket(length)
+        if not len(bucket):
+            continue
+        states = [(np.arange(len(bucket)), '.' * length, '')]
+        while states:
+            row_indices, pattern, incorrect = states.pop()
+            key = state_key(pattern, incorrect)
+            if len(row_indices) == 1:
+                table[key] = bucket.words[row_indices[0]]
+                continue
+
+            rows = bucket.matrix[row_indices]
+            guessed_codes = {
+                bucket.codes[letter]
+                for letter in set(pattern + incorrect) - {'.'}
+            }
+            code = best_letter(rows, guessed_codes, len(bucket.alphabet), criterion)
+            if code is None:
+                # Indistinguishable duplicates remain; guess the first
+                table[key] = bucket.words[row_indices[0]]
+                continue
+            letter = bucket.alphabet[code]
+            table[key] = letter
+
+            _, inverse, _ = partition(rows, code)
+            inverse = inverse.ravel()
+            for part in range(inverse.max() + 1):
+                part_indices = row_indices[inverse == part]
+                revealed = bucket.matrix[part_indices[0]] == code
+                if revealed.any():
+                    part_pattern = ''.join(
+                        letter if is_revealed else pattern_letter
+                        for pattern_letter, is_revealed in zip(pattern, revealed)
+                    )
+                    states.append((part_indices, part_pattern, incorrect))
+                elif len(incorrect) + 1 < max_failures:
+                    states.append((part_indices, pattern, incorrect + letter))
+    return table
+
+
+def save_table(table, path, max_failures):
+    """Write a decision table as gzip-compressed JSON"""
+    with gzip.open(path, 'wt', encoding='utf-8') as table_file:
+        json.dump(
+            {'max_failures': max_failures, 'states': table},
+            table_file,
+            separators=(',', ':'),
+        )
+
+
+def load_table(path):
+    """Read a decision table written by save_table.
+
+    Return:
+        a {str: str} dict of state keys to guesses
+    """
+    with gzip.open(path, 'rt', encoding='utf-8') as table_file:
+        return json.load(table_file)['states']
+
+
+class TableGuesser(BaseGuesser):
+    """Look up each guess in a precomputed decision table.
+
+    The table is read from `table_path` once per process. States missing
+    from the table (for words outside the dictionary it was built from, or
+    games allowing more failures) are handed to a frequent letter guesser.
+    """
+    deterministic = True
+    table_path = None
+
+    def __init__(self, word_length, potential_words, *args, **kwargs):
+        self.word_length = word_length
+        self.potential_words = potential_words
+        self.incorrect_guesses = set()
+        self.fallback = None
+        if self.table_path:
+            self.table = TABLE_CACHE.get(
+                ('table', self.table_path),
+                lambda: load_table(self.table_path),
+            )
+        else:
+            self.table = {}
+
+    @classmethod
+    def decision_key(cls):
+        """Decisions depend on the table they are looked up in"""
+        return (cls.table_path,)
+
+    def guess(self, guessed_word, *args, **kwargs):
+        if self.fallback is None:
+            guess = self.table.get(state_key(guessed_word, self.incorrect_guesses))
+            if guess is not None:
+                return self.guess_word(guess) if len(guess) > 1 else guess
+            self.fallback = self._build_fallback(guessed_word)
+        return self.fallback.guess(guessed_word, *args, **kwargs)
+
+    def update_state(self, letter_match, guessed_word):
+        for letter, positions in letter_match.items():
+            if not positions:
+                self.incorrect_guesses.add(letter)
+        if self.fallback is not None:
+            self.fallback.update_state(letter_match, guessed_word)
+
+    def _build_fallback(self, guessed_word):
+        """Create a frequent letter guesser caught up with the game so far"""
+        fallback = VectorizedFrequentLetterGuesser(self.word_length, self.potential_words)
+        letter_match = {letter: [] for letter in self.incorrect_guesses}
+        for position, letter in enumerate(guessed_word):
+            if letter != '.':
+                letter_match.setdefault(letter, []).append(position)
+        if letter_match:
+            fallback.update_state(letter_match, guessed_word)
+        return fallback
@@ -0,0 +1,419 @@
+import hashlib
+from collections import defaultdict
+
+import numpy as np
+
+
+def _bitset(flags):
+    """Build an integer bitset from a bool array; bit `i` is set if `flags[i]` is"""
+    return int.from_bytes(np.packbits(flags, bitorder='little').tobytes(), 'little')
+
+
+def _set_bits(mask):
+    """Yield the indices of all set bits in an integer bitset, lowest first"""
+    bits = bin(mask)[:1:-1]
+    index = bits.find('1')
+    while index >= 0:
+        yield index
+        index = bits.find('1', index + 1)
+
+
+class WordBucket:
+    """All indexed words of a single length.
+
+    Words are kept as a matrix of letter codes for vectorized scoring, built
+    from the words on first use or provided directly (e.g. memory-mapped from
+    a compiled dictionary, in which case words are only decoded when needed).
+
+    Positional bitsets are also built on first use: bit `i` of a bitset
+    refers to `words[i]`, so narrowing down candidates is a matter of
+    intersecting integers rather than scanning strings.
+
+    Words may carry integer weights (e.g. their frequency in a corpus), kept
+    as an array parallel to the matrix rows; `weights` is None when all words
+    are equally likely.
+
+    A bucket is the per-length context shared by every guesser of its index:
+    its alphabet and letter counts are computed once, on first use, rather
+    than rederived from the word list by each guesser.
+    """
+
+    def __init__(self, length, words=None, alphabet=None, matrix=None, weights=None):
+        self.length = length
+        self.weights = weights
+        self._words = words
+        self._alphabet = alphabet
+        self._matrix = matrix
+        self._size = len(words) if words is not None else len(matrix)
+        self.full_mask = (1 << self._size) - 1
+        self._positions = None
+        self._letters = None
+        self._digest = None
+        self._codes = None
+        self._presence = None
+        self._letter_counts = None
+        self._word_counts = None
+        self._letter_order = None
+
+    def __len__(self):
+        return self._size
+
+    @property
+    def words(self):
+        if self._words is None:
+            self._words = self._decode(self.matrix)
+        return self._words
+
+    @property
+    def digest(self):
+        """A hash of the bucket's words, identifying it across runs"""
+        if self._digest is None:
+            digest = hashlib.sha1(''.join(self.alphabet).encode('utf-8'))
+            digest.update(np.ascontiguousarray(self.matrix).tobytes())
+            if self.weights is not None:
+                digest.update(np.ascontiguousarray(self.weights, dtype='<i8').tobytes())
+            self._digest = digest.hexdigest()
+        return self._digest
+
+    @property
+    def alphabet(self):
+        """Sorted list of all letters in the bucket; a letter's code is its index"""
+        if self._alphabet is None:
+            self._encode()
+        return self._alphabet
+
+    @property
+    def codes(self):
+        """Map of letters to their codes"""
+        if self._codes is None:
+            self._codes = {letter: code for code, letter in enumerate(self.alphabet)}
+        return self._codes
+
+    @property
+    def matrix(self):
+        """A (word count, length) uint8 array of letter codes, one row per word"""
+        if self._matrix is None:
+            self._encode()
+        return self._matrix
+
+    @property
+    def presence(self):
+        """A (word count, alphabet size) bool array of letters in each word"""
+        if self._presence is None:
+            presence = np.zeros((len(self), len(self.alphabet)), dtype=bool)
+            presence[np.arange(len(self))[:, None], self.matrix] = True
+            self._presence = presence
+        return self._presence
+
+    @property
+    def letter_counts(self):
+        """An array of each letter's occurrences in the bucket, weighted, indexed by code"""
+        if self._letter_counts is None:
+            self._letter_counts = np.bincount(
+                self.matrix.ravel(),
+                weights=None if self.weights is None else np.repeat(self.weights, self.length),
+                minlength=len(self.alphabet),
+            )
+        return self._letter_counts
+
+    @property
+    def word_counts(self):
+        """An array of the number (or weight) of words containing each letter, indexed by code"""
+        if self._word_counts is None:
+            if self.weights is None:
+                self._word_counts = np.count_nonzero(self.presence, axis=0)
+            else:
+                self._word_counts = self.weights @ self.presence
+        return self._word_counts
+
+    @property
+    def letter_order(self):
+        """All letters, from the one contained in the most (or heaviest) words down.
+
+        Ties go to the alphabetically first letter.
+        """
+        if self._letter_order is None:
+            order = np.argsort(-self.word_counts, kind='stable')
+            self._letter_order = [self.alphabet[code] for code in order]
+        return self._letter_order
+
+    def _encode(self):
+        """Translate the bucket's words into a matrix of letter codes"""
+        code_points = np.frombuffer(
+            ''.join(self._words).encode('utf-32-le'),
+            dtype=np.uint32,
+        )
+        letters, codes = np.unique(code_points, return_inverse=True)
+        self._alphabet = [chr(letter) for letter in letters]
+        self._matrix = codes.astype(np.uint8).reshape(len(self._words), self.length)
+
+    def _decode(self, rows):
+        """Translate rows of the matrix of letter codes back into words"""
+        code_points = np.array([ord(letter) for letter in self.alphabet], dtype='<u4')
+        text = code_points[rows].tobytes().decode('utf-32-le')
+        return [
+            text[start:start + self.length]
+            for start in range(0, len(rows) * self.length, self.length)
+        ]
+
+    @property
+    def positions(self):
+        """Per-position maps of letters to bitsets of words with that letter there"""
+        if self._positions is None:
+            # Assigned once built, as buckets are shared by the server's threads
+            self._positions = [
+                {
+                    self.alphabet[code]: _bitset(column == code)
+                    for code in np.unique(column)
+                }
+                for column in self.matrix.T
+            ]
+        return self._positions
+
+    @property
+    def letters(self):
+        """Map of letters to bitsets of words containing that letter"""
+        if self._letters is None:
+            self._letters = {
+                letter: _bitset(self.presence[:, code])
+                for code, letter in enumerate(self.alphabet)
+            }
+        return self._letters
+
+    def prepare(self):
+        """Build the lazy bitsets and arrays used to narrow down candidates.
+
+        Called before forking worker processes, so that they share these
+        rather than each building their own, or before timing guesses.
+        """
+        self.positions
+        self.letters
+        self.presence
+
+    def match_mask(self, pattern, absent_letters=()):
+        """Compute the bitset of words matching a partially guessed word.
+
+        A revealed letter is revealed at every position it occupies, so
+        unknown positions can hold neither absent nor revealed letters.
+
+        Args:
+            pattern (str): the word guessed so far, with '.' for unknown letters
+            absent_letters (iterable of str): letters known not to be in the word
+
+        Return:
+            int
+        """
+        revealed_letters = set(pattern) - {'.'}
+        mask = self.full_mask
+        for position, letter in enumerate(pattern):
+            position_masks = self.positions[position]
+            if letter != '.':
+                mask &= position_masks.get(letter, 0)
+            else:
+                for revealed_letter in revealed_letters:
+                    mask &= ~position_masks.get(revealed_letter, 0)
+        for letter in absent_letters:
+            mask &= ~self.letters.get(letter, 0)
+        return mask
+
+    def selector(self, mask):
+        """Convert a bitset into a bool array selecting rows of the bucket matrix"""
+        mask_bytes = mask.to_bytes((len(self) + 7) // 8, 'little')
+        bits = np.unpackbits(np.frombuffer(mask_bytes, dtype=np.uint8), bitorder='little')
+        return bits[:len(self)].astype(bool)
+
+    def select(self, mask):
+        """Return the words whose bits are set in the given bitset"""
+        if mask == self.full_mask:
+            return self.words
+        if self._words is None:
+            return self._decode(self.matrix[self.selector(mask)])
+        return [self._words[index] for index in _set_bits(mask)]
+
+
+class CandidateSet:
+    """The words of a bucket still consistent with a game's guesses.
+
+    Each guess result narrows the set in place by intersecting the bucket's
+    precomputed bitsets, rather than re-matching every remaining word.
+    """
+
+    def __init__(self, bucket, mask=None):
+        self.bucket = bucket
+        self.mask = bucket.full_mask if mask is None else mask
+        self._count = None
+        self._words = None
+        self._selector = None
+
+    def __len__(self):
+        if self._count is None:
+            self._count = bin(self.mask).count('1')
+        return self._count
+
+    def __bool__(self):
+        return bool(self.mask)
+
+    @property
+    def selector(self):
+        """A bool array selecting the remaining candidates' rows of the bucket matrix"""
+        if self._selector is None:
+            self._selector = self.bucket.selector(self.mask)
+        return self._selector
+
+    @property
+    def words(self):
+        """List the remaining candidate words"""
+        if self._words is None:
+            self._words = self.bucket.select(self.mask)
+        return self._words
+
+    @property
+    def weights(self):
+        """The remaining candidates' weights, or None if the bucket is unweighted"""
+        if self.bucket.weights is None:
+            return None
+        return self.bucket.weights[self.selector]
+
+    @property
+    def alphabet(self):
+        """Extract all unique letters in the remaining candidate words"""
+        if self.mask == self.bucket.full_mask:
+            return set(self.bucket.alphabet)
+        return {
+            letter
+            for letter, letter_mask in self.bucket.letters.items()
+            if letter_mask & self.mask
+        }
+
+    def narrow(self, letter, positions):
+        """Discard candidates inconsistent with a guessed letter.
+
+        Args:
+            letter (str): the guessed letter
+            positions (collection of int): every position at which the letter
+                was revealed; empty if the letter is absent from the word
+        """
+        mask = self.mask
+        if not positions:
+            mask &= ~self.bucket.letters.get(letter, 0)
+        else:
+            for position, position_masks in enumerate(self.bucket.positions):
+                letter_mask = position_masks.get(letter, 0)
+                mask &= letter_mask if position in positions else ~letter_mask
+        self._update(mask)
+
+    def exclude(self, word):
+        """Discard a word from the candidates, e.g. after guessing it wrong"""
+        if len(word) == self.bucket.length:
+            self._update(self.mask & ~self.bucket.match_mask(word))
+
+    def _update(self, mask):
+        if mask != self.mask:
+            self.mask = mask
+            self._count = None
+            self._words = None
+            self._selector = None
+
+    def copy(self):
+        return CandidateSet(self.bucket, self.mask)
+
+
+class WordIndex:
+    """A collection of words bucketed by length.
+
+    Built once per word file and shared by every guesser, so that finding
+    the words of a given length does not require rescanning the whole list.
+    Iterating over the index yields every word, grouped by length.
+    """
+
+    def __init__(self, words):
+        buckets = defaultdict(list)
+        for word in words:
+            buckets[len(word)].append(word)
+        self._buckets = {
+            length: WordBucket(length, bucket_words)
+            for length, bucket_words in buckets.items()
+        }
+
+    @classmethod
+    def from_weighted(cls, weighted_words):
+        """Build an index of weighted words.
+
+        Args:
+            weighted_words (iterable of (str, int)): words and their weights,
+                e.g. their number of occurrences in a corpus
+        """
+        buckets = defaultdict(lambda: ([], []))
+        for word, weight in weighted_words:
+            bucket_words, bucket_weights = buckets[len(word)]
+            bucket_words.append(word)
+            bucket_weights.append(weight)
+        return cls.from_buckets(
+            WordBucket(length, words, weights=np.array(weights, dtype=np.int64))
+            for length, (words, weights) in buckets.items()
+        )
+
+    @classmethod
+    def from_buckets(cls, buckets):
+        """Build an index around existing buckets, e.g. loaded from a compiled dictionary"""
+        index = cls.__new__(cls)
+        index._buckets = {bucket.length: bucket for bucket in buckets if len(bucket)}
+        return index
+
+    def __iter__(self):
+        for length in sorted(self._buckets):
+            yield from self._buckets[length].words
+
+    def __len__(self):
+        return sum(len(bucket) for bucket in self._buckets.values())
+
+    @property
+    def lengths(self):
+        return sorted(self._buckets)
+
+    @property
+    def weights(self):
+        """List the weight of every word in iteration order, or None if unweighted"""
+        buckets = [self._buckets[length] for length in self.lengths]
+        if not any(bucket.weights is not None for bucket in buckets):
+            return None
+        return [
+            weight
+            for bucket in buckets
+            for weight in (
+                bucket.weights.tolist()
+                if bucket.weights is not None
+                else [1] * len(bucket)
+            )
+        ]
+
+    def bucket(self, length):
+        """Return the bucket of words of the given length (possibly empty)"""
+        bucket = self._buckets.get(length)
+        if bucket is None:
+            bucket = WordBucket(length, [])
+        return bucket
+
+    def words(self, length):
+        """Return all words of the given length.
+
+        The returned list is shared by the index and must not be mutated.
+        """
+        return self.bucket(length).words
+
+    def candidates(self, length):
+        """Return a fresh set of candidates containing every word of the given length"""
+        return CandidateSet(self.bucket(length))
+
+    def match(self, pattern, absent_letters=()):
+        """Return all words matching a partially guessed word.
+
+        Args:
+            pattern (str): the word guessed so far, with '.' for unknown letters
+            absent_letters (iterable of str): letters known not to be in the word
+
+        Return:
+            list of str
+        """
+        bucket = self.bucket(len(pattern))
+        return bucket.select(bucket.match_mask(pattern, absent_letters))
@@ -0,0 +1,105 @@
+import json
+from collections import defaultdict
+
+from simulation import percentile
+
+
+class Instrumentation:
+    """Timers, counters and samples collected from the game loop.
+
+    Passed to simulation.play_game, an instance is told how long each phase
+    of each turn took (constructing the guesser, `guess`, `process_guess`
+    and `update_state`), how many candidates the guesser had left, how many
+    lookups its caches served, and how many of its guesses ran out of their
+    time budget. Subclasses may override `time`, `count`
+    and `observe` to route measurements elsewhere.
+
+    Instances collected from separate games or processes are combined with
+    `merge`.
+    """
+
+    def __init__(self):
+        self.durations = defaultdict(float)
+        self.calls = defaultdict(int)
+        self.counters = defaultdict(int)
+        self.samples = defaultdict(list)
+
+    def time(self, phase, duration):
+        """Record a call to a phase of the game loop, lasting `duration` seconds"""
+        self.durations[phase] += duration
+        self.calls[phase] += 1
+
+    def count(self, name, amount=1):
+        self.counters[name] += amount
+
+    def observe(self, name, value):
+        """Record a sample of a distribution, e.g. the candidate count of a turn"""
+        self.samples[name].append(value)
+
+    def merge(self, other):
+        """Add the measurements of another instance to this one"""
+        for phase, duration in other.durations.items():
+            self.durations[phase] += duration
+        for phase, calls in other.calls.items():
+            self.calls[phase] += calls
+        for name, amount in other.counters.items():
+            self.counters[name] += amount
+        for name, values in other.samples.items():
+            self.samples[name].extend(values)
+        return self
+
+    def to_dict(self):
+        """Summarize all measurements as JSON-serializable data"""
+        samples = {}
+        for name, values in self.samples.items():
+            values = sorted(values)
+            samples[name] = {
+                'count': len(values),
+                'mean': sum(values) / len(values) if values else None,
+                'p50': percentile(values, 50),
+                'p90': percentile(values, 90),
+                'max': values[-1] if values else None,
+            }
+        return {
+            'phases': {
+                phase: {
+                    'calls': self.calls[phase],
+                    'total_ms': round(duration * 1000, 4),
+                    'mean_ms': round(duration * 1000 / self.calls[phase], 4),
+                }
+                for phase, duration in self.durations.items()
+            },
+            'counters': dict(self.counters),
+            'samples': samples,
+        }
+
+    def save(self, path):
+        with open(path, 'w') as stats_file:
+            json.dump(self.to_dict(), stats_file, indent=2)
+
+    def summary(self):
+        stats = self.to_dict()
+        lines = [
+            '\t{}: {} calls, {:.3f}ms total, {:.4f}ms mean'.format(
+                phase,
+                phase_stats['calls'],
+                phase_stats['total_ms'],
+                phase_stats['mean_ms'],
+            )
+            for phase, phase_stats in sorted(stats['phases'].items())
+        ]
+        lines.extend(
+            '\t{}: {}'.format(name, amount)
+            for name, amount in sorted(stats['counters'].items())
+        )
+        lines.extend(
+            '\t{}: mean {:.1f}, p50 {}, p90 {}, max {}'.format(
+                name,
+                name_stats['mean'] or 0,
+                name_stats['p50'],
+                name_stats['p90'],
+                name_stats['max'],
+            )
+            for name, name_stats in sorted(stats['samples'].items())
+        )
+        return '\n'.join(lines)
@@ -0,0 +1,168 @@
+from collections import defaultdict
+
+import numpy as np
+
+from guessers.probability import FrequentLetterGuesser, count_candidate_letters
+from guessers.table import partition
+from index import WordIndex
+from simulation import GameResult, SimulationResult
+
+
+def supports_lockstep(guesser_class):
+    """Check whether a guesser plays like FrequentLetterGuesser.
+
+    Such guessers pick the same letter for every game with the same
+    candidates, which is what lets play_lockstep share guesses across games.
+    Guesses under a time budget depend on timing, so they are not shared.
+    """
+    return (
+        issubclass(guesser_class, FrequentLetterGuesser)
+        and guesser_class.time_budget is None
+        and guesser_class.guess is FrequentLetterGuesser.guess
+        and guesser_class.update_state is FrequentLetterGuesser.update_state
+    )
+
+
+def play_lockstep(guesser_class, words, targets, max_guesses=8):
+    """Play one game per target word at once, with a frequent letter strategy.
+
+    Games are advanced in lockstep, grouped by state: all games whose
+    guesses so far revealed the same pattern share their candidates, and
+    therefore their next guess. Each group's guess is computed once over the
+    candidates' rows of the bucket matrix, then the group is split by the
+    positions at which the guessed letter appears in each game's word. A
+    full-bucket sweep thus computes one guess per distinct game state rather
+    than per game and turn.
+
+    Results are identical to playing each game through `simulation.play_game`,
+    except that no per-guess durations are recorded.
+
+    Args:
+        guesser_class (type): FrequentLetterGuesser or a subclass for which
+            `supports_lockstep` holds
+        words (list of str or WordIndex): a collection of all potential
+            words to guess
+        targets (list of str): the words to guess, which must all be in `words`
+        max_guesses (int): a maximum number of guesses allowed per game
+
+    Return:
+        SimulationResult, with games in the order of targets
+
+    Raise:
+        ValueError: if the guesser is not supported or a target is not in `words`
+    """
+    if not supports_lockstep(guesser_class):
+        raise ValueError('{} cannot be played in lockstep'.format(guesser_class.__name__))
+    word_index = words if isinstance(words, WordIndex) else WordIndex(words)
+
+    games = [None] * len(targets)
+    targets_by_length = defaultdict(list)
+    for target_position, target in enumerate(targets):
+        targets_by_length[len(target)].append(target_position)
+
+    for length, target_positions in targets_by_length.items():
+        bucket = word_index.bucket(length)
+        rows_by_word = {}
+        for row, word in enumerate(bucket.words):
+            rows_by_word.setdefault(word, row)
+        try:
+            target_rows = np.array(
+                [rows_by_word[targets[position]] for position in target_positions],
+                dtype=np.int64,
+            )
+        except KeyError as error:
+            raise ValueError('{} is not a potential word'.format(error.args[0]))
+
+        for game, result in _play_bucket(guesser_class, bucket, target_rows, max_guesses):
+            games[target_positions[game]] = result
+
+    return SimulationResult(guesser_class.__name__, games)
+
+
+def _play_bucket(guesser_class, bucket, target_rows, max_guesses):
+    """Play the games of a single bucket, walking the tree of their states.
+
+    Yield:
+        (int, GameResult) tuples of the index of a game in target_rows and
+        its result
+    """
+    # Each state: the sorted rows of the remaining candidates, the games in
+    # that state, the pattern revealed so far and the letters guessed
+    states = [(
+        np.arange(len(bucket)),
+        np.arange(len(target_rows)),
+        '.' * bucket.length,
+        frozenset(),
+        frozenset(),
+    )]
+    while states:
+        candidates, games, pattern, correct, incorrect = states.pop()
+
+        if '.' not in pattern or len(incorrect) >= max_guesses:
+            for game in games:
+                yield game, _result(
+                    bucket,
+                    target_rows[game],
+                    pattern,
+                    correct,
+                    incorrect,
+                )
+            continue
+
+        if len(candidates) == 1:
+            # The guesser submits the last candidate whole
+            word = bucket.words[candidates[0]]
+            correct = correct | set(word)
+            for game in games:
+                yield game, _result(bucket, target_rows[game], word, correct, incorrect)
+            continue
+
+        letter_counts = count_candidate_letters(
+            bucket,
+            candidates,
+            guesser_class.count_words,
+        )
+        guessed_codes = [bucket.codes[letter] for letter in correct | incorrect]
+        letter_counts[guessed_codes] = 0
+        if not letter_counts.any():
+            # The guesser flips the table, losing the game
+            for game in games:
+                yield game, _result(
+                    bucket,
+                    target_rows[game],
+                    pattern,
+                    correct,
+                    incorrect,
+                )
+            continue
+        code = int(letter_counts.argmax())
+        letter = bucket.alphabet[code]
+
+        _, inverse, _ = partition(bucket.matrix[candidates], code)
+        inverse = inverse.ravel()
+        game_parts = inverse[np.searchsorted(candidates, target_rows[games])]
+        for part in np.unique(game_parts):
+            part_candidates = candidates[inverse == part]
+            part_games = games[game_parts == part]
+            revealed = bucket.matrix[part_candidates[0]] == code
+            if revealed.any():
+                part_pattern = ''.join(
+                    letter if is_revealed else pattern_letter
+                    for pattern_letter, is_revealed in zip(pattern, revealed)
+                )
+                part_state = (part_pattern, correct | {letter}, incorrect)
+            else:
+                part_state = (pattern, correct, incorrect | {letter})
+            states.append((part_candidates, part_games) + part_state)
+
+
+def _result(bucket, row, guessed_word, correct, incorrect):
+    word = bucket.words[row]
+    return GameResult(
+        word=word,
+        guessed_word=guessed_word,
+        has_won=guessed_word == word,
+        correct_count=len(correct),
+        incorrect_count=len(incorrect),
+        guess_durations=[],
+    )
@@ -1,104 +1,299 @@
 import argparse
+import cProfile
+import json
+import os
 import random
+import socket
 
 import guessers
-from game import Game
+from corpus import DEFAULT_ALPHABET, is_weighted, read_weighted_words, read_words, stream_words
+from guessers.registry import GuesserRegistry
 
+# Modules that import numpy or guessers (index, dictfile, simulation, lockstep,
+# instrumentation, guessers.base) are imported where they are used, so that
+# `--list` and `--daemon` runs never load them
 
-GUESSERS = {
-    'manual': guessers.ManualGuesser,
-    'random': guessers.RandomGuesser,
-    'ordered-random': guessers.OrderedRandomGuesser,
-    'derived': guessers.DerivedAlphabetGuesser,
-    'ordered-derived': guessers.OrderedDerivedAlphabetGuesser,
-    'rederived': guessers.RederivedAlphabetGuesser,
-    'frequent': guessers.FrequentLetterGuesser,
-    'markov1': guessers.SingleStateMarkovGuesser,
-    'markov2': guessers.DoubleStateMarkovGuesser,
-}
 
+# Guessers by name, each imported only once selected; installed distributions
+# may add their own under the 'hangman.guessers' entry point group
+GUESSERS = GuesserRegistry([
+    ('manual', 'guessers.manual:ManualGuesser'),
+    ('random', 'guessers.naive:RandomGuesser'),
+    ('ordered-random', 'guessers.naive:OrderedRandomGuesser'),
+    ('derived', 'guessers.derived:DerivedAlphabetGuesser'),
+    ('ordered-derived', 'guessers.derived:OrderedDerivedAlphabetGuesser'),
+    ('rederived', 'guessers.derived:RederivedAlphabetGuesser'),
+    ('frequent', 'guessers.probability:FrequentLetterGuesser'),
+    ('frequent-vectorized', 'guessers.probability:VectorizedFrequentLetterGuesser'),
+    ('markov1', 'guessers.markov:SingleStateMarkovGuesser'),
+    ('markov2', 'guessers.markov:DoubleStateMarkovGuesser'),
+    ('markov1-incremental', 'guessers.markov:IncrementalSingleStateMarkovGuesser'),
+    ('markov2-incremental', 'guessers.markov:IncrementalDoubleStateMarkovGuesser'),
+    ('entropy', 'guessers.entropy:EntropyGuesser'),
+    ('table', 'guessers.table:TableGuesser'),
+])
 
-def load_words(file_path):
-    """Parse all words from the specified file.
+
+def load_words(file_path, alphabet=DEFAULT_ALPHABET):
+    """Parse all unique, normalized words from the specified file.
 
     Args:
         file_path (str): path to a file containaing a collection of
             newline-delimited words.
+        alphabet (collection of str): the letters words may contain
 
     Return:
         list of str
     """
     with open(file_path) as wordfile:
-        words = wordfile.read().lower().split()
+        words = list(stream_words(wordfile, alphabet))
     return words
 
 
-def run_guesser(guesser_class, word, word_list, max_guesses, verbose=False):
+def load_word_index(file_path, alphabet=DEFAULT_ALPHABET):
+    """Index the words of a compiled dictionary, a weighted word file or a word file.
+
+    Args:
+        file_path (str): path to the dictionary or word file
+        alphabet (collection of str): the letters words of a word file may contain
+
+    Return:
+        WordIndex
+    """
+    from dictfile import is_compiled, load_dict
+    from index import WordIndex
+
+    if is_compiled(file_path):
+        return load_dict(file_path)
+    if is_weighted(file_path):
+        return WordIndex.from_weighted(read_weighted_words(file_path, alphabet))
+    return WordIndex(read_words(file_path, alphabet))
+
+
+def run_guesser(
+    guesser_class,
+    word,
+    word_list,
+    max_guesses,
+    verbose=False,
+    adversarial=False,
+    word_penalty=1,
+):
     """Run an instance of the specified guesser on a randomly-selected word.
 
     Args:
         guesser_class (type): a class inheriting from guessers.base.BaseGuesser
         word (str): the word to guess
-        word_list (list of str): a collection of all potential words to guess
+        word_list (list of str or WordIndex): a collection of all potential
+            words to guess
         max_guesses (int): a maximum number of guesses allowed per game
         verbose (bool): whether to output progress reports
+        adversarial (bool): whether to play an adversarial game of the
+            word's length instead
+        word_penalty (int): the failures counted for a wrong word guess
     """
-    game = Game(word, max_failures=max_guesses)
-    guesser = guesser_class(word_length=len(game.word), potential_words=word_list)
-    while not game.is_game_over:
-        if verbose:
-            print(
-                '{}\nIncorrect guesses: {}\nRemaining guesses: {}\n'.format(
-                    game.word,
-                    ' '.join(game.incorrect_guesses),
-                    game.remaining_guess_count
-                )
-            )
-
-        guess = guesser.guess(guessed_word=game.word, word_length=len(game.word))
-        letter_correctness = game.process_guess(guess)
-        guesser.update_state(letter_correctness, game.word)
+    from simulation import play_game
 
-        if verbose:
-            print('{} guessed {}\n'.format(type(guesser).__name__, guess))
+    result = play_game(
+        guesser_class,
+        word,
+        word_list,
+        max_guesses,
+        verbose=verbose,
+        adversarial=adversarial,
+        word_penalty=word_penalty,
+    )
 
     guess_status = '{} attempts ({} correct, {} incorrect)'.format(
-        len(game.correct_guesses) + len(game.incorrect_guesses),
-        len(game.correct_guesses),
-        len(game.incorrect_guesses),
+        result.correct_count + result.incorrect_count,
+        result.correct_count,
+        result.incorrect_count,
     )
-    if game.has_won:
+    if result.has_won:
         print(
             '{} successfully guessed "{}"\n\t{}'.format(
-                type(guesser).__name__,
-                game.word,
+                guesser_class.__name__,
+                result.guessed_word,
                 guess_status,
             )
         )
     else:
         print(
             '{} failed to guess "{}" (discovered "{}")\n\t{}'.format(
-                type(guesser).__name__,
-                word,
-                game.word,
+                guesser_class.__name__,
+                result.word,
+                result.guessed_word,
                 guess_status,
             )
         )
 
 
-def run_all_guessers(word, word_list, max_guesses, verbose=False):
+def evaluate_guessers(
+    guesser_names,
+    word_list,
+    n_games,
+    max_guesses,
+    seed=None,
+    processes=None,
+    sweep=False,
+    lockstep=False,
+    instrumentation_class=None,
+    adversarial=False,
+    word_penalty=1,
+    pool=None,
+):
+    """Play many games with each of the specified guessers.
+
+    Args:
+        guesser_names (iterable of str): keys of GUESSERS to simulate
+        word_list (list of str or WordIndex): a collection of all potential
+            words to guess
+        n_games (int): the number of games each guesser plays
+        max_guesses (int): a maximum number of guesses allowed per game
+        seed (int): a seed for the selection of words and the guessers
+        processes (int): if set, play games across this many worker processes
+        sweep (bool): whether to play every word once rather than n_games
+            randomly-selected words; always uses worker processes
+        lockstep (bool): whether to play all games of frequent letter guessers
+            at once with lockstep.play_lockstep; other guessers play as usual
+        instrumentation_class (type): if set, instruments the games of each
+            guesser (but those played in lockstep) with an instance of this
+            class, and reports its measurements
+        adversarial (bool): whether to play adversarial games, of the
+            lengths of the selected words; lockstep play is then ignored
+        word_penalty (int): the failures counted for a wrong word guess; games
+            played in lockstep only ever guess their last candidate word
+        pool (multiprocessing.pool.Pool): warm workers started with
+            simulation.start_pool for word_list, across which to play games
+
+    Return:
+        a {str: SimulationResult} dict of guesser names to results
+    """
+    from lockstep import play_lockstep, supports_lockstep
+    from simulation import sample_targets, simulate, simulate_parallel
+
+    guesser_classes = [GUESSERS[guesser_name] for guesser_name in guesser_names]
+    lockstep_results = {}
+    if lockstep and not adversarial:
+        targets = list(word_list) if sweep else sample_targets(word_list, n_games, seed)
+        for guesser_class in guesser_classes:
+            if supports_lockstep(guesser_class):
+                lockstep_results[guesser_class] = play_lockstep(
+                    guesser_class,
+                    word_list,
+                    targets,
+                    max_guesses=max_guesses,
+                )
+        guesser_classes = [
+            guesser_class
+            for guesser_class in guesser_classes
+            if guesser_class not in lockstep_results
+        ]
+
+    if not guesser_classes:
+        results = []
+    elif processes is None and not sweep and pool is None:
+        results = [
+            simulate(
+                guesser_class,
+                word_list,
+                n_games,
+                max_guesses=max_guesses,
+                seed=seed,
+                instrumentation_class=instrumentation_class,
+                adversarial=adversarial,
+                word_penalty=word_penalty,
+            )
+            for guesser_class in guesser_classes
+        ]
+    else:
+        targets = list(word_list) if sweep else sample_targets(word_list, n_games, seed)
+        results = simulate_parallel(
+            guesser_classes,
+            word_list,
+            targets,
+            max_guesses=max_guesses,
+            processes=processes,
+            seed=seed,
+            instrumentation_class=instrumentation_class,
+            adversarial=adversarial,
+            word_penalty=word_penalty,
+            pool=pool,
+        )
+    results = dict(zip(guesser_classes, results))
+    results.update(lockstep_results)
+    results = {
+        guesser_name: results[GUESSERS[guesser_name]]
+        for guesser_name in guesser_names
+    }
+    return results
+
+
+def simulate_guessers(guesser_names, word_list, n_games, max_guesses, **kwargs):
+    """Play many games with each of the specified guessers and report statistics.
+
+    Takes the same arguments as `evaluate_guessers`.
+
+    Return:
+        a {str: SimulationResult} dict of guesser names to results
+    """
+    results = evaluate_guessers(guesser_names, word_list, n_games, max_guesses, **kwargs)
+    for result in results.values():
+        print(result.summary())
+        if result.instrumentation is not None:
+            print(result.instrumentation.summary())
+    return results
+
+
+def submit_job(socket_path, job):
+    """Submit games to a daemon started with daemon.py, and wait for their results.
+
+    Args:
+        socket_path (str): path of the daemon's Unix socket
+        job (dict): the games to play, as described in daemon.py
+
+    Return:
+        dict: the daemon's reply
+    """
+    with socket.socket(socket.AF_UNIX) as connection:
+        connection.connect(socket_path)
+        connection.sendall('{}\n'.format(json.dumps(job)).encode('utf-8'))
+        with connection.makefile('r', encoding='utf-8') as replies:
+            return json.loads(replies.readline())
+
+
+def run_all_guessers(
+    word,
+    word_list,
+    max_guesses,
+    verbose=False,
+    adversarial=False,
+    word_penalty=1,
+):
     """Run an instance of each defined guesser on a randomly-selected word.
 
     Args:
         word (str): the word to guess
-        word_list (list of str): a collection of all potential words to guess
+        word_list (list of str or WordIndex): a collection of all potential
+            words to guess
         max_guesses (int): a maximum number of guesses allowed per game
         verbose (bool): whether to output progress reports
+        adversarial (bool): whether to play adversarial games of the
+            word's length instead
+        word_penalty (int): the failures counted for a wrong word guess
     """
     for guesser_name in GUESSERS.keys():
         if guesser_name != 'manual':
             guesser_class = GUESSERS.get(guesser_name)
-            run_guesser(guesser_class, word, word_list, max_guesses, verbose=verbose)
+            run_guesser(
+                guesser_class,
+                word,
+                word_list,
+                max_guesses,
+                verbose=verbose,
+                adversarial=adversarial,
+                word_penalty=word_penalty,
+            )
 
 
 if __name__ == '__main__':
@@ -110,13 +305,26 @@ if __name__ == '__main__':
         '-f',
         '--wordfile',
         default='/usr/share/dict/words',
-        help='path to a file of newline-delimited potential words to guess'
+        help='path to a file of newline-delimited potential words to guess '
+             '(optionally weighted as word<TAB>count), '
+             'or a dictionary compiled with --compile-dict'
+    )
+    parser.add_argument(
+        '-a',
+        '--alphabet',
+        default=''.join(sorted(DEFAULT_ALPHABET)),
+        help='letters words may contain; words with any other character are skipped'
     )
     parser.add_argument(
         '-g',
         '--guesser',
-        choices=GUESSERS.keys(),
-        help='name of a specific guesser to run'
+        help='name of a specific guesser to run (see --list), '
+             'or the dotted path of a guesser class, as package.module:ClassName'
+    )
+    parser.add_argument(
+        '--list',
+        action='store_true',
+        help='list the names and dotted paths of all guessers, without importing them, and exit'
     )
     parser.add_argument(
         '-c',
@@ -125,19 +333,251 @@ if __name__ == '__main__':
         default=8,
         help='number of guesses allowed'
     )
+    parser.add_argument(
+        '-n',
+        '--games',
+        type=int,
+        help='play this many games per guesser and report aggregate statistics'
+    )
+    parser.add_argument(
+        '--sweep',
+        action='store_true',
+        help='play every word once per guesser and report aggregate statistics'
+    )
+    parser.add_argument(
+        '--lockstep',
+        action='store_true',
+        help='play all games of frequent letter guessers at once'
+    )
+    parser.add_argument(
+        '--adversarial',
+        action='store_true',
+        help='play against a game that picks its word as late as possible to evade guesses'
+    )
+    parser.add_argument(
+        '--word-penalty',
+        type=int,
+        default=1,
+        metavar='FAILURES',
+        help='number of failures counted for a wrong word guess'
+    )
+    parser.add_argument(
+        '--daemon',
+        metavar='PATH',
+        help='submit the games of --games or --sweep to a daemon listening on PATH '
+             '(see daemon.py), which has its own word file, models and workers'
+    )
+    parser.add_argument(
+        '-p',
+        '--processes',
+        type=int,
+        help='play games across this many worker processes'
+    )
+    parser.add_argument(
+        '--instrument',
+        action='store_true',
+        help='time each phase of each turn and report candidate counts and cache lookups'
+    )
+    parser.add_argument(
+        '--instrument-json',
+        metavar='PATH',
+        help='write the measurements of --instrument to PATH as JSON (implies --instrument)'
+    )
+    parser.add_argument(
+        '--profile',
+        metavar='PATH',
+        help='profile the run with cProfile and write pstats to PATH'
+    )
+    parser.add_argument(
+        '-s',
+        '--seed',
+        type=int,
+        help='seed for reproducible word selection and guesses'
+    )
+    parser.add_argument(
+        '-m',
+        '--model-cache',
+        help='directory in which to persist trained models across runs'
+    )
+    parser.add_argument(
+        '--budget',
+        type=float,
+        metavar='MS',
+        help='deadline of each guess in milliseconds, '
+             'after which guessers settle for a cheaper guess'
+    )
+    parser.add_argument(
+        '--memoize',
+        action='store_true',
+        help='share the guesses of deterministic guessers across games with the same state'
+    )
+    parser.add_argument(
+        '--decision-cache',
+        metavar='PATH',
+        help='persist memoized guesses to PATH across runs (implies --memoize)'
+    )
+    parser.add_argument(
+        '-t',
+        '--table',
+        help='path to a decision table for the table guesser'
+    )
+    parser.add_argument(
+        '--build-table',
+        metavar='PATH',
+        help='precompute a decision table for the word file, write it to PATH and exit'
+    )
+    parser.add_argument(
+        '--compile-dict',
+        metavar='PATH',
+        help='compile the word file into a binary dictionary, write it to PATH and exit'
+    )
+    parser.add_argument(
+        '--criterion',
+        choices=['information', 'misses'],
+        default='information',
+        help='what decision table guesses optimize for'
+    )
     parser.add_argument('-v', '--verbose', action='store_true')
 
     args = parser.parse_args()
-    words = [args.word] if args.word else load_words(args.wordfile)
-    word = random.choice(words)
-    if args.guesser:
-        guesser_class = GUESSERS.get(args.guesser)
-        run_guesser(
-            guesser_class,
-            word,
-            words,
+    if args.list:
+        for guesser_name in GUESSERS:
+            print('{}\t{}'.format(guesser_name, GUESSERS.path(guesser_name)))
+        parser.exit()
+    if args.guesser and args.guesser not in GUESSERS and ':' not in args.guesser:
+        parser.error('unknown guesser {} (see --list)'.format(args.guesser))
+    guesser_names = (
+        [args.guesser]
+        if args.guesser
+        else [name for name in GUESSERS if name != 'manual']
+    )
+
+    if args.daemon:
+        if not (args.games or args.sweep):
+            parser.error('--daemon requires --games or --sweep')
+        reply = submit_job(args.daemon, {
+            'guessers': guesser_names,
+            'games': args.games or 1,
+            'count': args.count,
+            'seed': args.seed,
+            'sweep': args.sweep,
+            'lockstep': args.lockstep,
+            'adversarial': args.adversarial,
+            'word_penalty': args.word_penalty,
+            'instrument': bool(args.instrument or args.instrument_json),
+        })
+        if 'error' in reply:
+            parser.exit(1, 'Daemon error: {}\n'.format(reply['error']))
+        for result in reply['results']:
+            print(result['summary'])
+        if args.instrument_json:
+            with open(args.instrument_json, 'w') as stats_file:
+                json.dump(
+                    {result['guesser']: result['instrumentation'] for result in reply['results']},
+                    stats_file,
+                    indent=2,
+                )
+        parser.exit()
+
+    from dictfile import compile_dict
+    from guessers.base import BUDGET_STATS, BaseGuesser
+    from guessers.cache import DECISION_CACHE, MODEL_CACHE
+    from index import WordIndex
+    from instrumentation import Instrumentation
+    from simulation import sample_targets
+
+    MODEL_CACHE.directory = args.model_cache
+    if args.table:
+        GUESSERS['table'].table_path = args.table
+    if args.budget is not None:
+        BaseGuesser.time_budget = args.budget / 1000
+    if args.memoize or args.decision_cache:
+        for guesser_name in guesser_names:
+            guesser_class = GUESSERS[guesser_name]
+            if guesser_class.deterministic:
+                GUESSERS[guesser_name] = guessers.memoize(guesser_class)
+        if args.decision_cache and os.path.exists(args.decision_cache):
+            DECISION_CACHE.load(args.decision_cache)
+    if args.word:
+        word_index = WordIndex([args.word])
+    else:
+        word_index = load_word_index(args.wordfile, args.alphabet)
+    if args.profile:
+        profiler = cProfile.Profile()
+        profiler.enable()
+    if args.compile_dict:
+        compile_dict(word_index, args.compile_dict)
+    elif args.build_table:
+        from guessers.table import build_table, save_table
+        table = build_table(word_index, max_failures=args.count, criterion=args.criterion)
+        save_table(table, args.build_table, max_failures=args.count)
+    elif args.games or args.sweep:
+        results = simulate_guessers(
+            guesser_names,
+            word_index,
+            args.games,
             max_guesses=args.count,
-            verbose=args.verbose
+            seed=args.seed,
+            processes=args.processes,
+            sweep=args.sweep,
+            lockstep=args.lockstep,
+            adversarial=args.adversarial,
+            word_penalty=args.word_penalty,
+            instrumentation_class=(
+                Instrumentation
+                if args.instrument or args.instrument_json
+                else None
+            ),
         )
+        if args.instrument_json:
+            with open(args.instrument_json, 'w') as stats_file:
+                json.dump(
+                    {
+                        guesser_name: result.instrumentation.to_dict()
+                        for guesser_name, result in results.items()
+                        if result.instrumentation is not None
+                    },
+                    stats_file,
+                    indent=2,
+                )
     else:
-        run_all_guessers(word, words, max_guesses=args.count, verbose=args.verbose)
+        word, = sample_targets(word_index, 1, args.seed)
+        if args.seed is not None:
+            random.seed(args.seed)
+        if args.guesser:
+            guesser_class = GUESSERS.get(args.guesser)
+            run_guesser(
+                guesser_class,
+                word,
+                word_index,
+                max_guesses=args.count,
+                verbose=args.verbose,
+                adversarial=args.adversarial,
+                word_penalty=args.word_penalty,
+            )
+        else:
+            run_all_guessers(
+                word,
+                word_index,
+                max_guesses=args.count,
+                verbose=args.verbose,
+                adversarial=args.adversarial,
+                word_penalty=args.word_penalty,
+            )
+    if args.profile:
+        profiler.disable()
+        profiler.dump_stats(args.profile)
+
+    if DECISION_CACHE.hits or DECISION_CACHE.misses:
+        print('Decision cache: {:.1%} of {} guesses served from cache'.format(
+            DECISION_CACHE.hit_rate,
+            DECISION_CACHE.hits + DECISION_CACHE.misses,
+        ))
+    if BUDGET_STATS.guesses:
+        print('Time budget: {} of {} guesses cut short, {} fell back to the letter order'.format(
+            BUDGET_STATS.partial + BUDGET_STATS.fallbacks,
+            BUDGET_STATS.guesses,
+            BUDGET_STATS.fallbacks,
+        ))
+    if args.decision_cache:
+        DECISION_CACHE.save(args.decision_cache)
@@ -0,0 +1,299 @@
+"""Host concurrent hangman games over a line protocol on a local socket.
+
+Each connection plays one game at a time, either by guessing itself or by
+letting one of run.GUESSERS guess. All games share the server's word index
+and model cache. Guessers are constructed and make their guesses in an
+executor, so that the event loop keeps serving other games meanwhile.
+
+Clients send one command per line, and get one line back per command:
+
+    NEW [GUESSER]   start a game on a random word, played by the client or
+                    by the named guesser
+    GUESS LETTERS   guess one or more letters in a game played by the client
+    PLAY            let the guesser of the game make its next guess
+    QUIT            close the connection
+
+A game in progress is reported as `STATE <word so far> <remaining guesses>
+<incorrect letters, or ->`, and a game over as `WON <word>` or `LOST <word>`.
+Invalid commands get `ERROR <message>`.
+
+Usage:
+    python server.py [-f WORDFILE] [--socket PATH | --host HOST --port PORT]
+        [-c COUNT] [--word-penalty FAILURES] [--workers N] [--budget MS]
+        [-m MODEL_CACHE] [-t TABLE] [-s SEED]
+"""
+import argparse
+import asyncio
+import functools
+import random
+from concurrent.futures import ThreadPoolExecutor
+
+from corpus import DEFAULT_ALPHABET
+from game import Game
+from guessers.base import BaseGuesser
+from guessers.cache import MODEL_CACHE
+from guessers.exc import TableFlipError
+from run import GUESSERS, load_word_index
+
+
+# Connections queued before being accepted; bursts of new players exceed
+# asyncio's default of 100
+LISTEN_BACKLOG = 4096
+
+
+class ProtocolError(Exception):
+    """Exception raised when a client sends an invalid command"""
+    pass
+
+
+class Session:
+    """A game in progress, and the guesser playing it unless the client does"""
+
+    def __init__(self, word, max_failures, guesser=None, word_penalty=1):
+        self.word = word
+        self.game = Game(word, max_failures=max_failures, word_penalty=word_penalty)
+        self.guesser = guesser
+        self.gave_up = False
+
+    @property
+    def is_over(self):
+        return self.gave_up or self.game.is_game_over
+
+    def play(self):
+        """Make the guesser's next guess, as simulation.play_game does.
+
+        A guesser that gives up by raising TableFlipError loses the game.
+        """
+        game = self.game
+        try:
+            guess = self.guesser.guess(guessed_word=game.word, word_length=len(game.word))
+            self.guesser.update_state(game.process_guess(guess), game.word)
+        except TableFlipError:
+            self.gave_up = True
+
+    def state(self):
+        """Describe the game as a line of the protocol"""
+        game = self.game
+        if game.has_won:
+            return 'WON {}'.format(self.word)
+        if self.is_over:
+            return 'LOST {}'.format(self.word)
+        return 'STATE {} {} {}'.format(
+            game.word,
+            game.remaining_guess_count,
+            ''.join(sorted(game.incorrect_guesses)) or '-',
+        )
+
+
+class GameServer:
+    """Serve hangman games to concurrent connections.
+
+    Args:
+        word_index (WordIndex): all potential words to guess, shared by all games
+        max_failures (int): a maximum number of incorrect guesses per game
+        executor (concurrent.futures.Executor): runs guessers' steps; the
+            event loop's default executor if omitted
+        seed (int): a seed for the selection of words
+        word_penalty (int): the failures counted for a guesser's wrong word guess
+    """
+
+    def __init__(
+        self,
+        word_index,
+        max_failures=8,
+        executor=None,
+        seed=None,
+        word_penalty=1,
+    ):
+        self.word_index = word_index
+        for length in word_index.lengths:
+            # Build the buckets' bitsets before guessers share them across threads
+            word_index.bucket(length).prepare()
+        self.max_failures = max_failures
+        self.word_penalty = word_penalty
+        self.executor = executor
+        self.connection_count = 0
+        self._words = list(word_index)
+        self._weights = word_index.weights
+        self._rng = random.Random(seed)
+
+    def choose_word(self):
+        """Select a random word, in proportion to its weight in a weighted index"""
+        if self._weights is not None:
+            return self._rng.choices(self._words, weights=self._weights)[0]
+        return self._rng.choice(self._words)
+
+    async def handle(self, reader, writer):
+        """Serve commands from a connection until it sends QUIT or closes"""
+        self.connection_count += 1
+        session = None
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                line = line.decode('utf-8', 'replace').strip()
+                command, _, argument = line.partition(' ')
+                command = command.upper()
+                if command == 'QUIT':
+                    break
+                try:
+                    session = await self.execute(session, command, argument.strip())
+                    reply = session.state()
+                except ProtocolError as error:
+                    reply = 'ERROR {}'.format(error)
+                writer.write('{}\n'.format(reply).encode('utf-8'))
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            self.connection_count -= 1
+            writer.close()
+
+    async def execute(self, session, command, argument):
+        """Apply a command to a connection's session.
+
+        Args:
+            session (Session): the connection's latest game, if any
+            command (str): the upper-cased command
+            argument (str): the rest of the command line
+
+        Return:
+            Session: the connection's game after the command
+
+        Raise:
+            ProtocolError: if the command is invalid in the session's state
+        """
+        if command == 'NEW':
+            return await self.new_session(argument)
+        if command not in ('GUESS', 'PLAY'):
+            raise ProtocolError('unknown command {}'.format(command))
+        if session is None:
+            raise ProtocolError('no game in progress')
+        if session.is_over:
+            raise ProtocolError('game is over')
+
+        if command == 'GUESS':
+            if session.guesser is not None:
+                raise ProtocolError('game is played by a guesser')
+            letters = argument.lower()
+            if not letters.isalpha():
+                raise ProtocolError('guesses must be letters')
+            # Letters past the end of the game are ignored, rather than
+            # raising CheaterError from the game
+            for letter in letters:
+                if session.game.is_game_over:
+                    break
+                session.game.process_guess(letter)
+        else:
+            if session.guesser is None:
+                raise ProtocolError('game is played by the client')
+            await self._run(session.play)
+        return session
+
+    async def new_session(self, guesser_name=''):
+        """Start a game on a random word, played by the named guesser if any"""
+        word = self.choose_word()
+        guesser = None
+        if guesser_name:
+            # Only registered guessers, rather than any dotted path a client sends
+            if guesser_name not in GUESSERS or guesser_name == 'manual':
+                raise ProtocolError('unknown guesser {}'.format(guesser_name))
+            guesser_class = GUESSERS[guesser_name]
+            guesser = await self._run(functools.partial(
+                guesser_class,
+                word_length=len(word),
+                potential_words=self.word_index,
+            ))
+        return Session(word, self.max_failures, guesser, self.word_penalty)
+
+    def _run(self, function):
+        return asyncio.get_event_loop().run_in_executor(self.executor, function)
+
+    def start(self, path=None, host='127.0.0.1', port=0, backlog=LISTEN_BACKLOG):
+        """Start listening on a Unix socket if a path is given, or on a TCP port.
+
+        Return:
+            a coroutine resolving to an asyncio server
+        """
+        if path:
+            return asyncio.start_unix_server(self.handle, path, backlog=backlog)
+        return asyncio.start_server(self.handle, host, port, backlog=backlog)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('-f', '--wordfile', default='/usr/share/dict/words')
+    parser.add_argument('-a', '--alphabet', default=''.join(sorted(DEFAULT_ALPHABET)))
+    parser.add_argument('-c', '--count', type=int, default=8)
+    parser.add_argument(
+        '--word-penalty',
+        type=int,
+        default=1,
+        metavar='FAILURES',
+        help="number of failures counted for a guesser's wrong word guess"
+    )
+    parser.add_argument(
+        '--socket',
+        metavar='PATH',
+        help='path of a Unix socket to listen on'
+    )
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=7777)
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=4,
+        help='number of threads running guessers'
+    )
+    parser.add_argument(
+        '--budget',
+        type=float,
+        metavar='MS',
+        help='deadline of each guess in milliseconds, '
+             'after which guessers settle for a cheaper guess'
+    )
+    parser.add_argument(
+        '-m',
+        '--model-cache',
+        help='directory of models persisted across runs'
+    )
+    parser.add_argument(
+        '-t',
+        '--table',
+        help='path to a decision table for the table guesser'
+    )
+    parser.add_argument(
+        '-s',
+        '--seed',
+        type=int,
+        help='seed for reproducible word selection'
+    )
+    args = parser.parse_args()
+
+    MODEL_CACHE.directory = args.model_cache
+    if args.table:
+        GUESSERS['table'].table_path = args.table
+    if args.budget is not None:
+        BaseGuesser.time_budget = args.budget / 1000
+
+    game_server = GameServer(
+        load_word_index(args.wordfile, args.alphabet),
+        max_failures=args.count,
+        executor=ThreadPoolExecutor(args.workers),
+        seed=args.seed,
+        word_penalty=args.word_penalty,
+    )
+    loop = asyncio.get_event_loop()
+    listener = loop.run_until_complete(
+        game_server.start(args.socket, args.host, args.port)
+    )
+    address = args.socket or '{}:{}'.format(args.host, args.port)
+    print('Serving games on {}'.format(address))
+    try:
+        loop.run_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        listener.close()
+        loop.run_until_complete(listener.wait_closed())
@@ -0,0 +1,527 @@
+import math
+import multiprocessing
+import random
+import time
+from collections import namedtuple
+
+from game import AdversarialGame, Game
+from guessers.base import BUDGET_STATS
+from guessers.cache import DECISION_CACHE, MODEL_CACHE
+from guessers.exc import TableFlipError
+from index import WordIndex
+
+
+GameResult = namedtuple(
+    'GameResult',
+    [
+        'word',
+        'guessed_word',
+        'has_won',
+        'correct_count',
+        'incorrect_count',
+        'guess_durations',
+    ]
+)
+GameResult.__doc__ = """The outcome of a single game.
+
+Attributes:
+    word (str): the word to guess
+    guessed_word (str): the word as discovered by the end of the game
+    has_won (bool): whether the guesser found the word
+    correct_count (int): the number of correct letters guessed
+    incorrect_count (int): the number of incorrect letters guessed
+    guess_durations (list of float): wall time of each turn, in seconds
+"""
+
+
+def percentile(values, percent):
+    """Compute a nearest-rank percentile.
+
+    Args:
+        values (list of float): sorted values
+        percent (float): the percentile to compute, between 0 and 100
+
+    Return:
+        float, or None if there are no values
+    """
+    if not values:
+        return None
+    rank = max(int(math.ceil(percent / 100 * len(values))), 1)
+    return values[rank - 1]
+
+
+class SimulationResult:
+    """Aggregate statistics over many games played by a single guesser.
+
+    When the games were instrumented, `instrumentation` holds the
+    measurements of all of them.
+    """
+
+    def __init__(self, guesser_name, games=None, instrumentation=None):
+        self.guesser_name = guesser_name
+        self.games = list(games or [])
+        self.instrumentation = instrumentation
+
+    @property
+    def game_count(self):
+        return len(self.games)
+
+    @property
+    def win_rate(self):
+        if not self.games:
+            return 0.0
+        return sum(game.has_won for game in self.games) / len(self.games)
+
+    @property
+    def mean_guess_count(self):
+        if not self.games:
+            return 0.0
+        return sum(
+            game.correct_count + game.incorrect_count
+            for game in self.games
+        ) / len(self.games)
+
+    @property
+    def guess_durations(self):
+        return sorted(
+            duration
+            for game in self.games
+            for duration in game.guess_durations
+        )
+
+    def latency_percentiles(self, percents=(50, 90, 99)):
+        """Compute per-guess latency percentiles.
+
+        Args:
+            percents (iterable of float): the percentiles to compute
+
+        Return:
+            a {float: float} dict of percentiles to durations, in seconds
+        """
+        durations = self.guess_durations
+        return {percent: percentile(durations, percent) for percent in percents}
+
+    def merge(self, other):
+        """Combine the games of another result for the same guesser into a new result"""
+        return SimulationResult(self.guesser_name, self.games, self.instrumentation).update(other)
+
+    def update(self, other):
+        """Add the games of another result for the same guesser to this one, in place"""
+        self.games.extend(other.games)
+        if other.instrumentation is not None:
+            if self.instrumentation is None:
+                self.instrumentation = other.instrumentation
+            else:
+                self.instrumentation.merge(other.instrumentation)
+        return self
+
+    def summary(self):
+        summary = '{} won {:.1%} of {} games ({:.1f} guesses per game)'.format(
+            self.guesser_name,
+            self.win_rate,
+            self.game_count,
+            self.mean_guess_count,
+        )
+        if not any(game.guess_durations for game in self.games):
+            return summary
+        latencies = ', '.join(
+            'p{} {:.3f}ms'.format(percent, (duration or 0) * 1000)
+            for percent, duration in self.latency_percentiles().items()
+        )
+        return '{}\n\tguess latency: {}'.format(summary, latencies)
+
+
+def play_game(
+    guesser_class,
+    word,
+    word_list,
+    max_guesses,
+    verbose=False,
+    instrumentation=None,
+    adversarial=False,
+    word_penalty=1,
+):
+    """Play a single game with an instance of the specified guesser.
+
+    A guesser that gives up by raising TableFlipError loses the game. In an
+    adversarial game, only the length of the given word matters, and the
+    result reports the word the game settled on.
+
+    Args:
+        guesser_class (type): a class inheriting from guessers.base.BaseGuesser
+        word (str): the word to guess
+        word_list (list of str or WordIndex): a collection of all potential
+            words to guess
+        max_guesses (int): a maximum number of guesses allowed per game
+        verbose (bool): whether to output progress reports
+        instrumentation (instrumentation.Instrumentation): if set, collects
+            per-phase timings, candidate counts and cache lookups; games
+            played without it are not slowed down in any way
+        adversarial (bool): whether to play a game.AdversarialGame over
+            word_list rather than a game of the given word
+        word_penalty (int): the failures counted for a wrong word guess
+
+    Return:
+        GameResult
+    """
+    clock = time.perf_counter
+    if instrumentation is not None:
+        process_counters = _process_counters()
+        start = clock()
+
+    game = _new_game(word, word_list, max_guesses, adversarial, word_penalty)
+    guesser = guesser_class(word_length=len(game.word), potential_words=word_list)
+    if instrumentation is not None:
+        instrumentation.time('construct', clock() - start)
+
+    guess_durations = []
+    while not game.is_game_over:
+        if verbose:
+            print(
+                '{}\nIncorrect guesses: {}\nRemaining guesses: {}\n'.format(
+                    game.word,
+                    ' '.join(game.incorrect_guesses),
+                    game.remaining_guess_count
+                )
+            )
+        if instrumentation is not None:
+            candidate_count = _candidate_count(guesser)
+            if candidate_count is not None:
+                instrumentation.observe('candidates', candidate_count)
+
+        # Phases are only timed apart when instrumented, and reported once the
+        # turn is over, so that neither slows down the turn itself
+        turn_start = clock()
+        try:
+            guess = guesser.guess(guessed_word=game.word, word_length=len(game.word))
+            if instrumentation is not None:
+                guess_end = clock()
+            letter_correctness = game.process_guess(guess)
+            if instrumentation is not None:
+                process_end = clock()
+            guesser.update_state(letter_correctness, game.word)
+        except TableFlipError:
+            if instrumentation is not None:
+                instrumentation.count('table_flips')
+            break
+        finally:
+            turn_end = clock()
+            guess_durations.append(turn_end - turn_start)
+
+        if instrumentation is not None:
+            instrumentation.time('guess', guess_end - turn_start)
+            instrumentation.time('process_guess', process_end - guess_end)
+            instrumentation.time('update_state', turn_end - process_end)
+        if verbose:
+            print('{} guessed {}\n'.format(type(guesser).__name__, guess))
+
+    if instrumentation is not None:
+        instrumentation.count('games')
+        instrumentation.count('turns', len(guess_durations))
+        instrumentation.count('wins', game.has_won)
+        for name, amount in _process_counters().items():
+            instrumentation.count(name, amount - process_counters[name])
+
+    return GameResult(
+        word=game.solution,
+        guessed_word=game.word,
+        has_won=game.has_won,
+        correct_count=len(game.correct_guesses),
+        incorrect_count=len(game.incorrect_guesses),
+        guess_durations=guess_durations,
+    )
+
+
+def _new_game(word, word_list, max_guesses, adversarial, word_penalty):
+    if adversarial:
+        return AdversarialGame(
+            word_list,
+            len(word),
+            max_failures=max_guesses,
+            word_penalty=word_penalty,
+        )
+    return Game(word, max_failures=max_guesses, word_penalty=word_penalty)
+
+
+_PROCESS_COUNTERS = (
+    'model_cache_hits',
+    'model_cache_misses',
+    'decision_cache_hits',
+    'decision_cache_misses',
+    'budgeted_guesses',
+    'budget_partial_guesses',
+    'budget_fallbacks',
+)
+
+
+def _process_counters():
+    """Snapshot the guessers' process-wide counters of cache lookups and time budgets"""
+    return dict(zip(_PROCESS_COUNTERS, (
+        MODEL_CACHE.hits,
+        MODEL_CACHE.misses,
+        DECISION_CACHE.hits,
+        DECISION_CACHE.misses,
+        BUDGET_STATS.guesses,
+        BUDGET_STATS.partial,
+        BUDGET_STATS.fallbacks,
+    )))
+
+
+def _candidate_count(guesser):
+    """Count a guesser's remaining candidates, or None if it does not track any"""
+    candidates = getattr(guesser, 'candidates', None)
+    if candidates is None and hasattr(guesser, 'guesser'):
+        candidates = getattr(guesser.guesser, 'candidates', None)
+    return None if candidates is None else len(candidates)
+
+
+def simulate(
+    guesser_class,
+    words,
+    n_games,
+    max_guesses=8,
+    seed=None,
+    instrumentation_class=None,
+    adversarial=False,
+    word_penalty=1,
+):
+    """Play many games with the specified guesser, on randomly-selected words.
+
+    Guessers draw from the `random` module, so a seed also seeds its global
+    generator to make the whole simulation reproducible.
+
+    Args:
+        guesser_class (type): a class inheriting from guessers.base.BaseGuesser
+        words (list of str or WordIndex): a collection of all potential words
+            to guess
+        n_games (int): the number of games to play
+        max_guesses (int): a maximum number of guesses allowed per game
+        seed (int): a seed for the selection of words and the guesser
+        instrumentation_class (type): if set, instruments all games with an
+            instance of this class, e.g. instrumentation.Instrumentation
+        adversarial (bool): whether to play adversarial games, of the
+            lengths of randomly-selected words
+        word_penalty (int): the failures counted for a wrong word guess
+
+    Return:
+        SimulationResult
+    """
+    word_index = words if isinstance(words, WordIndex) else WordIndex(words)
+    targets = sample_targets(word_index, n_games, seed)
+    if seed is not None:
+        random.seed(seed)
+
+    instrumentation = instrumentation_class() if instrumentation_class else None
+    result = SimulationResult(guesser_class.__name__, instrumentation=instrumentation)
+    for word in targets:
+        result.games.append(play_game(
+            guesser_class,
+            word,
+            word_index,
+            max_guesses,
+            instrumentation=instrumentation,
+            adversarial=adversarial,
+            word_penalty=word_penalty,
+        ))
+    return result
+
+
+def sample_targets(words, n_games, seed=None):
+    """Randomly select words to guess, with replacement.
+
+    Words of a weighted index are selected in proportion to their weight, so
+    that targets follow the frequency of words in real-world use.
+
+    Args:
+        words (list of str or WordIndex): a collection of all potential words
+        n_games (int): the number of words to select
+        seed (int): a seed for the selection
+
+    Return:
+        list of str
+    """
+    word_list = list(words)
+    rng = random.Random(seed)
+    weights = words.weights if isinstance(words, WordIndex) else None
+    if weights is not None:
+        return rng.choices(word_list, weights=weights, k=n_games)
+    return [rng.choice(word_list) for _ in range(n_games)]
+
+
+# The word index shared by all games in a worker process. With the fork start
+# method it is inherited from the parent; otherwise it is pickled only once
+# per worker, when the pool starts.
+_worker_index = None
+
+
+def _init_worker(word_index):
+    global _worker_index
+    _worker_index = word_index
+    DECISION_CACHE.record()
+
+
+def _play_shard(task):
+    """Play one game per word of a shard of targets, in a worker process.
+
+    Return:
+        the guesser's position, its SimulationResult, the worker's process
+        counters counted during the shard, and the decisions it memoized
+    """
+    (
+        guesser_position,
+        guesser_class,
+        targets,
+        max_guesses,
+        seed,
+        instrumentation_class,
+        adversarial,
+        word_penalty,
+    ) = task
+    if seed is not None:
+        random.seed(seed)
+    instrumentation = instrumentation_class() if instrumentation_class else None
+    process_counters = _process_counters()
+    games = [
+        play_game(
+            guesser_class,
+            word,
+            _worker_index,
+            max_guesses,
+            instrumentation=instrumentation,
+            adversarial=adversarial,
+            word_penalty=word_penalty,
+        )
+        for word in targets
+    ]
+    counters = {
+        name: amount - process_counters[name]
+        for name, amount in _process_counters().items()
+    }
+    return (
+        guesser_position,
+        SimulationResult(guesser_class.__name__, games, instrumentation),
+        counters,
+        DECISION_CACHE.pop_recorded(),
+    )
+
+
+def start_pool(words, processes=None, lengths=None):
+    """Start worker processes sharing a word index, for simulate_parallel.
+
+    The index's lazily built bitsets and matrices are prepared beforehand,
+    so that forked workers share them rather than each rebuilding their own.
+    So are the models already in the model cache, which forked workers
+    inherit.
+
+    Args:
+        words (WordIndex): all potential words to guess
+        processes (int): the number of worker processes, defaulting to the
+            number of CPUs
+        lengths (iterable of int): the word lengths whose buckets to prepare;
+            all lengths if omitted
+
+    Return:
+        multiprocessing.pool.Pool
+    """
+    for length in (words.lengths if lengths is None else lengths):
+        words.bucket(length).prepare()
+
+    if 'fork' in multiprocessing.get_all_start_methods():
+        context = multiprocessing.get_context('fork')
+    else:
+        context = multiprocessing.get_context()
+    return context.Pool(
+        processes,
+        initializer=_init_worker,
+        initargs=(words,),
+    )
+
+
+def simulate_parallel(
+    guesser_classes,
+    words,
+    targets,
+    max_guesses=8,
+    processes=None,
+    shard_size=100,
+    seed=None,
+    instrumentation_class=None,
+    adversarial=False,
+    word_penalty=1,
+    pool=None,
+):
+    """Play one game per target word with each guesser, across worker processes.
+
+    Targets are split into shards, and each (guesser, shard) pair is played
+    in a pool worker. The word index is shipped to each worker once, when
+    the pool starts. A pool started beforehand with `start_pool` may be
+    reused across calls, which keeps its workers' caches warm.
+
+    Args:
+        guesser_classes (list of type): classes inheriting from
+            guessers.base.BaseGuesser
+        words (list of str or WordIndex): a collection of all potential words
+            to guess; that of the pool's workers if a pool is given
+        targets (list of str): the words to guess
+        max_guesses (int): a maximum number of guesses allowed per game
+        processes (int): the number of worker processes, defaulting to the
+            number of CPUs; ignored if a pool is given
+        shard_size (int): the number of targets played per task
+        seed (int): a seed for the guessers, varied per shard
+        instrumentation_class (type): if set, instruments all games with
+            instances of this class, merged across shards
+        adversarial (bool): whether to play adversarial games, of the
+            lengths of the target words
+        word_penalty (int): the failures counted for a wrong word guess
+        pool (multiprocessing.pool.Pool): workers started with `start_pool`;
+            a pool is started for this call only if omitted
+
+    Return:
+        list of SimulationResult, in the order of guesser_classes
+    """
+    tasks = [
+        (
+            guesser_position,
+            guesser_class,
+            targets[start:start + shard_size],
+            max_guesses,
+            None if seed is None else seed + start,
+            instrumentation_class,
+            adversarial,
+            word_penalty,
+        )
+        for guesser_position, guesser_class in enumerate(guesser_classes)
+        for start in range(0, len(targets), shard_size)
+    ]
+    results = [
+        SimulationResult(guesser_class.__name__)
+        for guesser_class in guesser_classes
+    ]
+    if pool is not None:
+        return _merge_shards(pool.imap(_play_shard, tasks), results)
+    word_index = words if isinstance(words, WordIndex) else WordIndex(words)
+    with start_pool(word_index, processes, {len(word) for word in targets}) as pool:
+        return _merge_shards(pool.imap(_play_shard, tasks), results)
+
+
+def _merge_shards(shard_results, results):
+    """Merge the results of shards into those of their guessers.
+
+    The decisions memoized by workers, and their lookup counts, are merged
+    into this process's cache, so that they can be reported and saved. So
+    are the workers' counts of guesses made under a time budget.
+    """
+    for guesser_position, shard_result, counters, decisions in shard_results:
+        # Shards are added in place, rather than copying all games merged so far
+        results[guesser_position].update(shard_result)
+        DECISION_CACHE.merge(
+            decisions,
+            hits=counters['decision_cache_hits'],
+            misses=counters['decision_cache_misses'],
+        )
+        BUDGET_STATS.merge(
+            guesses=counters['budgeted_guesses'],
+            partial=counters['budget_partial_guesses'],
+            fallbacks=counters['budget_fallbacks'],
+        )
+    return results
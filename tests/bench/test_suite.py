@@ -0,0 +1,87 @@
+from unittest import TestCase
+
+from bench import suite
+from guessers import FrequentLetterGuesser
+from index import WordIndex
+
+
+class PlayTimedTestCase(TestCase):
+    def test_times_construction_and_turns(self):
+        word_index = WordIndex(['latter', 'barrel', 'rabbit', 'hoax', 'lull'])
+        construct_duration, durations, has_won = suite.play_timed(
+            FrequentLetterGuesser,
+            'rabbit',
+            word_index,
+            8,
+        )
+        self.assertGreater(construct_duration, 0)
+        self.assertTrue(durations)
+        self.assertTrue(all(duration > 0 for duration in durations))
+        self.assertTrue(has_won)
+
+
+class BenchGuesserTestCase(TestCase):
+    def test_reports_metrics(self):
+        word_index = WordIndex(['latter', 'barrel', 'rabbit', 'hoax', 'lull'])
+        metrics = suite.bench_guesser(FrequentLetterGuesser, word_index, [0, 1], 5)
+        self.assertEqual(metrics['games'], 10)
+        self.assertEqual(metrics['win_rate'], 1.0)
+        for metric in suite.HIGHER_IS_WORSE:
+            self.assertGreaterEqual(metrics[metric], 0)
+        self.assertGreater(metrics['peak_memory_kb'], 0)
+
+    def test_is_reproducible(self):
+        word_index = WordIndex(['latter', 'barrel', 'rabbit', 'hoax', 'lull'])
+        first = suite.bench_guesser(FrequentLetterGuesser, word_index, [3], 5)
+        second = suite.bench_guesser(FrequentLetterGuesser, word_index, [3], 5)
+        self.assertEqual(first['win_rate'], second['win_rate'])
+        self.assertEqual(first['mean_guess_count'], second['mean_guess_count'])
+
+
+class RunSuiteTestCase(TestCase):
+    def test_keys_results_by_guesser_and_size(self):
+        words = ['latter', 'barrel', 'rabbit', 'hoax', 'lull', 'limn']
+        results = suite.run_suite(['frequent', 'entropy'], words, [3, 0], [0], 2)
+        self.assertEqual(
+            sorted(results),
+            ['entropy@3', 'entropy@6', 'frequent@3', 'frequent@6']
+        )
+
+
+class CompareTestCase(TestCase):
+    baseline = {
+        'frequent@100': {
+            'win_rate': 0.9,
+            'guess_p50_ms': 1.0,
+            'peak_memory_kb': 100.0,
+            'games': 10,
+        },
+    }
+
+    def test_accepts_results_within_tolerance(self):
+        results = {
+            'frequent@100': {
+                'win_rate': 0.89,
+                'guess_p50_ms': 1.1,
+                'peak_memory_kb': 50.0,
+                'games': 20,
+            },
+            'markov1@100': {'win_rate': 0.1},
+        }
+        self.assertEqual(suite.compare(results, self.baseline, tolerance=0.2), [])
+
+    def test_flags_regressions(self):
+        results = {
+            'frequent@100': {
+                'win_rate': 0.8,
+                'guess_p50_ms': 1.5,
+                'peak_memory_kb': 100.0,
+            },
+        }
+        self.assertEqual(
+            suite.compare(results, self.baseline, tolerance=0.2),
+            [
+                'frequent@100 guess_p50_ms: 1.0 -> 1.5 (+50%)',
+                'frequent@100 win_rate: 0.900 -> 0.800',
+            ]
+        )
@@ -1,6 +1,8 @@
-from unittest import TestCase
+from unittest import mock, TestCase
 
-from guessers.base import BaseGuesser
+from game import WordGuess
+from guessers import base
+from guessers.base import BUDGET_STATS, BaseGuesser, BudgetStats
 
 
 class BaseGuesserTestCase(TestCase):
@@ -10,3 +12,50 @@ class BaseGuesserTestCase(TestCase):
 
         with self.assertRaises(TypeError):
             UnfinishedGuesser()
+
+    def test_guess_word_marks_word_guesses(self):
+        guess = BaseGuesser.guess_word('hangman')
+        self.assertIsInstance(guess, WordGuess)
+        self.assertEqual(guess, 'hangman')
+
+
+class DeadlineTestCase(TestCase):
+    class Guesser(BaseGuesser):
+        def guess(self, *args, **kwargs):
+            return 'a'
+
+    def setUp(self):
+        BUDGET_STATS.clear()
+        self.addCleanup(BUDGET_STATS.clear)
+
+    def test_guesses_are_unbounded_by_default(self):
+        guesser = self.Guesser()
+        guesser._start_deadline()
+        self.assertIsNone(guesser._deadline)
+        self.assertFalse(guesser._out_of_time())
+        self.assertEqual(BUDGET_STATS.guesses, 0)
+
+    def test_deadline_follows_time_budget(self):
+        guesser = self.Guesser()
+        guesser.time_budget = 0.5
+        with mock.patch.object(base.time, 'perf_counter', return_value=10.0) as mock_clock:
+            guesser._start_deadline()
+            self.assertEqual(guesser._deadline, 10.5)
+            self.assertFalse(guesser._out_of_time())
+            mock_clock.return_value = 10.5
+            self.assertTrue(guesser._out_of_time())
+        self.assertEqual(BUDGET_STATS.guesses, 1)
+
+
+class BudgetStatsTestCase(TestCase):
+    def test_clear_resets_counts(self):
+        stats = BudgetStats()
+        stats.guesses, stats.partial, stats.fallbacks = 3, 2, 1
+        stats.clear()
+        self.assertEqual((stats.guesses, stats.partial, stats.fallbacks), (0, 0, 0))
+
+    def test_merge_adds_counts(self):
+        stats = BudgetStats()
+        stats.guesses, stats.partial, stats.fallbacks = 3, 2, 1
+        stats.merge(guesses=4, partial=1, fallbacks=2)
+        self.assertEqual((stats.guesses, stats.partial, stats.fallbacks), (7, 3, 3))
@@ -0,0 +1,133 @@
+import os
+import tempfile
+from unittest import mock, TestCase
+
+from guessers.cache import MODEL_CACHE, DecisionCache, ModelCache
+
+
+class ModelCacheTestCase(TestCase):
+    def test_get_builds_model_once(self):
+        cache = ModelCache()
+        build = mock.Mock(return_value={'a': 1})
+        self.assertEqual(cache.get(('digest', 1, 5), build), {'a': 1})
+        self.assertIs(cache.get(('digest', 1, 5), build), build.return_value)
+        build.assert_called_once_with()
+        self.assertIn(('digest', 1, 5), cache)
+
+    def test_get_keeps_model_built_concurrently(self):
+        cache = ModelCache()
+
+        def build():
+            # Another thread builds the same model meanwhile
+            cache.get('a', lambda: 'first')
+            return 'second'
+
+        self.assertEqual(cache.get('a', build), 'first')
+        self.assertEqual(cache.get('a', build), 'first')
+
+    def test_get_evicts_least_recently_used_models(self):
+        cache = ModelCache(max_size=2)
+        cache.get('a', lambda: 'A')
+        cache.get('b', lambda: 'B')
+        cache.get('a', lambda: 'A')
+        cache.get('c', lambda: 'C')
+        self.assertEqual(len(cache), 2)
+        self.assertIn('a', cache)
+        self.assertNotIn('b', cache)
+        self.assertIn('c', cache)
+
+    def test_get_persists_models_to_directory(self):
+        with tempfile.TemporaryDirectory() as directory:
+            cache = ModelCache(directory=os.path.join(directory, 'models'))
+            cache.get(('digest', 2, 7), lambda: {'b': 2})
+            self.assertTrue(
+                os.path.exists(os.path.join(directory, 'models', 'digest-2-7.pickle'))
+            )
+
+            other_cache = ModelCache(directory=os.path.join(directory, 'models'))
+            build = mock.Mock()
+            self.assertEqual(other_cache.get(('digest', 2, 7), build), {'b': 2})
+            build.assert_not_called()
+
+    def test_get_persists_models_atomically(self):
+        with tempfile.TemporaryDirectory() as directory:
+            cache = ModelCache(directory=directory)
+            with mock.patch('guessers.cache.pickle.dump', side_effect=OSError('disk full')):
+                with self.assertRaises(OSError):
+                    cache.get(('digest', 2, 7), lambda: {'b': 2})
+            # Neither a partial model nor its temporary file is left behind
+            self.assertEqual(os.listdir(directory), [])
+
+            with mock.patch('guessers.cache.os.replace', wraps=os.replace) as mock_replace:
+                cache.get(('digest', 2, 7), lambda: {'b': 2})
+            temporary_path, path = mock_replace.call_args[0]
+            self.assertEqual(os.path.dirname(temporary_path), directory)
+            self.assertEqual(path, os.path.join(directory, 'digest-2-7.pickle'))
+            self.assertEqual(os.listdir(directory), ['digest-2-7.pickle'])
+
+    def test_clear_empties_cache(self):
+        cache = ModelCache()
+        cache.get('a', lambda: 'A')
+        cache.clear()
+        self.assertEqual(len(cache), 0)
+
+    def test_model_cache_is_shared_instance(self):
+        self.assertIsInstance(MODEL_CACHE, ModelCache)
+
+
+class DecisionCacheTestCase(TestCase):
+    def test_get_counts_hits_and_misses(self):
+        cache = DecisionCache()
+        self.assertIsNone(cache.get('key'))
+        cache.put('key', 'e')
+        self.assertEqual(cache.get('key'), 'e')
+        self.assertEqual(cache.get('key'), 'e')
+        self.assertEqual((cache.hits, cache.misses), (2, 1))
+        self.assertAlmostEqual(cache.hit_rate, 2 / 3)
+        self.assertEqual(DecisionCache().hit_rate, 0.0)
+
+    def test_put_evicts_least_recently_used_guesses(self):
+        cache = DecisionCache(max_size=2)
+        cache.put('a', 'A')
+        cache.put('b', 'B')
+        cache.get('a')
+        cache.put('c', 'C')
+        self.assertIn('a', cache)
+        self.assertNotIn('b', cache)
+        self.assertIn('c', cache)
+
+    def test_save_and_load_round_trip(self):
+        cache = DecisionCache()
+        cache.put(('guesser', 'digest', '....', ''), 'e')
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'decisions.pickle')
+            cache.save(path)
+            loaded = DecisionCache()
+            loaded.load(path)
+        self.assertEqual(loaded.get(('guesser', 'digest', '....', '')), 'e')
+
+    def test_pop_recorded_returns_guesses_put_while_recording(self):
+        cache = DecisionCache()
+        cache.put('a', 'A')
+        self.assertEqual(cache.pop_recorded(), [])
+        cache.record()
+        cache.put('b', 'B')
+        cache.put('c', 'C')
+        self.assertEqual(cache.pop_recorded(), [('b', 'B'), ('c', 'C')])
+        self.assertEqual(cache.pop_recorded(), [])
+
+    def test_merge_adds_guesses_and_counts(self):
+        cache = DecisionCache()
+        cache.get('a')
+        cache.merge([('a', 'A'), ('b', 'B')], hits=3, misses=2)
+        self.assertEqual(cache.get('a'), 'A')
+        self.assertIn('b', cache)
+        self.assertEqual((cache.hits, cache.misses), (4, 3))
+
+    def test_clear_resets_counters(self):
+        cache = DecisionCache()
+        cache.put('a', 'A')
+        cache.get('a')
+        cache.clear()
+        self.assertEqual(len(cache), 0)
+        self.assertEqual((cache.hits, cache.misses), (0, 0))
@@ -7,6 +7,7 @@ from guessers.derived import (
     RederivedAlphabetGuesser,
 )
 from guessers.exc import TableFlipError
+from index import WordIndex
 
 
 class BaseDerivedAlphabetGuesserTestCase(TestCase):
@@ -27,34 +28,48 @@ class BaseDerivedAlphabetGuesserTestCase(TestCase):
         )
         self.assertCountEqual(culled_words, ['haberdashery'])
 
-    def test_derive_alphabet_extracts_unique_letters(self):
+    def test_cull_words_uses_word_index(self):
         guesser = self.DummyDerivedAlphabetGuesser()
-        unique_letters = guesser._derive_alphabet(
-            ['stereoscopy', 'microscope']
+        word_index = WordIndex(['haberdashery', 'horticulture', 'thalassophobia'])
+        self.assertIs(
+            guesser._cull_words(12, word_index, set()),
+            word_index.words(12)
         )
-        self.assertEqual(unique_letters, set('sterocpymi'))
+        self.assertCountEqual(
+            guesser._cull_words(12, word_index, {'o'}),
+            ['haberdashery']
+        )
+
+    def test_bucket_shares_word_index_bucket(self):
+        guesser = self.DummyDerivedAlphabetGuesser()
+        word_index = WordIndex(['haberdashery', 'horticulture', 'thalassophobia'])
+        self.assertIs(guesser._bucket(12, word_index), word_index.bucket(12))
+
+    def test_bucket_culls_word_list(self):
+        guesser = self.DummyDerivedAlphabetGuesser()
+        bucket = guesser._bucket(12, ['haberdashery', 'horticulture', 'thalassophobia'])
+        self.assertEqual(bucket.words, ['haberdashery', 'horticulture'])
 
     def test_update_state_records_incorrect_letters(self):
         guesser = self.DummyDerivedAlphabetGuesser()
-        guesser.update_state({'a': True, 'e': False, 'i': False, 'o': True}, 'a....')
+        guesser.update_state({'a': [0], 'e': [], 'i': [], 'o': [3]}, 'a..o.')
         self.assertEqual(guesser.incorrect_guesses, {'e', 'i'})
 
 
 class DerivedAlphabetGuesserTestCase(TestCase):
     def test_init_sets_alphabet_and_words(self):
-        with mock.patch.object(
-            DerivedAlphabetGuesser,
-            '_cull_words'
-        ) as mock_cull:
-            with mock.patch.object(
-                DerivedAlphabetGuesser,
-                '_derive_alphabet',
-                return_value=set('sartoil')
-            ) as mock_derive:
-                guesser = DerivedAlphabetGuesser(8, ['sartorial'])
+        guesser = DerivedAlphabetGuesser(9, ['sartorial', 'bun', 'jukebox'])
+        self.assertEqual(guesser.potential_words, ['sartorial'])
+        self.assertCountEqual(guesser.alphabet, set('sartoil'))
+
+    def test_init_uses_word_index_bucket(self):
+        word_index = WordIndex(['sartorial', 'bun', 'jukebox'])
+        with mock.patch.object(DerivedAlphabetGuesser, '_cull_words') as mock_cull:
+            guesser = DerivedAlphabetGuesser(9, word_index)
 
-        self.assertEqual(guesser.potential_words, mock_cull.return_value)
-        self.assertEqual(set(guesser.alphabet), set(mock_derive.return_value))
+        mock_cull.assert_not_called()
+        self.assertIs(guesser.potential_words, word_index.words(9))
+        self.assertCountEqual(guesser.alphabet, word_index.bucket(9).alphabet)
 
     def test_guess_pops_letter_from_alphabet(self):
         guesser = DerivedAlphabetGuesser(len('constituent'), ['constituent'])
@@ -65,82 +80,87 @@ class DerivedAlphabetGuesserTestCase(TestCase):
 
 class OrderedDerivedAlphabetGuesserTestCase(TestCase):
     def test_init_sets_semi_ordered_alphabet_and_words(self):
-        with mock.patch.object(
-            DerivedAlphabetGuesser,
-            '_cull_words'
-        ) as mock_cull:
-            with mock.patch.object(
-                DerivedAlphabetGuesser,
-                '_derive_alphabet',
-                return_value=set('transdimentionally')
-            ):
-                guesser = OrderedDerivedAlphabetGuesser(
-                    len('transdimensionally'),
-                    ['transdimensionally']
-                )
-        self.assertEqual(guesser.potential_words, mock_cull.return_value)
+        guesser = OrderedDerivedAlphabetGuesser(
+            len('transdimensionally'),
+            ['transdimensionally', 'quorum']
+        )
+        self.assertEqual(guesser.potential_words, ['transdimensionally'])
         self.assertEqual(len(guesser.alphabet), len(set('transdimensionally')))
         self.assertEqual(set(guesser.alphabet[-4:]), set('aeio'))
 
+    def test_init_culls_words_once(self):
+        with mock.patch.object(
+            OrderedDerivedAlphabetGuesser,
+            '_cull_words',
+            return_value=['transdimensionally']
+        ) as mock_cull:
+            OrderedDerivedAlphabetGuesser(len('transdimensionally'), ['transdimensionally'])
+        mock_cull.assert_called_once_with(len('transdimensionally'), ['transdimensionally'], set())
+
 
 class RederivedAlphabetGuesserTestCase(TestCase):
     def test_init_sets_words(self):
         with mock.patch.object(
             RederivedAlphabetGuesser,
-            '_cull_words'
+            '_cull_words',
+            return_value=['mendacity']
         ) as mock_cull:
             guesser = RederivedAlphabetGuesser(len('mendacity'), ['mendacity'])
 
-        self.assertEqual(guesser.potential_words, mock_cull.return_value)
-        mock_cull.assert_called_once_with(
-            len('mendacity'),
-            ['mendacity'],
-            guesser.incorrect_guesses,
-        )
+        self.assertEqual(guesser.potential_words, ['mendacity'])
+        mock_cull.assert_called_once_with(len('mendacity'), ['mendacity'], set())
+
+    def test_init_uses_word_index_bucket(self):
+        word_index = WordIndex(['mendacity', 'masquerade', 'truculent'])
+        guesser = RederivedAlphabetGuesser(len('mendacity'), word_index)
+        self.assertIs(guesser.candidates.bucket, word_index.bucket(9))
+        self.assertEqual(guesser.potential_words, ['mendacity', 'truculent'])
 
     def test_update_state_sets_incorrect_guesses_and_potential_words(self):
         guesser = RederivedAlphabetGuesser(11, ['superfluous'])
         with mock.patch.object(guesser, '_match_words') as mock_match:
             guesser.update_state(
-                {'a': False, 'e': True, 'i': False, 'o': True, 'u': True},
+                {'a': [], 'e': [3], 'i': [], 'o': [8], 'u': [1, 7, 9]},
                 '.u.e...uou.'
             )
         self.assertEqual(guesser.incorrect_guesses, {'a', 'i'})
-        mock_match.assert_called_once_with('.u.e...uou.', ['superfluous'])
-        self.assertEqual(guesser.potential_words, mock_match.return_value)
+        mock_match.assert_called_once_with(
+            {'a': [], 'e': [3], 'i': [], 'o': [8], 'u': [1, 7, 9]},
+            '.u.e...uou.'
+        )
 
     def test_guess_raises_error_on_no_possible_solutions(self):
-        guesser = RederivedAlphabetGuesser(2, ['ornery'])
-        with mock.patch.object(guesser, '_match_words', return_value=[]):
-            with self.assertRaises(TableFlipError) as cm:
-                guesser.update_state({'s': False}, '......')
-            self.assertEqual(str(cm.exception), 'No possible solution found')
-
-    def test_match_words_returns_words_matching_guessed_pattern(self):
-        matched_words = RederivedAlphabetGuesser._match_words(
-            '....otic',
-            ['quixotic', 'neurotic', 'aberration']
+        guesser = RederivedAlphabetGuesser(6, ['ornery'])
+        with self.assertRaises(TableFlipError) as cm:
+            guesser.update_state({'r': []}, '......')
+        self.assertEqual(str(cm.exception), 'No possible solution found')
+
+    def test_match_words_keeps_words_matching_guessed_pattern(self):
+        guesser = RederivedAlphabetGuesser(
+            8,
+            ['quixotic', 'neurotic', 'hypnotic', 'aberration']
+        )
+        guesser._match_words({'o': [4], 't': [5], 'c': [7]}, '....ot.c')
+        self.assertCountEqual(
+            guesser.potential_words,
+            ['quixotic', 'neurotic', 'hypnotic']
         )
-        self.assertCountEqual(matched_words, ['quixotic', 'neurotic'])
+
+        guesser._match_words({'i': [6], 'y': []}, '....otic')
+        self.assertCountEqual(guesser.potential_words, ['neurotic'])
 
     def test_guess_rederives_alphabet(self):
         guesser = RederivedAlphabetGuesser(4, ['hoax', 'lull', 'aspartame'])
 
-        with mock.patch.object(
-            guesser,
-            '_derive_alphabet',
-            return_value=set('hoaxlusprtme')
-        ) as mock_derive:
-            guess = guesser.guess(guessed_word='....')
-
-        self.assertIn(guess, mock_derive.return_value)
+        guess = guesser.guess(guessed_word='....')
+        self.assertEqual(guesser.alphabet, set('hoaxlu'))
+        self.assertIn(guess, guesser.alphabet)
 
     def test_guess_return_final_guess(self):
         guesser = RederivedAlphabetGuesser(6, ['pallor'])
         self.assertEqual(len(guesser.potential_words), 1)
 
-        with mock.patch.object(guesser, '_derive_alphabet') as mock_derive:
-            guess = guesser.guess(guessed_word='......')
+        guess = guesser.guess(guessed_word='......')
 
         self.assertEqual(guess, 'pallor')
-        mock_derive.assert_not_called()
+        self.assertFalse(hasattr(guesser, 'alphabet'))
@@ -0,0 +1,97 @@
+import math
+from unittest import mock, TestCase
+
+from guessers import entropy, probability
+from guessers.base import BUDGET_STATS
+from guessers.entropy import EntropyGuesser, letter_entropies
+from index import WordBucket
+
+
+class LetterEntropiesTestCase(TestCase):
+    def setUp(self):
+        self.bucket = WordBucket(4, ['bark', 'bank', 'dark', 'dank', 'tank', 'tant'])
+
+    def assert_entropies(self, entropies):
+        codes = self.bucket.codes
+        # a reveals nothing
+        self.assertEqual(entropies[codes['a']], 0)
+        # b, d, n and r split 2/4
+        for letter in 'bdnr':
+            self.assertAlmostEqual(
+                entropies[codes[letter]],
+                -(2 / 6 * math.log2(2 / 6) + 4 / 6 * math.log2(4 / 6))
+            )
+        # k splits 5/1, t splits 4/1/1
+        self.assertAlmostEqual(
+            entropies[codes['k']],
+            -(5 / 6 * math.log2(5 / 6) + 1 / 6 * math.log2(1 / 6))
+        )
+        self.assertAlmostEqual(
+            entropies[codes['t']],
+            -(4 / 6 * math.log2(4 / 6) + 2 * 1 / 6 * math.log2(1 / 6))
+        )
+
+    def test_computes_partition_entropy_per_letter(self):
+        entropies = letter_entropies(self.bucket.matrix, len(self.bucket.alphabet))
+        self.assertEqual(entropies.shape, (len(self.bucket.alphabet),))
+        self.assert_entropies(entropies)
+
+    def test_hashes_sparse_keys_for_long_words(self):
+        with mock.patch.object(entropy, 'MAX_DENSE_KEYS', 0):
+            entropies = letter_entropies(self.bucket.matrix, len(self.bucket.alphabet))
+        self.assert_entropies(entropies)
+
+    def test_handles_no_candidates(self):
+        self.assertEqual(letter_entropies(self.bucket.matrix[:0], 3).tolist(), [0, 0, 0])
+
+
+class EntropyGuesserTestCase(TestCase):
+    words = ['bark', 'bank', 'dark', 'dank', 'tank', 'tant']
+
+    def test_guess_maximizes_information(self):
+        guesser = EntropyGuesser(4, self.words)
+        self.assertEqual(guesser.guess('....'), 't')
+
+    def test_guess_skips_guessed_letters(self):
+        guesser = EntropyGuesser(4, self.words)
+        guesser.update_state({'t': []}, '....')
+        self.assertEqual(guesser.potential_words, ['bark', 'bank', 'dark', 'dank'])
+        self.assertEqual(guesser.guess('....'), 'b')
+
+    def test_guess_returns_final_word(self):
+        guesser = EntropyGuesser(4, self.words)
+        guesser.update_state({'t': [0, 3]}, 't..t')
+        self.assertEqual(guesser.guess('t..t'), 'tant')
+
+    def test_guess_falls_back_for_indistinguishable_candidates(self):
+        guesser = EntropyGuesser(4, ['bark', 'bark'])
+        self.assertEqual(guesser.guess('....'), 'a')
+
+
+class EntropyTimeBudgetTestCase(TestCase):
+    words = ['bark', 'bank', 'dark', 'dank', 'tank', 'tant']
+
+    def setUp(self):
+        BUDGET_STATS.clear()
+        self.addCleanup(BUDGET_STATS.clear)
+
+    def test_guess_falls_back_to_letter_order_when_out_of_time(self):
+        guesser = EntropyGuesser(4, self.words)
+        guesser.time_budget = 0
+        self.assertEqual(guesser.guess('....'), 'a')
+        self.assertEqual(BUDGET_STATS.fallbacks, 1)
+
+    def test_guess_estimates_entropies_from_chunks_keyed_before_deadline(self):
+        guesser = EntropyGuesser(4, self.words)
+        guesser.time_budget = 1
+        with mock.patch.object(probability, 'BUDGET_CHUNK_SIZE', 4), \
+                mock.patch.object(entropy, 'BUDGET_CHUNK_SIZE', 4), \
+                mock.patch.object(guesser, '_out_of_time', side_effect=[False, True]):
+            # Among bark, bank, dark and dank, b splits 2/2 first
+            self.assertEqual(guesser.guess('....'), 'b')
+        self.assertEqual(BUDGET_STATS.partial, 1)
+
+    def test_guess_matches_unbudgeted_guess_within_budget(self):
+        guesser = EntropyGuesser(4, self.words)
+        guesser.time_budget = 60
+        self.assertEqual(guesser.guess('....'), 't')
@@ -28,6 +28,10 @@ class GuessersTestCase(TestCase):
             guessers.FrequentLetterGuesser,
             guessers.probability.FrequentLetterGuesser
         )
+        self.assertIs(
+            guessers.VectorizedFrequentLetterGuesser,
+            guessers.probability.VectorizedFrequentLetterGuesser
+        )
         self.assertIs(
             guessers.SingleStateMarkovGuesser,
             guessers.markov.SingleStateMarkovGuesser
@@ -36,3 +40,13 @@ class GuessersTestCase(TestCase):
             guessers.DoubleStateMarkovGuesser,
             guessers.markov.DoubleStateMarkovGuesser
         )
+        self.assertIs(
+            guessers.IncrementalSingleStateMarkovGuesser,
+            guessers.markov.IncrementalSingleStateMarkovGuesser
+        )
+        self.assertIs(
+            guessers.IncrementalDoubleStateMarkovGuesser,
+            guessers.markov.IncrementalDoubleStateMarkovGuesser
+        )
+        self.assertIs(guessers.EntropyGuesser, guessers.entropy.EntropyGuesser)
+        self.assertIs(guessers.TableGuesser, guessers.table.TableGuesser)
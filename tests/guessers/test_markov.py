@@ -1,39 +1,49 @@
 from unittest import mock, TestCase
 
-import markovify
-
-from guessers.markov import SingleStateMarkovGuesser, DoubleStateMarkovGuesser
+from guessers.cache import MODEL_CACHE
+from guessers.markov import (
+    DoubleStateMarkovGuesser,
+    IncrementalDoubleStateMarkovGuesser,
+    IncrementalSingleStateMarkovGuesser,
+    SingleStateMarkovGuesser,
+)
+from guessers.ngram import BEGIN, TransitionTable
+from index import WordBucket, WordIndex
 
 
 class SingleStateMarkovGuesserTestCase(TestCase):
+    def setUp(self):
+        MODEL_CACHE.clear()
+
     def test_init_trains_markov_model_and_derives_alphabet(self):
-        with mock.patch('markovify.Chain') as mock_chain:
-            with mock.patch.object(
-                SingleStateMarkovGuesser,
-                '_derive_alphabet'
-            ) as mock_derive:
-                guesser = SingleStateMarkovGuesser(
-                    word_length=12,
-                    potential_words=['interstitial', 'formative']
-                )
-
-        mock_chain.assert_called_once_with(
-            [
-                ['i', 'n', 't', 'e', 'r', 's', 't', 'i', 't', 'i', 'a', 'l'],
-                ['f', 'o', 'r', 'm', 'a', 't', 'i', 'v', 'e'],
-            ],
-            state_size=1
-        )
+        with mock.patch('guessers.markov.TransitionTable') as mock_chain:
+            guesser = SingleStateMarkovGuesser(
+                word_length=12,
+                potential_words=['interstitial', 'formative']
+            )
+
+        mock_chain.assert_called_once_with(guesser.candidates.bucket, 1)
+        self.assertEqual(guesser.candidates.bucket.words, ['interstitial'])
         self.assertIs(guesser.markov_model_1, mock_chain.return_value)
-        self.assertEqual(guesser.alphabet, mock_derive.return_value)
+        self.assertEqual(guesser.alphabet, set('interstitial'))
+
+    def test_init_reuses_cached_markov_model(self):
+        word_index = WordIndex(['interstitial', 'formative'])
+        guesser = SingleStateMarkovGuesser(12, word_index)
+        with mock.patch('guessers.markov.TransitionTable') as mock_chain:
+            other_guesser = SingleStateMarkovGuesser(12, word_index)
+            same_words_guesser = SingleStateMarkovGuesser(12, ['interstitial'])
+
+        mock_chain.assert_not_called()
+        self.assertIs(other_guesser.markov_model_1, guesser.markov_model_1)
+        self.assertIs(same_words_guesser.markov_model_1, guesser.markov_model_1)
 
     def test_update_state_rederives_alphabet(self):
-        guesser = SingleStateMarkovGuesser(10, ['peripheral'])
-        with mock.patch.object(guesser, '_derive_alphabet') as mock_derive:
-            guesser.update_state({'x': False}, '..........')
+        guesser = SingleStateMarkovGuesser(10, ['peripheral', 'monolithic'])
+        self.assertEqual(guesser.alphabet, set('peripheralmonolithic'))
 
-        mock_derive.assert_called_once_with(['peripheral'])
-        guesser.alphabet = mock_derive.return_value
+        guesser.update_state({'x': [], 'c': []}, '..........')
+        self.assertEqual(guesser.alphabet, set('peripheral'))
 
     def test_guess_returns_final_word(self):
         guesser = SingleStateMarkovGuesser(
@@ -57,7 +67,7 @@ class SingleStateMarkovGuesserTestCase(TestCase):
             guess = guesser.guess('........')
         mock_select.assert_called_once_with(
             guesser.markov_model_1,
-            (markovify.chain.BEGIN,)
+            (BEGIN,)
         )
         self.assertEqual(guess, mock_select.return_value)
 
@@ -65,7 +75,7 @@ class SingleStateMarkovGuesserTestCase(TestCase):
             guess = guesser.guess('....sory')
         mock_select.assert_called_once_with(
             guesser.markov_model_1,
-            (markovify.chain.BEGIN,)
+            (BEGIN,)
         )
         self.assertEqual(guess, mock_select.return_value)
 
@@ -85,14 +95,8 @@ class SingleStateMarkovGuesserTestCase(TestCase):
         self.assertEqual(guess, mock_select.return_value)
 
     def test_select_most_frequent_follower_retrieves_unguessed_letter(self):
-        chain = markovify.Chain(
-            [
-                ['a', 'b'],
-                ['a', 'b', 'a', 'b'],
-                ['a', 'd'],
-                ['b', 'a', 'd'],
-                ['a', 'c'],
-            ],
+        chain = TransitionTable(
+            WordBucket(2, ['ab', 'ab', 'ad', 'ac', 'ba']),
             state_size=1
         )
         guesser = SingleStateMarkovGuesser(
@@ -104,28 +108,30 @@ class SingleStateMarkovGuesserTestCase(TestCase):
         guess = guesser._select_most_frequent_follower(chain, ('a',))
         self.assertEqual(guess, 'c')
 
+    def test_select_most_frequent_follower_falls_back_to_frequent_letters(self):
+        guesser = SingleStateMarkovGuesser(
+            word_length=4,
+            potential_words=['quiz', 'quit', 'quip']
+        )
+        guesser.correct_guesses = {'q', 'u'}
+        guess = guesser._select_most_frequent_follower(guesser.markov_model_1, 'q')
+        self.assertEqual(guess, 'i')
+
 
 class DoubleStateMarkovGuesserTestCase(TestCase):
+    def setUp(self):
+        MODEL_CACHE.clear()
+
     def test_init_trains_markov_model(self):
-        with mock.patch('markovify.Chain') as mock_chain:
-            with mock.patch.object(
-                SingleStateMarkovGuesser,
-                '_derive_alphabet'
-            ) as mock_derive:
-                guesser = DoubleStateMarkovGuesser(
-                    word_length=12,
-                    potential_words=['interstitial', 'formative']
-                )
-
-        mock_chain.assert_any_call(
-            [
-                ['i', 'n', 't', 'e', 'r', 's', 't', 'i', 't', 'i', 'a', 'l'],
-                ['f', 'o', 'r', 'm', 'a', 't', 'i', 'v', 'e'],
-            ],
-            state_size=2
-        )
+        with mock.patch('guessers.markov.TransitionTable') as mock_chain:
+            guesser = DoubleStateMarkovGuesser(
+                word_length=12,
+                potential_words=['interstitial', 'formative']
+            )
+
+        mock_chain.assert_any_call(guesser.candidates.bucket, 2)
         self.assertIs(guesser.markov_model_2, mock_chain.return_value)
-        self.assertEqual(guesser.alphabet, mock_derive.return_value)
+        self.assertEqual(guesser.alphabet, set('interstitial'))
 
     def test_guess_returns_final_word(self):
         guesser = DoubleStateMarkovGuesser(
@@ -149,7 +155,7 @@ class DoubleStateMarkovGuesserTestCase(TestCase):
             guess = guesser.guess('........')
         mock_select.assert_called_once_with(
             guesser.markov_model_1,
-            (markovify.chain.BEGIN,)
+            (BEGIN,)
         )
         self.assertEqual(guess, mock_select.return_value)
 
@@ -157,7 +163,7 @@ class DoubleStateMarkovGuesserTestCase(TestCase):
             guess = guesser.guess('....sory')
         mock_select.assert_called_once_with(
             guesser.markov_model_1,
-            (markovify.chain.BEGIN,)
+            (BEGIN,)
         )
         self.assertEqual(guess, mock_select.return_value)
 
@@ -182,14 +188,8 @@ class DoubleStateMarkovGuesserTestCase(TestCase):
         self.assertEqual(guess, mock_select.return_value)
 
     def test_select_most_frequent_follower_retrieves_unguessed_letter(self):
-        chain = markovify.Chain(
-            [
-                ['a', 'b'],
-                ['a', 'b', 'a', 'b'],
-                ['a', 'd'],
-                ['b', 'a', 'd'],
-                ['a', 'c'],
-            ],
+        chain = TransitionTable(
+            WordBucket(2, ['ab', 'ab', 'ad', 'ac', 'ba']),
             state_size=1
         )
         guesser = SingleStateMarkovGuesser(
@@ -200,3 +200,51 @@ class DoubleStateMarkovGuesserTestCase(TestCase):
         guesser.alphabet = {'c'}
         guess = guesser._select_most_frequent_follower(chain, ('a',))
         self.assertEqual(guess, 'c')
+
+
+class IncrementalMarkovGuesserTestCase(TestCase):
+    words = ['anticipatory', 'unsinokorean', 'interstitial']
+
+    def setUp(self):
+        MODEL_CACHE.clear()
+
+    def test_init_copies_cached_chains(self):
+        word_index = WordIndex(self.words)
+        guesser = DoubleStateMarkovGuesser(12, word_index)
+        incremental_guesser = IncrementalDoubleStateMarkovGuesser(12, word_index)
+
+        self.assertIsNot(incremental_guesser.markov_model_1, guesser.markov_model_1)
+        self.assertIsNot(incremental_guesser.markov_model_2, guesser.markov_model_2)
+        self.assertEqual(
+            incremental_guesser.markov_model_2.counts.tolist(),
+            guesser.markov_model_2.counts.tolist()
+        )
+
+    def test_update_state_removes_eliminated_words_from_chains(self):
+        guesser = IncrementalDoubleStateMarkovGuesser(12, self.words)
+        guesser.update_state({'p': []}, '............')
+
+        for chain in (guesser.markov_model_1, guesser.markov_model_2):
+            self.assertEqual(chain.counts.sum(), 2 * 13)
+        codes = guesser.markov_model_1.codes
+        a_followers = guesser.markov_model_1.followers(('a',))
+        self.assertEqual(a_followers[codes['n'] + 1], 1)
+        self.assertEqual(a_followers[codes['l'] + 1], 1)
+        self.assertEqual(a_followers[codes['t'] + 1], 0)
+        self.assertEqual(
+            guesser.markov_model_2.followers(('t', 'o')).sum(),
+            0
+        )
+
+        cached_chain = SingleStateMarkovGuesser(12, self.words).markov_model_1
+        self.assertEqual(cached_chain.counts.sum(), 3 * 13)
+
+    def test_guess_follows_remaining_candidates(self):
+        guesser = IncrementalSingleStateMarkovGuesser(4, ['abcd', 'abef', 'abeg'])
+        guesser.update_state({'a': [0], 'b': [1]}, 'ab..')
+        guesser.update_state({'e': []}, 'ab..')
+        self.assertEqual(guesser.potential_words, ['abcd'])
+        self.assertEqual(
+            guesser.markov_model_1.most_frequent_follower(('b',), set('ce')),
+            'c'
+        )
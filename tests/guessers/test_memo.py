@@ -0,0 +1,94 @@
+import pickle
+from unittest import mock, TestCase
+
+from guessers import memo
+from guessers.cache import DecisionCache
+from guessers.memo import MemoizedGuesser, memoize
+from guessers.naive import RandomGuesser
+from guessers.probability import FrequentLetterGuesser
+from guessers.table import TableGuesser
+from index import WordIndex
+from simulation import play_game
+
+
+class MemoizeTestCase(TestCase):
+    def test_creates_registered_subclass(self):
+        memoized_class = memoize(FrequentLetterGuesser)
+        self.assertTrue(issubclass(memoized_class, MemoizedGuesser))
+        self.assertIs(memoized_class.guesser_class, FrequentLetterGuesser)
+        self.assertEqual(memoized_class.__name__, 'MemoizedFrequentLetterGuesser')
+        self.assertIs(memoize(FrequentLetterGuesser), memoized_class)
+        self.assertIs(pickle.loads(pickle.dumps(memoized_class)), memoized_class)
+
+    def test_rejects_nondeterministic_guessers(self):
+        with self.assertRaises(ValueError) as cm:
+            memoize(RandomGuesser)
+        self.assertEqual(str(cm.exception), 'RandomGuesser is not deterministic')
+
+
+class MemoizedGuesserTestCase(TestCase):
+    words = ['latter', 'barrel', 'rabbit', 'bottle', 'kettle', 'little', 'hoax', 'lull']
+
+    def setUp(self):
+        cache = DecisionCache()
+        patcher = mock.patch.object(MemoizedGuesser, 'cache', cache)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.cache = cache
+        self.memoized_class = memoize(FrequentLetterGuesser)
+
+    def test_guess_is_computed_once_per_state(self):
+        index = WordIndex(self.words)
+        first = self.memoized_class(6, index)
+        second = self.memoized_class(6, index)
+        with mock.patch.object(
+            FrequentLetterGuesser,
+            'guess',
+            autospec=True,
+            return_value='t',
+        ) as mock_guess:
+            self.assertEqual(first.guess(guessed_word='......'), 't')
+            self.assertEqual(second.guess(guessed_word='......'), 't')
+        mock_guess.assert_called_once_with(first.guesser, '......')
+        self.assertEqual((self.cache.hits, self.cache.misses), (1, 1))
+
+    def test_key_includes_guessed_letters(self):
+        guesser = self.memoized_class(6, self.words)
+        guesser.guess(guessed_word='......')
+        guesser.update_state({'t': [2, 3]}, '..tt..')
+        guesser.update_state({'s': []}, '..tt..')
+        guesser.guess(guessed_word='..tt..')
+        key = guesser._key + ('..tt..', 'st')
+        self.assertIn(key, self.cache)
+
+    def test_key_includes_decision_key(self):
+        memoized_class = memoize(TableGuesser)
+        with mock.patch.object(TableGuesser, 'table_path', None):
+            guesser = memoized_class(6, self.words)
+        self.assertEqual(guesser._key[1], (None,))
+        self.assertEqual(self.memoized_class(6, self.words)._key[1], ())
+
+    def test_guess_bypasses_cache_under_time_budget(self):
+        guesser = self.memoized_class(6, self.words)
+        with mock.patch.object(FrequentLetterGuesser, 'time_budget', 60):
+            guesser.guess(guessed_word='......')
+        self.assertEqual(len(self.cache), 0)
+        self.assertEqual((self.cache.hits, self.cache.misses), (0, 0))
+
+    def test_plays_like_wrapped_guesser(self):
+        index = WordIndex(self.words)
+        for word in self.words * 2:
+            memoized = play_game(self.memoized_class, word, index, 8)
+            plain = play_game(FrequentLetterGuesser, word, index, 8)
+            self.assertEqual(
+                memoized._replace(guess_durations=[]),
+                plain._replace(guess_durations=[])
+            )
+        self.assertGreater(self.cache.hit_rate, 0.5)
+
+    def test_digest_identifies_words_of_length(self):
+        self.assertEqual(
+            memo._digest(4, ['hoax', 'lull', 'latter']),
+            memo._digest(4, ['hoax', 'barrel', 'lull'])
+        )
+        self.assertNotEqual(memo._digest(4, ['hoax']), memo._digest(4, ['lull']))
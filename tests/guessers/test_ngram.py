@@ -0,0 +1,91 @@
+from unittest import TestCase
+
+import numpy as np
+
+from guessers.ngram import BEGIN, TransitionTable
+from index import WordBucket
+
+
+class TransitionTableTestCase(TestCase):
+    def setUp(self):
+        self.bucket = WordBucket(3, ['cab', 'abb', 'bad'])
+
+    def test_init_counts_single_state_transitions(self):
+        table = TransitionTable(self.bucket, state_size=1)
+        self.assertEqual(table.alphabet, ['a', 'b', 'c', 'd'])
+        self.assertEqual(table.counts.shape, (5, 5))
+        self.assertEqual(table.counts.sum(), 3 * 4)
+        # BEGIN -> c, a, b
+        self.assertEqual(list(table.counts[0]), [0, 1, 1, 1, 0])
+        # a -> b, b, d
+        self.assertEqual(list(table.counts[1]), [0, 0, 2, 0, 1])
+        # b -> END, b, END, a
+        self.assertEqual(list(table.counts[2]), [2, 1, 1, 0, 0])
+
+    def test_init_counts_double_state_transitions(self):
+        table = TransitionTable(self.bucket, state_size=2)
+        self.assertEqual(table.counts.shape, (5, 5, 5))
+        self.assertEqual(table.counts.sum(), 3 * 4)
+        self.assertEqual(table.counts[0, 0, 3], 1)
+        self.assertEqual(table.counts[0, 3, 1], 1)
+        self.assertEqual(table.counts[3, 1, 2], 1)
+        self.assertEqual(table.counts[1, 2, 0], 1)
+        self.assertEqual(table.counts[1, 2, 2], 1)
+
+    def test_copy_has_independent_counts(self):
+        table = TransitionTable(self.bucket, state_size=1)
+        duplicate = table.copy()
+        duplicate.counts[0, 1] = 5
+        self.assertEqual(table.counts[0, 1], 1)
+        self.assertIs(duplicate.codes, table.codes)
+        self.assertEqual(duplicate.state_size, 1)
+
+    def test_remove_subtracts_eliminated_words(self):
+        table = TransitionTable(self.bucket, state_size=1)
+        table.remove(self.bucket, self.bucket.selector(0b101))
+        # Only 'abb' remains: BEGIN -> a, a -> b, b -> b, b -> END
+        expected_counts = [[0] * 5 for _ in range(5)]
+        expected_counts[0][1] = expected_counts[1][2] = 1
+        expected_counts[2][2] = expected_counts[2][0] = 1
+        self.assertEqual(table.counts.tolist(), expected_counts)
+
+        table.remove(self.bucket, self.bucket.selector(0))
+        self.assertEqual(table.counts.sum(), 4)
+
+    def test_table_does_not_keep_per_word_arrays(self):
+        table = TransitionTable(self.bucket, state_size=2)
+        self.assertEqual(
+            [name for name, value in vars(table).items() if isinstance(value, np.ndarray)],
+            ['counts'],
+        )
+
+    def test_weighted_bucket_counts_weighted_transitions(self):
+        bucket = WordBucket(3, ['cab', 'abb', 'bad'], weights=np.array([1, 5, 2]))
+        table = TransitionTable(bucket, state_size=1)
+        self.assertEqual(table.counts.dtype, np.int64)
+        self.assertEqual(list(table.counts[0]), [0, 5, 2, 1, 0])
+        self.assertEqual(list(table.counts[1]), [0, 0, 6, 0, 2])
+
+        table.remove(bucket, bucket.selector(0b010))
+        self.assertEqual(list(table.counts[0]), [0, 0, 2, 1, 0])
+        self.assertEqual(table.counts.sum(), 3 * 4)
+
+    def test_followers_looks_up_states(self):
+        table = TransitionTable(self.bucket, state_size=2)
+        self.assertEqual(list(table.followers(('a', 'b'))), [1, 0, 1, 0, 0])
+        self.assertEqual(list(table.followers((BEGIN,))), [0, 1, 1, 1, 0])
+        self.assertEqual(list(table.followers((BEGIN, 'b'))), [0, 1, 0, 0, 0])
+        self.assertIsNone(table.followers(('a', 'z')))
+
+    def test_most_frequent_follower_selects_from_letters(self):
+        table = TransitionTable(self.bucket, state_size=1)
+        self.assertEqual(table.most_frequent_follower(('a',), set('abcd')), 'b')
+        self.assertEqual(table.most_frequent_follower(('a',), set('acd')), 'd')
+        self.assertEqual(table.most_frequent_follower((BEGIN,), set('bcd')), 'b')
+        self.assertIsNone(table.most_frequent_follower(('a',), set('ac')))
+        self.assertIsNone(table.most_frequent_follower(('z',), set('abcd')))
+
+    def test_init_handles_empty_bucket(self):
+        table = TransitionTable(WordBucket(3, []), state_size=1)
+        self.assertEqual(table.counts.shape, (1, 1))
+        self.assertIsNone(table.most_frequent_follower(('a',), set('a')))
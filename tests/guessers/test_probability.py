@@ -1,7 +1,14 @@
 from unittest import mock, TestCase
 
+from game import WordGuess
+from guessers import probability
+from guessers.base import BUDGET_STATS
 from guessers.exc import TableFlipError
-from guessers.probability import FrequentLetterGuesser
+from guessers.probability import (
+    FrequentLetterGuesser,
+    VectorizedFrequentLetterGuesser,
+)
+from index import WordIndex
 
 
 class FrequentLetterGuesserTestCase(TestCase):
@@ -21,31 +28,34 @@ class FrequentLetterGuesserTestCase(TestCase):
         self.assertEqual(guesser.correct_guesses, set())
         self.assertEqual(guesser.incorrect_guesses, set())
 
-        guesser.update_state({'g': True, 'p': False}, '....dual')
-        self.assertEqual(guesser.correct_guesses, {'g'})
+        guesser.update_state({'d': [4], 'p': []}, '....d...')
+        self.assertEqual(guesser.correct_guesses, {'d'})
         self.assertEqual(guesser.incorrect_guesses, {'p'})
 
     def test_update_state_rematches_words(self):
-        guesser = FrequentLetterGuesser(11, ['temporality'])
-        with mock.patch.object(guesser, '_match_words') as mock_match:
-            guesser.update_state({'x': False}, 'temp...lity')
+        guesser = FrequentLetterGuesser(11, ['temporality', 'contestable'])
+        with mock.patch.object(
+            guesser,
+            '_match_words',
+            wraps=guesser._match_words
+        ) as mock_match:
+            guesser.update_state({'x': [], 'p': [3]}, '...p.......')
 
-        mock_match.assert_called_once_with('temp...lity', ['temporality'])
-        self.assertEqual(guesser.potential_words, mock_match.return_value)
+        mock_match.assert_called_once_with({'x': [], 'p': [3]}, '...p.......')
+        self.assertEqual(guesser.potential_words, ['temporality'])
 
     def test_update_state_raises_error_when_no_potential_words_exist(self):
         guesser = FrequentLetterGuesser(9, ['facetious'])
-        with mock.patch.object(guesser, '_match_words', return_value=[]):
-            with self.assertRaises(TableFlipError) as cm:
-                guesser.update_state({'z': False}, 'face.....')
-            self.assertEqual(str(cm.exception), 'No possible solution found')
+        with self.assertRaises(TableFlipError) as cm:
+            guesser.update_state({'f': []}, '.........')
+        self.assertEqual(str(cm.exception), 'No possible solution found')
 
     def test_guess_returns_most_frequent_letter(self):
         guesser = FrequentLetterGuesser(6, ['latter', 'barrel', 'rabbit'])
         with mock.patch.object(guesser, '_select_most_frequent_letter') as mock_select:
             guess = guesser.guess(guessed_word='......')
 
-        mock_select.assert_called_once_with(guesser.potential_words)
+        mock_select.assert_called_once_with(guesser.potential_words, None)
         self.assertEqual(guess, mock_select.return_value)
 
     def test_guess_returns_final_word(self):
@@ -56,8 +66,18 @@ class FrequentLetterGuesserTestCase(TestCase):
             guess = guesser.guess(guessed_word='......')
 
         self.assertEqual(guess, 'gauche')
+        self.assertIsInstance(guess, WordGuess)
         mock_select.assert_not_called()
 
+    def test_update_state_discards_wrong_word_guess(self):
+        guesser = FrequentLetterGuesser(6, ['gauche', 'gaucho'])
+        guesser.update_state({WordGuess('gaucho'): []}, '......')
+        self.assertEqual(guesser.potential_words, ['gauche'])
+        self.assertIn('gaucho', guesser.incorrect_guesses)
+
+        with self.assertRaises(TableFlipError):
+            guesser.update_state({WordGuess('gauche'): []}, '......')
+
     def test_select_most_frequent_letter_works_as_expected(self):
         guesser = FrequentLetterGuesser(5, ['peeve'])
         letter = guesser._select_most_frequent_letter(['peeve', 'reave', 'lease'])
@@ -79,3 +99,146 @@ class FrequentLetterGuesserTestCase(TestCase):
         with self.assertRaises(TableFlipError) as cm:
             guesser._select_most_frequent_letter(['oort', 'tor'])
         self.assertEqual(str(cm.exception), 'No possible solution found')
+
+    def test_select_most_frequent_letter_breaks_ties_alphabetically(self):
+        guesser = FrequentLetterGuesser(4, ['bead'])
+        letter = guesser._select_most_frequent_letter(['bead', 'dart'])
+        self.assertEqual(letter, 'a')
+
+    def test_select_most_frequent_letter_can_count_words(self):
+        guesser = FrequentLetterGuesser(8, ['aardvark'])
+        guesser.count_words = True
+        letter = guesser._select_most_frequent_letter(['aardvark', 'be', 'fe'])
+        self.assertEqual(letter, 'e')
+
+
+class VectorizedFrequentLetterGuesserTestCase(TestCase):
+    def test_guess_returns_most_frequent_candidate_letter(self):
+        guesser = VectorizedFrequentLetterGuesser(6, ['latter', 'barrel', 'rabbit'])
+        with mock.patch.object(
+            guesser,
+            '_select_most_frequent_candidate_letter'
+        ) as mock_select:
+            guess = guesser.guess(guessed_word='......')
+
+        mock_select.assert_called_once_with()
+        self.assertEqual(guess, mock_select.return_value)
+
+    def test_select_most_frequent_candidate_letter_counts_occurrences(self):
+        guesser = VectorizedFrequentLetterGuesser(5, ['peeve', 'reave', 'lease'])
+        self.assertEqual(guesser._select_most_frequent_candidate_letter(), 'e')
+
+        guesser = VectorizedFrequentLetterGuesser(8, ['aardvark', 'steerage'])
+        self.assertEqual(guesser._select_most_frequent_candidate_letter(), 'a')
+
+    def test_select_most_frequent_candidate_letter_can_count_words(self):
+        guesser = VectorizedFrequentLetterGuesser(
+            8,
+            ['aardvark', 'ensuring', 'entities']
+        )
+        self.assertEqual(guesser._select_most_frequent_candidate_letter(), 'a')
+        guesser.count_words = True
+        self.assertEqual(guesser._select_most_frequent_candidate_letter(), 'e')
+
+    def test_select_most_frequent_candidate_letter_discards_previous_guesses(self):
+        guesser = VectorizedFrequentLetterGuesser(
+            10,
+            ['irreverent', 'irritables']
+        )
+        guesser.correct_guesses = {'e'}
+        guesser.incorrect_guesses = {'r'}
+        self.assertEqual(guesser._select_most_frequent_candidate_letter(), 'i')
+
+    def test_select_most_frequent_candidate_letter_only_counts_candidates(self):
+        guesser = VectorizedFrequentLetterGuesser(6, ['latter', 'barrel', 'rabbit'])
+        guesser.update_state({'t': []}, '......')
+        self.assertEqual(guesser._select_most_frequent_candidate_letter(), 'r')
+
+    def test_select_most_frequent_candidate_letter_matches_python_counts(self):
+        words = ['latter', 'barrel', 'rabbit', 'bottle', 'kettle', 'little']
+        for count_words in (False, True):
+            guesser = FrequentLetterGuesser(6, words)
+            vectorized_guesser = VectorizedFrequentLetterGuesser(6, words)
+            guesser.count_words = vectorized_guesser.count_words = count_words
+            for guesser_ in (guesser, vectorized_guesser):
+                guesser_.update_state({'e': [4]}, '....e.')
+            self.assertEqual(
+                vectorized_guesser._select_most_frequent_candidate_letter(),
+                guesser._select_most_frequent_letter(guesser.potential_words),
+            )
+
+    def test_select_most_frequent_candidate_letter_weighs_words(self):
+        index = WordIndex.from_weighted([('latter', 1), ('barrel', 1), ('rabbit', 10)])
+        for count_words, expected_letter in ((False, 'b'), (True, 'a')):
+            guesser = VectorizedFrequentLetterGuesser(6, index)
+            guesser.count_words = count_words
+            guesser.correct_guesses = {'r'}
+            self.assertEqual(guesser._select_most_frequent_candidate_letter(), expected_letter)
+            self.assertEqual(
+                guesser._select_most_frequent_letter(
+                    guesser.potential_words,
+                    guesser.candidates.weights,
+                ),
+                expected_letter
+            )
+
+    def test_select_most_frequent_candidate_letter_raises_error_when_all_letters_guessed(self):
+        guesser = VectorizedFrequentLetterGuesser(4, ['oort', 'tort'])
+        guesser.correct_guesses = set('oort')
+        with self.assertRaises(TableFlipError) as cm:
+            guesser._select_most_frequent_candidate_letter()
+        self.assertEqual(str(cm.exception), 'No possible solution found')
+
+
+class TimeBudgetTestCase(TestCase):
+    words = ['latter', 'barrel', 'rabbit', 'bottle', 'kettle', 'little', 'battle']
+
+    def setUp(self):
+        BUDGET_STATS.clear()
+        self.addCleanup(BUDGET_STATS.clear)
+
+    def test_guess_falls_back_to_letter_order_when_out_of_time(self):
+        for guesser_class in (FrequentLetterGuesser, VectorizedFrequentLetterGuesser):
+            guesser = guesser_class(6, self.words)
+            guesser.time_budget = 0
+            guesser.update_state({'t': [2, 3]}, '..tt..')
+            # e, l and t are in the most words, and t is guessed
+            self.assertEqual(guesser.guess('..tt..'), 'e')
+        self.assertEqual(BUDGET_STATS.guesses, 2)
+        self.assertEqual(BUDGET_STATS.fallbacks, 2)
+        self.assertEqual(BUDGET_STATS.partial, 0)
+
+    def test_fallback_skips_letters_absent_from_candidates(self):
+        guesser = VectorizedFrequentLetterGuesser(6, self.words)
+        guesser.update_state({'e': []}, '......')
+        self.assertEqual(guesser.potential_words, ['rabbit'])
+        guesser.update_state({'t': [5]}, '.....t')
+        # a ranks below e, l and t, all absent or guessed
+        self.assertEqual(guesser._select_fallback_letter(), 'a')
+
+    def test_guess_counts_chunks_until_deadline(self):
+        for guesser_class in (FrequentLetterGuesser, VectorizedFrequentLetterGuesser):
+            guesser = guesser_class(6, ['rabbit', 'latter', 'kettle', 'poodle'])
+            guesser.update_state({'d': []}, '......')
+            guesser.time_budget = 1
+            with mock.patch.object(probability, 'BUDGET_CHUNK_SIZE', 1), \
+                    mock.patch.object(guesser, '_out_of_time', side_effect=[False, True]):
+                # Only rabbit is counted
+                self.assertEqual(guesser.guess('......'), 'b')
+        self.assertEqual(BUDGET_STATS.partial, 2)
+        self.assertEqual(BUDGET_STATS.fallbacks, 0)
+
+    def test_guess_uses_bucket_letter_counts_before_narrowing(self):
+        guesser = VectorizedFrequentLetterGuesser(6, ['rabbit', 'latter', 'kettle'])
+        guesser.time_budget = 0
+        with mock.patch.object(probability, 'count_candidate_letters') as mock_count:
+            self.assertEqual(guesser.guess('......'), 't')
+        mock_count.assert_not_called()
+        self.assertEqual(BUDGET_STATS.fallbacks, 0)
+
+    def test_guess_counts_all_candidates_within_budget(self):
+        guesser = VectorizedFrequentLetterGuesser(6, ['rabbit', 'latter', 'kettle'])
+        guesser.time_budget = 60
+        self.assertEqual(guesser.guess('......'), 't')
+        self.assertEqual(BUDGET_STATS.guesses, 1)
+        self.assertEqual(BUDGET_STATS.partial, 0)
@@ -0,0 +1,78 @@
+from unittest import mock, TestCase
+
+from guessers import registry
+from guessers.naive import OrderedRandomGuesser, RandomGuesser
+from guessers.registry import GuesserRegistry, load_guesser
+
+
+class LoadGuesserTestCase(TestCase):
+    def test_load_guesser_imports_class(self):
+        self.assertIs(load_guesser('guessers.naive:RandomGuesser'), RandomGuesser)
+
+    def test_load_guesser_rejects_invalid_paths(self):
+        for path in ('guessers.naive.RandomGuesser', ':RandomGuesser', 'guessers.naive:'):
+            with self.assertRaises(ValueError) as cm:
+                load_guesser(path)
+            self.assertEqual(str(cm.exception), 'invalid guesser path {}'.format(path))
+
+
+class GuesserRegistryTestCase(TestCase):
+    def setUp(self):
+        self.registry = GuesserRegistry(
+            [
+                ('random', 'guessers.naive:RandomGuesser'),
+                ('ordered-random', OrderedRandomGuesser),
+            ],
+            entry_point_group=None,
+        )
+
+    def test_getitem_imports_guesser_once(self):
+        with mock.patch.object(registry, 'load_guesser', wraps=load_guesser) as mock_load:
+            self.assertIs(self.registry['random'], RandomGuesser)
+            self.assertIs(self.registry['random'], RandomGuesser)
+            self.assertIs(self.registry['ordered-random'], OrderedRandomGuesser)
+        mock_load.assert_called_once_with('guessers.naive:RandomGuesser')
+
+    def test_getitem_loads_unregistered_dotted_paths(self):
+        self.assertIs(self.registry['guessers.naive:RandomGuesser'], RandomGuesser)
+        self.assertNotIn('guessers.naive:RandomGuesser', self.registry)
+
+    def test_getitem_raises_error_on_unknown_names(self):
+        with self.assertRaises(KeyError):
+            self.registry['psychic']
+        self.assertIsNone(self.registry.get('psychic'))
+
+    def test_listing_does_not_import_guessers(self):
+        with mock.patch.object(registry, 'load_guesser') as mock_load:
+            self.assertEqual(list(self.registry), ['random', 'ordered-random'])
+            self.assertEqual(len(self.registry), 2)
+            self.assertIn('random', self.registry)
+            self.assertEqual(self.registry.path('random'), 'guessers.naive:RandomGuesser')
+            self.assertEqual(
+                self.registry.path('ordered-random'),
+                'guessers.naive:OrderedRandomGuesser'
+            )
+        mock_load.assert_not_called()
+
+    def test_setitem_replaces_guesser(self):
+        self.registry['random'] = OrderedRandomGuesser
+        self.assertIs(self.registry['random'], OrderedRandomGuesser)
+
+    def test_entry_points_are_registered_after_given_guessers(self):
+        entry_point = mock.Mock(value='guessers.naive:OrderedRandomGuesser')
+        entry_point.name = 'plugin'
+        shadowing_entry_point = mock.Mock(value='guessers.naive:OrderedRandomGuesser')
+        shadowing_entry_point.name = 'random'
+        guessers = GuesserRegistry([('random', 'guessers.naive:RandomGuesser')])
+        with mock.patch.object(
+            registry,
+            '_entry_points',
+            return_value=[entry_point, shadowing_entry_point]
+        ) as mock_entry_points:
+            self.assertIs(guessers['random'], RandomGuesser)
+            mock_entry_points.assert_not_called()
+
+            self.assertEqual(list(guessers), ['random', 'plugin'])
+            self.assertIs(guessers['plugin'], OrderedRandomGuesser)
+            self.assertIs(guessers['random'], RandomGuesser)
+        mock_entry_points.assert_called_once_with(registry.ENTRY_POINT_GROUP)
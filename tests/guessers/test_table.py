@@ -0,0 +1,160 @@
+import os
+import tempfile
+from unittest import mock, TestCase
+
+from game import WordGuess
+from guessers import table
+from guessers.table import (
+    TABLE_CACHE,
+    TableGuesser,
+    best_letter,
+    build_table,
+    load_table,
+    save_table,
+    state_key,
+)
+from index import WordBucket, WordIndex
+from simulation import play_game
+
+
+class StateKeyTestCase(TestCase):
+    def test_combines_pattern_and_sorted_incorrect_guesses(self):
+        self.assertEqual(state_key('.a..', {'z', 'e'}), '.a..:ez')
+        self.assertEqual(state_key('....', set()), '....:')
+
+
+class BestLetterTestCase(TestCase):
+    def setUp(self):
+        self.bucket = WordBucket(4, ['bark', 'bank', 'dark', 'dank', 'tank'])
+
+    def test_maximizes_information(self):
+        code = best_letter(self.bucket.matrix, set(), len(self.bucket.alphabet))
+        self.assertEqual(self.bucket.alphabet[code], 'b')
+
+    def test_minimizes_misses(self):
+        code = best_letter(
+            self.bucket.matrix,
+            set(),
+            len(self.bucket.alphabet),
+            criterion='misses'
+        )
+        self.assertEqual(self.bucket.alphabet[code], 'a')
+
+    def test_skips_guessed_letters(self):
+        codes = self.bucket.codes
+        code = best_letter(
+            self.bucket.matrix,
+            {codes['a'], codes['k'], codes['b'], codes['d']},
+            len(self.bucket.alphabet),
+        )
+        self.assertEqual(self.bucket.alphabet[code], 'n')
+
+        self.assertIsNone(
+            best_letter(
+                self.bucket.matrix[:1],
+                {codes[letter] for letter in 'bark'},
+                len(self.bucket.alphabet),
+            )
+        )
+
+
+class BuildTableTestCase(TestCase):
+    words = ['bark', 'bank', 'dark', 'dank', 'tank', 'limn', 'zeitgeist']
+
+    def test_records_best_guess_per_reachable_state(self):
+        decisions = build_table(WordIndex(self.words), lengths=[4])
+        self.assertEqual(
+            decisions,
+            {
+                '....:': 'n',
+                '...n:': 'limn',
+                '..n.:': 'b',
+                'b.n.:': 'bank',
+                '..n.:b': 'd',
+                'd.n.:b': 'dank',
+                '..n.:bd': 'tank',
+                '....:n': 'b',
+                'b...:n': 'bark',
+                '....:bn': 'dark',
+            }
+        )
+
+    def test_covers_all_lengths_by_default(self):
+        decisions = build_table(WordIndex(self.words))
+        self.assertEqual(decisions['.........:'], 'zeitgeist')
+
+    def test_stops_at_max_failures(self):
+        decisions = build_table(WordIndex(self.words), max_failures=1, lengths=[4])
+        self.assertNotIn('....:n', decisions)
+
+    def test_guides_games_to_victory(self):
+        word_index = WordIndex(self.words)
+        with mock.patch.object(TableGuesser, 'table_path', 'bark.json.gz'):
+            with mock.patch.object(
+                table,
+                'load_table',
+                return_value=build_table(word_index)
+            ):
+                TABLE_CACHE.clear()
+                for word in self.words:
+                    result = play_game(TableGuesser, word, word_index, 8)
+                    self.assertTrue(result.has_won)
+        TABLE_CACHE.clear()
+
+
+class SaveTableTestCase(TestCase):
+    def test_round_trips_table(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'table.json.gz')
+            save_table({'....:': 'e', '.e..:a': 'bear'}, path, max_failures=8)
+            self.assertEqual(load_table(path), {'....:': 'e', '.e..:a': 'bear'})
+
+
+class TableGuesserTestCase(TestCase):
+    def setUp(self):
+        TABLE_CACHE.clear()
+        self.addCleanup(TABLE_CACHE.clear)
+
+    def test_init_loads_table_once(self):
+        with mock.patch.object(TableGuesser, 'table_path', 'table.json.gz'):
+            with mock.patch.object(
+                table,
+                'load_table',
+                return_value={'....:': 'a'}
+            ) as mock_load:
+                guesser = TableGuesser(4, ['bark'])
+                other_guesser = TableGuesser(4, ['bark'])
+
+        mock_load.assert_called_once_with('table.json.gz')
+        self.assertIs(guesser.table, other_guesser.table)
+
+    def test_guess_looks_up_state(self):
+        guesser = TableGuesser(4, ['bark'])
+        guesser.table = {'....:': 'a', '.a..:e': 'r'}
+        self.assertEqual(guesser.guess('....'), 'a')
+
+        guesser.update_state({'e': []}, '....')
+        guesser.update_state({'a': [1]}, '.a..')
+        self.assertEqual(guesser.incorrect_guesses, {'e'})
+        self.assertEqual(guesser.guess('.a..'), 'r')
+        self.assertIsNone(guesser.fallback)
+
+    def test_guess_falls_back_on_unknown_states(self):
+        guesser = TableGuesser(4, ['bark', 'dank', 'tank'])
+        guesser.table = {'....:': 'a'}
+        guesser.update_state({'a': [1]}, '.a..')
+        guesser.update_state({'t': []}, '.a..')
+
+        guess = guesser.guess('.a..')
+        self.assertIsNotNone(guesser.fallback)
+        self.assertEqual(guesser.fallback.potential_words, ['bark', 'dank'])
+        self.assertEqual(guess, 'k')
+
+        guesser.update_state({'k': [3], 'r': []}, '.a.k')
+        self.assertEqual(guesser.guess('.a.k'), 'dank')
+
+    def test_guess_marks_words_from_table(self):
+        guesser = TableGuesser(4, ['bark'])
+        guesser.table = {'....:': 'bark', '.a..:': 'r'}
+        self.assertIsInstance(guesser.guess('....'), WordGuess)
+        self.assertNotIsInstance(guesser.guess('.a..'), WordGuess)
@@ -0,0 +1,80 @@
+import os
+import tempfile
+from unittest import TestCase
+
+from corpus import (
+    is_weighted,
+    normalize_word,
+    read_weighted_words,
+    read_words,
+    stream_weighted_words,
+    stream_words,
+)
+
+
+class NormalizeWordTestCase(TestCase):
+    def test_lowercases_and_strips_accents(self):
+        self.assertEqual(normalize_word('Café'), 'cafe')
+        self.assertEqual(normalize_word('NAÏVE'), 'naive')
+        self.assertEqual(normalize_word("o'clock"), "o'clock")
+
+
+class StreamWordsTestCase(TestCase):
+    def test_yields_lazily(self):
+        lines = iter(['foo bar\n', 'baz\n'])
+        words = stream_words(lines)
+        self.assertEqual(next(words), 'foo')
+        self.assertEqual(next(lines), 'baz\n')
+
+    def test_normalizes_and_deduplicates(self):
+        self.assertEqual(
+            list(stream_words(['Foo foo\n', 'CAFÉ café\n', 'bar\tFOO\n'])),
+            ['foo', 'cafe', 'bar']
+        )
+
+    def test_filters_to_alphabet(self):
+        self.assertEqual(
+            list(stream_words(["don't\n", 'x-ray\n', 'r2d2\n', 'ok\n'])),
+            ['ok']
+        )
+        self.assertEqual(list(stream_words(['abc\n', 'cab\n', 'cad\n'], 'abc')), ['abc', 'cab'])
+
+
+class StreamWeightedWordsTestCase(TestCase):
+    def test_parses_counts(self):
+        lines = ['the\t100\n', 'The\t5\n', 'café\t3\n', "isn't\t2\n", 'lone\n']
+        self.assertEqual(
+            list(stream_weighted_words(lines)),
+            [('the', 100), ('cafe', 3), ('lone', 1)]
+        )
+
+    def test_skips_malformed_counts(self):
+        lines = [
+            'word\tcount\n',
+            'hoax\t2.5\n',
+            'lull\t3\textra\n',
+            'limn\t-4\n',
+            'hoax\t12\n',
+            'rabbit\t 7 \n',
+        ]
+        self.assertEqual(list(stream_weighted_words(lines)), [('hoax', 12), ('rabbit', 7)])
+
+
+class ReadWordsTestCase(TestCase):
+    def test_reads_utf8_file(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        path = os.path.join(directory.name, 'words')
+        with open(path, 'w', encoding='utf-8') as word_file:
+            word_file.write('Éclair\nhoax\nhoax\n')
+        self.assertEqual(list(read_words(path)), ['eclair', 'hoax'])
+        self.assertFalse(is_weighted(path))
+
+    def test_reads_weighted_file(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        path = os.path.join(directory.name, 'words')
+        with open(path, 'w', encoding='utf-8') as word_file:
+            word_file.write('\nhoax\t12\nlull\t3\n')
+        self.assertTrue(is_weighted(path))
+        self.assertEqual(list(read_weighted_words(path)), [('hoax', 12), ('lull', 3)])
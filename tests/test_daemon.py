@@ -0,0 +1,127 @@
+import asyncio
+import json
+import os
+import tempfile
+from unittest import TestCase
+
+import run
+from daemon import EvaluationDaemon, JobError, parse_job
+from index import WordIndex
+from simulation import sample_targets, simulate_parallel, start_pool
+
+
+class ParseJobTestCase(TestCase):
+    def test_parse_job_fills_defaults(self):
+        job = parse_job('{"guessers": ["frequent"], "games": 10}')
+        self.assertEqual(job, {
+            'guessers': ['frequent'],
+            'games': 10,
+            'count': 8,
+            'seed': None,
+            'sweep': False,
+            'lockstep': False,
+            'adversarial': False,
+            'word_penalty': 1,
+            'instrument': False,
+        })
+
+    def test_parse_job_defaults_to_all_guessers_but_manual(self):
+        job = parse_job(b'{}')
+        self.assertEqual(
+            job['guessers'],
+            [name for name in run.GUESSERS if name != 'manual'],
+        )
+
+    def test_parse_job_rejects_invalid_jobs(self):
+        for line, message in [
+            ('games', 'jobs must be JSON objects'),
+            ('[1]', 'jobs must be JSON objects'),
+            ('{"games": 1, "speed": 2}', 'unknown keys speed'),
+            ('{"guessers": "frequent"}', 'guessers must be a list of names'),
+            ('{"guessers": [["frequent"]]}', 'guessers must be a list of names'),
+            ('{"guessers": [1]}', 'guessers must be a list of names'),
+            ('{"guessers": ["manual"]}', 'unknown guesser manual'),
+            ('{"guessers": ["guessers.naive:RandomGuesser"]}',
+             'unknown guesser guessers.naive:RandomGuesser'),
+            ('{"games": 0}', 'games must be a positive integer'),
+            ('{"count": true}', 'count must be a positive integer'),
+            ('{"word_penalty": -1}', 'word_penalty must be a non-negative integer'),
+            ('{"seed": "1"}', 'seed must be an integer'),
+            ('{"sweep": 1}', 'sweep must be true or false'),
+        ]:
+            with self.assertRaises(JobError) as cm:
+                parse_job(line)
+            self.assertEqual(str(cm.exception), message)
+
+
+class EvaluationDaemonTestCase(TestCase):
+    words = ['hangman', 'gallows', 'noose', 'rope', 'scaffold', 'trapdoor']
+
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+        self.addCleanup(self.loop.close)
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, 'daemon.sock')
+
+        self.word_index = WordIndex(self.words)
+        pool = start_pool(self.word_index, processes=1)
+        self.addCleanup(pool.terminate)
+        self.daemon = EvaluationDaemon(self.word_index, pool)
+        self.addCleanup(self.daemon.executor.shutdown)
+        listener = self.loop.run_until_complete(self.daemon.start(self.path))
+        self.addCleanup(self.loop.run_until_complete, listener.wait_closed())
+        self.addCleanup(listener.close)
+
+    def submit(self, job):
+        return self.loop.run_until_complete(
+            self.loop.run_in_executor(None, run.submit_job, self.path, job)
+        )
+
+    def test_jobs_are_played_on_the_pool(self):
+        reply = self.submit({'guessers': ['frequent', 'random'], 'games': 20, 'seed': 3})
+        expected = simulate_parallel(
+            [run.GUESSERS['frequent'], run.GUESSERS['random']],
+            self.word_index,
+            sample_targets(self.word_index, 20, 3),
+            seed=3,
+            processes=1,
+        )
+        self.assertEqual(
+            [result['guesser'] for result in reply['results']],
+            ['frequent', 'random'],
+        )
+        for result, expected_result in zip(reply['results'], expected):
+            self.assertEqual(result['game_count'], 20)
+            self.assertEqual(result['win_rate'], expected_result.win_rate)
+            self.assertEqual(result['mean_guess_count'], expected_result.mean_guess_count)
+            self.assertIsNone(result['instrumentation'])
+
+        self.submit({'guessers': ['frequent'], 'sweep': True})
+        self.assertEqual(self.daemon.job_count, 2)
+
+    def test_instrumented_jobs_report_measurements(self):
+        reply = self.submit(
+            {'guessers': ['frequent-vectorized'], 'games': 5, 'instrument': True}
+        )
+        result, = reply['results']
+        self.assertEqual(result['instrumentation']['phases']['construct']['calls'], 5)
+        self.assertIn('construct: 5 calls', result['summary'])
+
+    def test_invalid_jobs_get_errors(self):
+        reply = self.submit({'guessers': ['nobody']})
+        self.assertEqual(reply, {'error': 'unknown guesser nobody'})
+        reply = self.submit({'guessers': [['frequent']]})
+        self.assertEqual(reply, {'error': 'guessers must be a list of names'})
+
+        async def send_garbage():
+            reader, writer = await asyncio.open_unix_connection(self.path)
+            writer.write(b'garbage\n')
+            reply = await reader.readline()
+            writer.close()
+            return json.loads(reply.decode('utf-8'))
+
+        self.assertEqual(
+            self.loop.run_until_complete(send_garbage()),
+            {'error': 'jobs must be JSON objects'},
+        )
@@ -0,0 +1,53 @@
+import os
+import tempfile
+from unittest import TestCase
+
+from dictfile import MAGIC, compile_dict, is_compiled, load_dict
+from index import WordIndex
+
+
+class DictFileTestCase(TestCase):
+    def setUp(self):
+        self.words = ['quixotic', 'neurotic', 'hypnotic', 'hoax', 'aberration', 'lull', 'café']
+        self.index = WordIndex(self.words)
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, 'words.dict')
+
+    def test_compile_dict_writes_magic(self):
+        compile_dict(self.index, self.path)
+        with open(self.path, 'rb') as dict_file:
+            self.assertEqual(dict_file.read(len(MAGIC)), MAGIC)
+        self.assertTrue(is_compiled(self.path))
+
+    def test_is_compiled_rejects_word_lists(self):
+        with open(self.path, 'w') as word_file:
+            word_file.write('\n'.join(self.words))
+        self.assertFalse(is_compiled(self.path))
+        with self.assertRaises(ValueError):
+            load_dict(self.path)
+
+    def test_load_dict_round_trips_buckets(self):
+        compile_dict(self.index, self.path)
+        loaded = load_dict(self.path)
+        self.assertEqual(loaded.lengths, self.index.lengths)
+        self.assertEqual(list(loaded), list(self.index))
+        for length in self.index.lengths:
+            bucket, loaded_bucket = self.index.bucket(length), loaded.bucket(length)
+            self.assertEqual(loaded_bucket.alphabet, bucket.alphabet)
+            self.assertEqual(loaded_bucket.matrix.tolist(), bucket.matrix.tolist())
+            self.assertEqual(loaded_bucket.digest, bucket.digest)
+
+    def test_load_dict_round_trips_weights(self):
+        index = WordIndex.from_weighted([('hoax', 3), ('quixotic', 2), ('lull', 5)])
+        compile_dict(index, self.path)
+        loaded = load_dict(self.path)
+        self.assertEqual(loaded.weights, [3, 5, 2])
+        self.assertEqual(loaded.bucket(8).digest, index.bucket(8).digest)
+        self.assertIsNone(WordIndex(['hoax']).weights)
+
+    def test_loaded_dict_matches_patterns(self):
+        compile_dict(self.index, self.path)
+        loaded = load_dict(self.path)
+        self.assertEqual(loaded.match('.....tic'), ['neurotic', 'hypnotic'])
+        self.assertEqual(loaded.match('ca..'), ['café'])
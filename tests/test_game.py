@@ -1,6 +1,8 @@
-from unittest import TestCase
+from unittest import mock, TestCase
 
-from game import CheaterError, Game
+import game as game_module
+from game import AdversarialGame, CheaterError, Game, WordGuess
+from index import WordIndex
 
 
 class CheaterErrorTestCase(TestCase):
@@ -20,56 +22,58 @@ class GameTestCase(TestCase):
         game = Game('sisyphean')
         self.assertEqual(game.word, '.........')
 
-        game.correct_guesses.update('sea')
+        game.process_guess('sea')
         self.assertEqual(game.word, 's.s...ea.')
 
-        game.correct_guesses.update('sisyphean')
+        game.process_guess('xz')
+        self.assertEqual(game.word, 's.s...ea.')
+
+        game.process_guess('sisyphean')
         self.assertEqual(game.word, 'sisyphean')
 
     def test_failure_count_calculates_bad_guess_length(self):
         game = Game('sybaritic', max_failures=10)
         self.assertEqual(game.failure_count, 0)
 
-        game.correct_guesses.update('syb')
-        game.incorrect_guesses.update('xzhj')
+        game.process_guess('syb')
+        game.process_guess('xzhj')
         self.assertEqual(game.failure_count, 4)
 
     def test_remaining_guess_count_tracks_guesses(self):
         game = Game('ebullient', max_failures=10)
         self.assertEqual(game.remaining_guess_count, 10)
 
-        game.correct_guesses.update('ebul')
-        game.incorrect_guesses.update('aoy')
+        game.process_guess('ebul')
+        game.process_guess('aoy')
         self.assertEqual(game.remaining_guess_count, 7)
 
-        game.correct_guesses.update('nt')
-        game.incorrect_guesses.update('cdfghjk')
+        game.process_guess('nt')
+        game.process_guess('cdfghjk')
         self.assertEqual(game.remaining_guess_count, 0)
 
     def test_is_game_over_reflects_wins_and_losses(self):
         game = Game('zeitgeist', max_failures=10)
         self.assertFalse(game.is_game_over)
-        game.correct_guesses.update('zeitgeist')
+        game.process_guess('zeitgs')
         self.assertTrue(game.is_game_over)
 
         game = Game('zeitgeist', max_failures=10)
-        game.incorrect_guesses.update('abcdfhjklm')
+        game.process_guess('abcdfhjklm')
         self.assertTrue(game.is_game_over)
 
     def test_has_won_reflects_complete_correct_guesses(self):
         game = Game('stochastic')
         self.assertFalse(game.has_won)
 
-        game.correct_guesses.update('stoch')
+        game.process_guess('stoch')
         self.assertFalse(game.has_won)
 
-        game.correct_guesses.update('astic')
+        game.process_guess('astic')
         self.assertTrue(game.has_won)
 
     def test_process_guess_ignores_resubmissions(self):
         game = Game('stygian', max_failures=2)
-        game.correct_guesses.update('ai')
-        game.incorrect_guesses.update('eo')
+        game.process_guess('aieo')
 
         try:
             game.process_guess('aieo')
@@ -93,10 +97,151 @@ class GameTestCase(TestCase):
         self.assertEqual(game.correct_guesses, {'a', 'e', 'i'})
         self.assertEqual(game.incorrect_guesses, {'o', 'u'})
 
-    def test_process_guess_returns_letter_correctness(self):
+    def test_process_guess_returns_letter_positions(self):
         game = Game('reactionary')
         letters = game.process_guess('aeiou')
         self.assertEqual(
             letters,
-            {'a': True, 'e': True, 'i': True, 'o': True, 'u': False}
+            {'a': [2, 8], 'e': [1], 'i': [5], 'o': [6], 'u': []}
+        )
+        self.assertEqual(game.process_guess('ar'), {'r': [0, 9]})
+
+    def test_slots_prevent_stray_attributes(self):
+        game = Game('reactionary')
+        with self.assertRaises(AttributeError):
+            game.guesses = set()
+
+
+class WordGuessTestCase(TestCase):
+    def test_right_word_reveals_remaining_letters_at_once(self):
+        game = Game('hangman')
+        game.process_guess('a')
+        self.assertEqual(
+            game.process_guess(WordGuess('hangman')),
+            {'h': [0], 'n': [2, 6], 'g': [3], 'm': [4]}
+        )
+        self.assertEqual(game.word, 'hangman')
+        self.assertEqual(game.correct_guesses, set('hangm'))
+        self.assertTrue(game.has_won)
+        self.assertEqual(game.process_guess(WordGuess('hangman')), {})
+
+    def test_wrong_word_costs_word_penalty(self):
+        game = Game('hangman', max_failures=8, word_penalty=3)
+        self.assertEqual(game.process_guess(WordGuess('hangmen')), {'hangmen': []})
+        self.assertEqual(game.word, '.......')
+        self.assertEqual(game.failure_count, 3)
+        self.assertEqual(game.remaining_guess_count, 5)
+        self.assertIn('hangmen', game.incorrect_guesses)
+
+        # Repeating a wrong word costs nothing
+        self.assertEqual(game.process_guess(WordGuess('hangmen')), {})
+        self.assertEqual(game.failure_count, 3)
+
+    def test_word_is_not_processed_as_letters(self):
+        game = Game('hangman', max_failures=2)
+        game.process_guess(WordGuess('zzzzzzz'))
+        self.assertEqual(game.incorrect_guesses, {'zzzzzzz'})
+        self.assertNotIn('z', game.incorrect_guesses)
+
+    def test_wrong_words_can_lose_game(self):
+        game = Game('hangman', max_failures=2, word_penalty=2)
+        game.process_guess(WordGuess('hangmen'))
+        self.assertTrue(game.is_game_over)
+        self.assertFalse(game.has_won)
+        with self.assertRaises(CheaterError):
+            game.process_guess(WordGuess('hangman'))
+
+    def test_letters_are_processed_as_a_batch(self):
+        game = Game('hangman')
+        self.assertEqual(
+            game.process_guess('anx'),
+            {'a': [1, 5], 'n': [2, 6], 'x': []}
         )
+        self.assertEqual(game.word, '.an..an')
+        self.assertEqual(game.failure_count, 1)
+
+
+class AdversarialGameTestCase(TestCase):
+    words = ['bad', 'bed', 'bid', 'bod', 'ace', 'hangman']
+
+    def test_init_keeps_all_words_of_length(self):
+        game = AdversarialGame(self.words, 3, 5)
+        self.assertEqual(game.candidate_count, 5)
+        self.assertEqual(game.max_failures, 5)
+        self.assertEqual(game.word, '...')
+        self.assertFalse(game.is_game_over)
+
+    def test_init_requires_words_of_length(self):
+        with self.assertRaises(ValueError):
+            AdversarialGame(self.words, 4)
+
+    def test_process_guess_keeps_largest_class(self):
+        game = AdversarialGame(WordIndex(self.words), 3)
+        # Missing a keeps bed, bid and bod, rather than bad or ace
+        self.assertEqual(game.process_guess('a'), {'a': []})
+        self.assertEqual(game.candidate_count, 3)
+        self.assertEqual(game.process_guess('d'), {'d': [2]})
+        self.assertEqual(game.word, '..d')
+        self.assertEqual(game.process_guess('b'), {'b': [0]})
+        self.assertEqual(game.word, 'b.d')
+
+    def test_process_guess_breaks_ties_by_revealing_least(self):
+        game = AdversarialGame(['aa', 'ab', 'bc'], 2)
+        self.assertEqual(game.process_guess('a'), {'a': []})
+        self.assertEqual(game.solution, 'bc')
+
+        game = AdversarialGame(['ba', 'ab'], 2)
+        self.assertEqual(game.process_guess('a'), {'a': [0]})
+        self.assertEqual(game.solution, 'ab')
+
+    def test_process_guess_misses_unknown_letters(self):
+        game = AdversarialGame(self.words, 3)
+        self.assertEqual(game.process_guess('z'), {'z': []})
+        self.assertEqual(game.candidate_count, 5)
+
+    def test_game_is_won_once_all_positions_revealed(self):
+        game = AdversarialGame(self.words, 3)
+        game.process_guess('aoeidb')
+        self.assertEqual(game.word, 'bid')
+        self.assertTrue(game.has_won)
+        self.assertTrue(game.is_game_over)
+        self.assertEqual(game.solution, 'bid')
+
+    def test_process_guess_raises_error_after_max_failures(self):
+        game = AdversarialGame(self.words, 3, 2)
+        game.process_guess('az')
+        self.assertTrue(game.is_game_over)
+        self.assertFalse(game.has_won)
+        with self.assertRaises(CheaterError):
+            game.process_guess('x')
+
+    def test_long_words_match_dense_classes(self):
+        words = ['bandanna', 'cassandra', 'banana', 'ananas', 'canasta', 'savanna']
+        for word_length in (6, 7, 8):
+            dense_game = AdversarialGame(words, word_length)
+            with mock.patch.object(game_module, 'MAX_DENSE_LENGTH', 0):
+                sparse_game = AdversarialGame(words, word_length)
+                for letter in 'ansbc':
+                    self.assertEqual(
+                        sparse_game.process_guess(letter),
+                        dense_game.process_guess(letter),
+                    )
+            self.assertEqual(sparse_game.solution, dense_game.solution)
+
+    def test_word_guess_is_refused_while_other_candidates_remain(self):
+        game = AdversarialGame(self.words, 3, word_penalty=2)
+        self.assertEqual(game.process_guess(WordGuess('bad')), {'bad': []})
+        self.assertEqual(game.candidate_count, 4)
+        self.assertEqual(game.failure_count, 2)
+
+        game.process_guess('aoeib')
+        self.assertEqual(game.candidate_count, 1)
+        self.assertEqual(game.process_guess(WordGuess('bud')), {'bud': []})
+        self.assertEqual(game.process_guess(WordGuess('bid')), {'d': [2]})
+        self.assertTrue(game.has_won)
+        self.assertEqual(game.word, 'bid')
+
+    def test_word_guess_accepts_duplicate_candidates(self):
+        game = AdversarialGame(['bad', 'bad'], 3)
+        self.assertEqual(game.process_guess(WordGuess('bad')), {'b': [0], 'a': [1], 'd': [2]})
+        self.assertTrue(game.has_won)
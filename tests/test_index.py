@@ -0,0 +1,226 @@
+import sys
+import threading
+from unittest import TestCase
+
+from index import CandidateSet, WordBucket, WordIndex, _bitset, _set_bits
+
+
+class BitsetTestCase(TestCase):
+    def test_bitset_sets_given_bits(self):
+        flags = [index in (0, 3, 9) for index in range(10)]
+        self.assertEqual(_bitset(flags), 0b1000001001)
+        self.assertEqual(_bitset([False] * 10), 0)
+
+    def test_set_bits_yields_indices_in_order(self):
+        self.assertEqual(list(_set_bits(0b1000001001)), [0, 3, 9])
+        self.assertEqual(list(_set_bits(0)), [])
+
+
+class WordBucketTestCase(TestCase):
+    def setUp(self):
+        self.bucket = WordBucket(5, ['peeve', 'reave', 'lease', 'zesty'])
+
+    def test_init_sets_attributes(self):
+        self.assertEqual(self.bucket.length, 5)
+        self.assertEqual(len(self.bucket), 4)
+        self.assertEqual(self.bucket.full_mask, 0b1111)
+
+    def test_digest_identifies_words(self):
+        self.assertEqual(
+            self.bucket.digest,
+            WordBucket(5, ['peeve', 'reave', 'lease', 'zesty']).digest
+        )
+        self.assertNotEqual(
+            self.bucket.digest,
+            WordBucket(5, ['peeve', 'reave', 'lease']).digest
+        )
+
+    def test_positions_map_letters_to_words(self):
+        self.assertEqual(len(self.bucket.positions), 5)
+        self.assertEqual(self.bucket.positions[0]['p'], 0b0001)
+        self.assertEqual(self.bucket.positions[1]['e'], 0b1111)
+        self.assertEqual(self.bucket.positions[4]['e'], 0b0111)
+        self.assertNotIn('x', self.bucket.positions[2])
+
+    def test_letters_map_letters_to_words(self):
+        self.assertEqual(self.bucket.letters['e'], 0b1111)
+        self.assertEqual(self.bucket.letters['a'], 0b0110)
+        self.assertEqual(self.bucket.letters['z'], 0b1000)
+
+    def test_prepare_builds_bitsets(self):
+        bucket = WordBucket(5, ['peeve', 'reave', 'lease', 'zesty'])
+        bucket.prepare()
+        self.assertIsNotNone(bucket._positions)
+        self.assertIsNotNone(bucket._letters)
+        self.assertIsNotNone(bucket._presence)
+
+    def test_positions_are_complete_across_threads(self):
+        # Words ending in 'a', and some without it
+        alphabet = 'bcdefghijklm'
+        words = [alphabet[index:] + alphabet[:index - 1] + 'a' for index in range(1, 12)]
+        words.extend(alphabet[index:] + alphabet[:index] for index in range(12))
+        switch_interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+        self.addCleanup(sys.setswitchinterval, switch_interval)
+        for _ in range(10):
+            bucket = WordBucket(12, words)
+            bucket.presence
+            barrier = threading.Barrier(8)
+            masks = []
+
+            def narrow():
+                candidates = CandidateSet(bucket)
+                barrier.wait()
+                candidates.narrow('a', [11])
+                masks.append(candidates.mask)
+
+            threads = [threading.Thread(target=narrow) for _ in range(8)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            self.assertEqual(masks, [(1 << 11) - 1] * 8)
+
+    def test_letter_counts_count_occurrences(self):
+        counts = dict(zip(self.bucket.alphabet, self.bucket.letter_counts))
+        self.assertEqual(counts['e'], 8)
+        self.assertEqual(counts['a'], 2)
+        self.assertEqual(counts['z'], 1)
+
+    def test_word_counts_count_words_containing_letters(self):
+        counts = dict(zip(self.bucket.alphabet, self.bucket.word_counts))
+        self.assertEqual(counts['e'], 4)
+        self.assertEqual(counts['a'], 2)
+        self.assertEqual(counts['z'], 1)
+
+    def test_letter_order_ranks_letters_by_word_count(self):
+        self.assertEqual(self.bucket.letter_order, list('easvlprtyz'))
+
+    def test_letter_order_weighs_words(self):
+        bucket = WordIndex.from_weighted([('bat', 5), ('cot', 1), ('cut', 1)]).bucket(3)
+        self.assertEqual(bucket.letter_order, list('tabcou'))
+
+    def test_match_mask_intersects_revealed_and_absent_letters(self):
+        self.assertEqual(self.bucket.match_mask('.....'), 0b1111)
+        self.assertEqual(self.bucket.match_mask('.e..e'), 0b0110)
+        self.assertEqual(self.bucket.match_mask('.e..e', {'a'}), 0)
+        self.assertEqual(self.bucket.match_mask('.ee.e'), 0b0001)
+        self.assertEqual(self.bucket.match_mask('x....'), 0)
+
+    def test_selector_converts_bitsets(self):
+        self.assertEqual(
+            self.bucket.selector(0b0101).tolist(),
+            [True, False, True, False]
+        )
+
+    def test_select_returns_masked_words(self):
+        self.assertEqual(self.bucket.select(0b0101), ['peeve', 'lease'])
+        self.assertIs(self.bucket.select(self.bucket.full_mask), self.bucket.words)
+
+    def test_bucket_from_matrix_decodes_words(self):
+        bucket = WordBucket(5, alphabet=self.bucket.alphabet, matrix=self.bucket.matrix)
+        self.assertEqual(len(bucket), 4)
+        self.assertEqual(bucket.select(0b0101), ['peeve', 'lease'])
+        self.assertEqual(bucket.words, ['peeve', 'reave', 'lease', 'zesty'])
+        self.assertEqual(bucket.positions, self.bucket.positions)
+        self.assertEqual(bucket.digest, self.bucket.digest)
+
+
+class WordIndexTestCase(TestCase):
+    def setUp(self):
+        self.index = WordIndex(
+            ['quixotic', 'neurotic', 'hypnotic', 'hoax', 'aberration', 'lull']
+        )
+
+    def test_iter_yields_all_words(self):
+        self.assertCountEqual(
+            list(self.index),
+            ['quixotic', 'neurotic', 'hypnotic', 'hoax', 'aberration', 'lull']
+        )
+        self.assertEqual(len(self.index), 6)
+
+    def test_lengths_lists_bucketed_lengths(self):
+        self.assertEqual(self.index.lengths, [4, 8, 10])
+
+    def test_from_weighted_stores_weights(self):
+        index = WordIndex.from_weighted([('hoax', 3), ('quixotic', 2), ('lull', 5)])
+        self.assertEqual(list(index), ['hoax', 'lull', 'quixotic'])
+        self.assertEqual(index.weights, [3, 5, 2])
+        self.assertEqual(index.bucket(4).weights.tolist(), [3, 5])
+        self.assertIsNone(self.index.weights)
+
+        candidates = index.candidates(4)
+        candidates.narrow('h', {0})
+        self.assertEqual(candidates.weights.tolist(), [3])
+        self.assertIsNone(self.index.candidates(4).weights)
+
+    def test_words_returns_bucket(self):
+        self.assertEqual(
+            self.index.words(8),
+            ['quixotic', 'neurotic', 'hypnotic']
+        )
+        self.assertEqual(self.index.words(3), [])
+
+    def test_match_returns_matching_words(self):
+        self.assertCountEqual(
+            self.index.match('....otic'),
+            ['neurotic', 'hypnotic']
+        )
+        self.assertEqual(self.index.match('....otic', {'y'}), ['neurotic'])
+        self.assertEqual(self.index.match('...'), [])
+
+    def test_candidates_starts_with_full_bucket(self):
+        candidates = self.index.candidates(8)
+        self.assertIsInstance(candidates, CandidateSet)
+        self.assertEqual(candidates.words, ['quixotic', 'neurotic', 'hypnotic'])
+
+
+class CandidateSetTestCase(TestCase):
+    def setUp(self):
+        self.bucket = WordBucket(6, ['latter', 'barrel', 'rabbit', 'tatter'])
+
+    def test_init_selects_full_bucket(self):
+        candidates = CandidateSet(self.bucket)
+        self.assertEqual(len(candidates), 4)
+        self.assertTrue(candidates)
+        self.assertIs(candidates.words, self.bucket.words)
+
+    def test_alphabet_extracts_remaining_letters(self):
+        candidates = CandidateSet(self.bucket, 0b0011)
+        self.assertEqual(candidates.alphabet, set('latterbl'))
+
+    def test_narrow_discards_absent_letters(self):
+        candidates = CandidateSet(self.bucket)
+        candidates.narrow('l', [])
+        self.assertEqual(candidates.words, ['rabbit', 'tatter'])
+
+    def test_narrow_requires_letter_at_exactly_the_revealed_positions(self):
+        candidates = CandidateSet(self.bucket)
+        candidates.narrow('t', [2, 3])
+        self.assertEqual(candidates.words, ['latter'])
+
+        candidates = CandidateSet(self.bucket)
+        candidates.narrow('r', [5])
+        self.assertEqual(candidates.words, ['latter', 'tatter'])
+
+    def test_exclude_discards_word(self):
+        candidates = CandidateSet(self.bucket)
+        candidates.exclude('barrel')
+        self.assertEqual(candidates.words, ['latter', 'rabbit', 'tatter'])
+        candidates.exclude('barrels')
+        candidates.exclude('bottle')
+        self.assertEqual(len(candidates), 3)
+
+    def test_narrow_can_empty_candidates(self):
+        candidates = CandidateSet(self.bucket)
+        candidates.narrow('a', [])
+        self.assertEqual(len(candidates), 0)
+        self.assertFalse(candidates)
+        self.assertEqual(candidates.words, [])
+
+    def test_copy_is_independent(self):
+        candidates = CandidateSet(self.bucket)
+        duplicate = candidates.copy()
+        duplicate.narrow('l', [])
+        self.assertEqual(len(candidates), 4)
+        self.assertEqual(len(duplicate), 2)
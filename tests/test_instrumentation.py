@@ -0,0 +1,57 @@
+import json
+import os
+import tempfile
+from unittest import TestCase
+
+from instrumentation import Instrumentation
+
+
+class InstrumentationTestCase(TestCase):
+    def setUp(self):
+        self.instrumentation = Instrumentation()
+        self.instrumentation.time('guess', 0.002)
+        self.instrumentation.time('guess', 0.004)
+        self.instrumentation.count('games')
+        self.instrumentation.observe('candidates', 10)
+        self.instrumentation.observe('candidates', 2)
+
+    def test_to_dict_summarizes_measurements(self):
+        self.assertEqual(
+            self.instrumentation.to_dict(),
+            {
+                'phases': {'guess': {'calls': 2, 'total_ms': 6.0, 'mean_ms': 3.0}},
+                'counters': {'games': 1},
+                'samples': {
+                    'candidates': {'count': 2, 'mean': 6.0, 'p50': 2, 'p90': 10, 'max': 10},
+                },
+            }
+        )
+
+    def test_merge_combines_measurements(self):
+        other = Instrumentation()
+        other.time('guess', 0.006)
+        other.time('update_state', 0.001)
+        other.count('games', 2)
+        other.observe('candidates', 1)
+
+        self.assertIs(self.instrumentation.merge(other), self.instrumentation)
+        self.assertEqual(self.instrumentation.calls['guess'], 3)
+        self.assertAlmostEqual(self.instrumentation.durations['guess'], 0.012)
+        self.assertEqual(self.instrumentation.calls['update_state'], 1)
+        self.assertEqual(self.instrumentation.counters['games'], 3)
+        self.assertEqual(self.instrumentation.samples['candidates'], [10, 2, 1])
+
+    def test_save_writes_json(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'stats.json')
+            self.instrumentation.save(path)
+            with open(path) as stats_file:
+                self.assertEqual(json.load(stats_file), self.instrumentation.to_dict())
+
+    def test_summary_lists_measurements(self):
+        self.assertEqual(
+            self.instrumentation.summary(),
+            '\tguess: 2 calls, 6.000ms total, 3.0000ms mean\n'
+            '\tgames: 1\n'
+            '\tcandidates: mean 6.0, p50 2, p90 10, max 10'
+        )
@@ -0,0 +1,86 @@
+from unittest import TestCase
+
+import guessers
+from index import WordIndex
+from lockstep import play_lockstep, supports_lockstep
+from simulation import play_game
+
+
+class SupportsLockstepTestCase(TestCase):
+    def test_accepts_frequent_letter_guessers(self):
+        self.assertTrue(supports_lockstep(guessers.FrequentLetterGuesser))
+        self.assertTrue(supports_lockstep(guessers.VectorizedFrequentLetterGuesser))
+
+    def test_rejects_other_strategies(self):
+        self.assertFalse(supports_lockstep(guessers.EntropyGuesser))
+        self.assertFalse(supports_lockstep(guessers.SingleStateMarkovGuesser))
+        self.assertFalse(supports_lockstep(guessers.RandomGuesser))
+
+    def test_rejects_guessers_under_a_time_budget(self):
+        guesser_class = type(
+            'BudgetedGuesser',
+            (guessers.FrequentLetterGuesser,),
+            {'time_budget': 0.1},
+        )
+        self.assertFalse(supports_lockstep(guesser_class))
+
+
+class PlayLockstepTestCase(TestCase):
+    words = [
+        'latter', 'barrel', 'rabbit', 'bottle', 'kettle', 'little', 'battle',
+        'hoax', 'lull', 'limn', 'loam', 'loan', 'lean', 'mean', 'moan',
+        'protean', 'sybaritic', 'toroidal', 'zeitgeist',
+    ]
+
+    def assertMatchesSerialPlay(self, guesser_class, words, targets, max_guesses):
+        result = play_lockstep(guesser_class, words, targets, max_guesses)
+        self.assertEqual(result.guesser_name, guesser_class.__name__)
+        self.assertEqual(
+            result.games,
+            [
+                play_game(guesser_class, target, words, max_guesses)._replace(
+                    guess_durations=[]
+                )
+                for target in targets
+            ]
+        )
+
+    def test_matches_serial_play(self):
+        for guesser_class in (
+            guessers.FrequentLetterGuesser,
+            guessers.VectorizedFrequentLetterGuesser,
+        ):
+            for max_guesses in (1, 3, 8):
+                self.assertMatchesSerialPlay(
+                    guesser_class,
+                    self.words,
+                    self.words,
+                    max_guesses,
+                )
+
+    def test_matches_serial_play_when_counting_words(self):
+        class WordCountingGuesser(guessers.FrequentLetterGuesser):
+            count_words = True
+
+        self.assertMatchesSerialPlay(WordCountingGuesser, self.words, self.words, 3)
+
+    def test_matches_serial_play_with_weights(self):
+        index = WordIndex.from_weighted(
+            (word, position * 7 % 5 + 1)
+            for position, word in enumerate(self.words)
+        )
+        self.assertMatchesSerialPlay(guessers.FrequentLetterGuesser, index, self.words, 3)
+
+    def test_plays_repeated_targets_in_order(self):
+        targets = ['hoax', 'lull', 'hoax', 'zeitgeist']
+        result = play_lockstep(guessers.FrequentLetterGuesser, self.words, targets)
+        self.assertEqual([game.word for game in result.games], targets)
+
+    def test_rejects_unsupported_guessers(self):
+        with self.assertRaises(ValueError):
+            play_lockstep(guessers.EntropyGuesser, self.words, ['hoax'])
+
+    def test_rejects_unknown_targets(self):
+        with self.assertRaises(ValueError) as cm:
+            play_lockstep(guessers.FrequentLetterGuesser, self.words, ['hoax', 'quux'])
+        self.assertEqual(str(cm.exception), 'quux is not a potential word')
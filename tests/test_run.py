@@ -1,6 +1,12 @@
+import json
+import os
+import subprocess
+import sys
 from unittest import mock, TestCase
 
 import run
+import simulation
+from instrumentation import Instrumentation
 from guessers.base import BaseGuesser
 
 
@@ -15,6 +21,15 @@ class LoadWordsTestCase(TestCase):
         mock_open.assert_called_once_with('/path/to/file')
         self.assertCountEqual(words, ['foo', 'bar', 'baz'])
 
+    def test_normalizes_and_deduplicates_words(self):
+        with mock.patch(
+            'builtins.open',
+            mock.mock_open(read_data="Foo\nfoo\nfoo's\nnaïve\n")
+        ):
+            words = run.load_words('/path/to/file')
+
+        self.assertEqual(words, ['foo', 'naive'])
+
 
 class RunGuesserTestCase(TestCase):
     class PredictableGuesser(BaseGuesser):
@@ -54,8 +69,120 @@ class RunGuesserTestCase(TestCase):
         )
 
 
+class SimulateGuessersTestCase(TestCase):
+    def test_reports_each_guesser(self):
+        with mock.patch.object(simulation, 'simulate') as mock_simulate:
+            mock_simulate.return_value.instrumentation = None
+            with mock.patch('builtins.print') as mock_print:
+                run.simulate_guessers(
+                    ['random', 'frequent'],
+                    ['antediluvian'],
+                    n_games=10,
+                    max_guesses=8,
+                    seed=4
+                )
+
+        mock_simulate.assert_any_call(
+            run.GUESSERS['random'],
+            ['antediluvian'],
+            10,
+            max_guesses=8,
+            seed=4,
+            instrumentation_class=None,
+            adversarial=False,
+            word_penalty=1,
+        )
+        mock_simulate.assert_any_call(
+            run.GUESSERS['frequent'],
+            ['antediluvian'],
+            10,
+            max_guesses=8,
+            seed=4,
+            instrumentation_class=None,
+            adversarial=False,
+            word_penalty=1,
+        )
+        mock_print.assert_called_with(mock_simulate.return_value.summary.return_value)
+        self.assertEqual(mock_print.call_count, 2)
+
+    def test_sweeps_in_parallel(self):
+        with mock.patch.object(simulation, 'simulate_parallel') as mock_parallel:
+            mock_parallel.return_value = [mock.Mock()]
+            with mock.patch('builtins.print'):
+                run.simulate_guessers(
+                    ['frequent'],
+                    ['antediluvian', 'limn'],
+                    n_games=None,
+                    max_guesses=8,
+                    processes=2,
+                    sweep=True,
+                    word_penalty=2,
+                )
+
+        mock_parallel.assert_called_once_with(
+            [run.GUESSERS['frequent']],
+            ['antediluvian', 'limn'],
+            ['antediluvian', 'limn'],
+            max_guesses=8,
+            processes=2,
+            seed=None,
+            instrumentation_class=None,
+            adversarial=False,
+            word_penalty=2,
+            pool=None,
+        )
+
+    def test_reports_instrumentation(self):
+        with mock.patch.object(simulation, 'simulate') as mock_simulate:
+            with mock.patch('builtins.print') as mock_print:
+                results = run.simulate_guessers(
+                    ['frequent'],
+                    ['antediluvian'],
+                    n_games=10,
+                    max_guesses=8,
+                    instrumentation_class=Instrumentation,
+                )
+
+        self.assertEqual(results, {'frequent': mock_simulate.return_value})
+        self.assertEqual(
+            mock_simulate.call_args[1]['instrumentation_class'],
+            Instrumentation
+        )
+        mock_print.assert_called_with(
+            mock_simulate.return_value.instrumentation.summary.return_value
+        )
+
+
 class RunAllGuessersTestCase(TestCase):
     def test_runs_each_guesser(self):
         with mock.patch.object(run, 'run_guesser') as mock_run:
             run.run_all_guessers('antediluvian', ['antediluvian'], max_guesses=8)
         self.assertEqual(mock_run.call_count, len(run.GUESSERS) - 1)
+
+
+class ListGuessersTestCase(TestCase):
+    def test_list_imports_no_guesser_or_numpy(self):
+        script = (
+            'import json, runpy, sys\n'
+            'sys.argv = ["run.py", "--list"]\n'
+            'try:\n'
+            '    runpy.run_path("run.py", run_name="__main__")\n'
+            'except SystemExit:\n'
+            '    pass\n'
+            'sys.stderr.write(json.dumps(sorted(sys.modules)))\n'
+        )
+        process = subprocess.run(
+            [sys.executable, '-c', script],
+            cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            universal_newlines=True,
+            check=True,
+        )
+        self.assertIn('frequent\tguessers.probability:FrequentLetterGuesser', process.stdout)
+        modules = json.loads(process.stderr)
+        self.assertNotIn('numpy', modules)
+        self.assertEqual(
+            [module for module in modules if module.startswith('guessers')],
+            ['guessers', 'guessers.registry'],
+        )
@@ -0,0 +1,202 @@
+import asyncio
+import os
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from unittest import TestCase
+
+from game import WordGuess
+from guessers.exc import TableFlipError
+from index import WordIndex
+from server import GameServer, Session
+
+
+class SessionTestCase(TestCase):
+    def test_state_describes_game_in_progress(self):
+        session = Session('hangman', max_failures=8)
+        self.assertEqual(session.state(), 'STATE ....... 8 -')
+        session.game.process_guess('azy')
+        self.assertEqual(session.state(), 'STATE .a...a. 6 yz')
+
+    def test_state_reports_game_over(self):
+        session = Session('hangman', max_failures=2)
+        session.game.process_guess('hangm')
+        self.assertEqual(session.state(), 'WON hangman')
+
+        session = Session('hangman', max_failures=2)
+        session.game.process_guess('xy')
+        self.assertEqual(session.state(), 'LOST hangman')
+
+    def test_play_counts_word_penalty(self):
+        class WrongWordGuesser:
+            def guess(self, *args, **kwargs):
+                return WordGuess('hangmen')
+
+            def update_state(self, *args, **kwargs):
+                pass
+
+        session = Session('hangman', max_failures=2, guesser=WrongWordGuesser())
+        session.play()
+        self.assertEqual(session.state(), 'STATE ....... 1 hangmen')
+
+        session = Session(
+            'hangman',
+            max_failures=2,
+            guesser=WrongWordGuesser(),
+            word_penalty=2,
+        )
+        session.play()
+        self.assertEqual(session.state(), 'LOST hangman')
+
+    def test_play_loses_when_guesser_gives_up(self):
+        class GivingUpGuesser:
+            def guess(self, *args, **kwargs):
+                raise TableFlipError('No possible solution found')
+
+        session = Session('hangman', max_failures=8, guesser=GivingUpGuesser())
+        session.play()
+        self.assertTrue(session.is_over)
+        self.assertEqual(session.state(), 'LOST hangman')
+
+
+class GameServerTestCase(TestCase):
+    # Number of threads running guessers
+    workers = 1
+
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+        self.addCleanup(self.loop.close)
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.server, self.path = self.start_server(WordIndex(['hangman']))
+
+    def start_server(self, word_index, name='hangman'):
+        """Start a server on a new Unix socket, and return it and its socket's path"""
+        path = os.path.join(self.directory.name, '{}.sock'.format(name))
+        executor = ThreadPoolExecutor(self.workers)
+        self.addCleanup(executor.shutdown)
+        server = GameServer(word_index, max_failures=8, executor=executor)
+        listener = self.loop.run_until_complete(server.start(path))
+        self.addCleanup(self.loop.run_until_complete, listener.wait_closed())
+        self.addCleanup(listener.close)
+        return server, path
+
+    def converse(self, *lines):
+        """Send each line over a connection, and return the replies"""
+        async def converse():
+            reader, writer = await asyncio.open_unix_connection(self.path)
+            replies = []
+            for line in lines:
+                writer.write('{}\n'.format(line).encode('utf-8'))
+                replies.append((await reader.readline()).decode('utf-8').rstrip('\n'))
+            writer.close()
+            return replies
+        return self.loop.run_until_complete(converse())
+
+    def test_client_plays_game(self):
+        self.assertEqual(
+            self.converse('NEW', 'GUESS a', 'guess xz', 'GUESS hngm'),
+            [
+                'STATE ....... 8 -',
+                'STATE .a...a. 8 -',
+                'STATE .a...a. 6 xz',
+                'WON hangman',
+            ],
+        )
+
+    def test_guesses_past_failure_limit_lose_game(self):
+        self.assertEqual(
+            self.converse('NEW', 'GUESS bcdefijklo', 'GUESS a'),
+            ['STATE ....... 8 -', 'LOST hangman', 'ERROR game is over'],
+        )
+
+    def test_guesses_past_win_are_ignored(self):
+        self.assertEqual(
+            self.converse('NEW', 'GUESS hangmxyz'),
+            ['STATE ....... 8 -', 'WON hangman'],
+        )
+
+    def test_guesser_plays_game(self):
+        replies = self.converse('NEW frequent', *['PLAY'] * 5)
+        self.assertEqual(replies[0], 'STATE ....... 8 -')
+        self.assertEqual(replies[1], 'WON hangman')
+        self.assertEqual(replies[2], 'ERROR game is over')
+
+    def test_games_are_served_concurrently(self):
+        async def play(guesser_name):
+            reader, writer = await asyncio.open_unix_connection(self.path)
+            reply = ''
+            for line in ['NEW {}'.format(guesser_name)] + ['PLAY'] * 8:
+                writer.write('{}\n'.format(line).encode('utf-8'))
+                reply = (await reader.readline()).decode('utf-8').strip()
+                if not reply.startswith('STATE'):
+                    break
+            writer.close()
+            return reply
+
+        async def play_all():
+            return await asyncio.gather(
+                *(play(name) for name in ['frequent', 'markov1', 'entropy'] * 10)
+            )
+
+        replies = self.loop.run_until_complete(play_all())
+        self.assertEqual(replies, ['WON hangman'] * 30)
+
+    def test_rejects_invalid_commands(self):
+        self.assertEqual(
+            self.converse('GUESS a', 'JUMP', 'NEW nobody', 'NEW manual'),
+            [
+                'ERROR no game in progress',
+                'ERROR unknown command JUMP',
+                'ERROR unknown guesser nobody',
+                'ERROR unknown guesser manual',
+            ],
+        )
+        self.assertEqual(
+            self.converse('NEW', 'PLAY', 'GUESS 4', 'NEW random', 'GUESS a'),
+            [
+                'STATE ....... 8 -',
+                'ERROR game is played by the client',
+                'ERROR guesses must be letters',
+                'STATE ....... 8 -',
+                'ERROR game is played by a guesser',
+            ],
+        )
+
+    def test_quit_closes_connection(self):
+        async def quit():
+            reader, writer = await asyncio.open_unix_connection(self.path)
+            writer.write(b'QUIT\n')
+            return await reader.read()
+        self.assertEqual(self.loop.run_until_complete(quit()), b'')
+
+
+class ThreadedGameServerTestCase(GameServerTestCase):
+    workers = 4
+
+    def test_prepares_buckets(self):
+        bucket = self.server.word_index.bucket(7)
+        self.assertIsNotNone(bucket._positions)
+        self.assertIsNotNone(bucket._letters)
+
+    def test_guessers_share_buckets_across_threads(self):
+        words = ['abcdefghijkl', 'abcdefghijka', 'bbcdefghijka', 'mnopqrstuvwx']
+        server, path = self.start_server(WordIndex(words), name='long')
+
+        async def play():
+            reader, writer = await asyncio.open_unix_connection(path)
+            reply = ''
+            for line in ['NEW entropy'] + ['PLAY'] * 20:
+                writer.write('{}\n'.format(line).encode('utf-8'))
+                reply = (await reader.readline()).decode('utf-8').strip()
+                if not reply.startswith('STATE'):
+                    break
+            writer.close()
+            return reply
+
+        async def play_all():
+            return await asyncio.gather(*(play() for _ in range(16)))
+
+        replies = self.loop.run_until_complete(play_all())
+        self.assertEqual(len(replies), 16)
+        for reply in replies:
+            self.assertTrue(reply.startswith('WON '), reply)
@@ -0,0 +1,355 @@
+from unittest import mock, TestCase
+
+import simulation
+from game import WordGuess
+from guessers.base import BUDGET_STATS, BaseGuesser
+from guessers.cache import DECISION_CACHE
+from guessers.exc import TableFlipError
+from guessers.memo import memoize
+from guessers.probability import FrequentLetterGuesser
+from index import WordIndex
+from instrumentation import Instrumentation
+
+
+class PredictableGuesser(BaseGuesser):
+    letters_to_guess = []
+
+    def guess(self, *args, **kwargs):
+        return self.letters_to_guess.pop(0)
+
+
+class AlphabeticalGuesser(BaseGuesser):
+    def __init__(self, *args, **kwargs):
+        self.alphabet = list('zyxwvutsrqponmlkjihgfedcba')
+
+    def guess(self, *args, **kwargs):
+        return self.alphabet.pop()
+
+
+class GivingUpGuesser(BaseGuesser):
+    def guess(self, *args, **kwargs):
+        raise TableFlipError('No possible solution found')
+
+
+def make_game(word, has_won, correct_count, incorrect_count, guess_durations):
+    return simulation.GameResult(
+        word=word,
+        guessed_word=word,
+        has_won=has_won,
+        correct_count=correct_count,
+        incorrect_count=incorrect_count,
+        guess_durations=guess_durations,
+    )
+
+
+class PercentileTestCase(TestCase):
+    def test_computes_nearest_rank(self):
+        values = [1, 2, 3, 4, 5, 6, 7, 8, 9, 10]
+        self.assertEqual(simulation.percentile(values, 50), 5)
+        self.assertEqual(simulation.percentile(values, 90), 9)
+        self.assertEqual(simulation.percentile(values, 99), 10)
+        self.assertEqual(simulation.percentile(values, 0), 1)
+
+    def test_handles_empty_values(self):
+        self.assertIsNone(simulation.percentile([], 50))
+
+
+class SimulationResultTestCase(TestCase):
+    def setUp(self):
+        self.result = simulation.SimulationResult(
+            'PredictableGuesser',
+            [
+                make_game('protean', True, 7, 1, [0.1, 0.2]),
+                make_game('deleterious', False, 0, 8, [0.3, 0.4]),
+            ]
+        )
+
+    def test_aggregates_games(self):
+        self.assertEqual(self.result.game_count, 2)
+        self.assertEqual(self.result.win_rate, 0.5)
+        self.assertEqual(self.result.mean_guess_count, 8)
+        self.assertEqual(self.result.guess_durations, [0.1, 0.2, 0.3, 0.4])
+
+    def test_handles_no_games(self):
+        result = simulation.SimulationResult('PredictableGuesser')
+        self.assertEqual(result.win_rate, 0)
+        self.assertEqual(result.mean_guess_count, 0)
+        self.assertEqual(result.latency_percentiles((50,)), {50: None})
+
+    def test_latency_percentiles(self):
+        self.assertEqual(
+            self.result.latency_percentiles((50, 100)),
+            {50: 0.2, 100: 0.4}
+        )
+
+    def test_merge_combines_games(self):
+        other = simulation.SimulationResult(
+            'PredictableGuesser',
+            [make_game('limn', True, 4, 0, [0.5])]
+        )
+        merged = self.result.merge(other)
+        self.assertEqual(merged.guesser_name, 'PredictableGuesser')
+        self.assertEqual(merged.game_count, 3)
+        self.assertEqual(self.result.game_count, 2)
+
+    def test_update_adds_games_in_place(self):
+        games = self.result.games
+        other = simulation.SimulationResult(
+            'PredictableGuesser',
+            [make_game('limn', True, 4, 0, [0.5])]
+        )
+        self.assertIs(self.result.update(other), self.result)
+        self.assertIs(self.result.games, games)
+        self.assertEqual(self.result.game_count, 3)
+
+    def test_summary(self):
+        self.assertEqual(
+            self.result.summary(),
+            'PredictableGuesser won 50.0% of 2 games (8.0 guesses per game)\n'
+            '\tguess latency: p50 200.000ms, p90 400.000ms, p99 400.000ms'
+        )
+
+    def test_summary_omits_unrecorded_latencies(self):
+        result = simulation.SimulationResult(
+            'PredictableGuesser',
+            [game._replace(guess_durations=[]) for game in self.result.games]
+        )
+        self.assertEqual(
+            result.summary(),
+            'PredictableGuesser won 50.0% of 2 games (8.0 guesses per game)'
+        )
+
+
+class PlayGameTestCase(TestCase):
+    def test_records_win(self):
+        PredictableGuesser.letters_to_guess = list('proxtean')
+        result = simulation.play_game(PredictableGuesser, 'protean', ['protean'], 8)
+        self.assertEqual(result.word, 'protean')
+        self.assertEqual(result.guessed_word, 'protean')
+        self.assertTrue(result.has_won)
+        self.assertEqual(result.correct_count, 7)
+        self.assertEqual(result.incorrect_count, 1)
+        self.assertEqual(len(result.guess_durations), 8)
+
+    def test_records_loss(self):
+        PredictableGuesser.letters_to_guess = list('abcdfghjkmn')
+        result = simulation.play_game(PredictableGuesser, 'protean', ['protean'], 3)
+        self.assertEqual(result.guessed_word, '.....a.')
+        self.assertFalse(result.has_won)
+        self.assertEqual(result.correct_count, 1)
+        self.assertEqual(result.incorrect_count, 3)
+
+    def test_wrong_word_guesses_cost_word_penalty(self):
+        for word_penalty, has_won in ((1, True), (2, False)):
+            PredictableGuesser.letters_to_guess = [WordGuess('protein'), 'x', *'protean']
+            result = simulation.play_game(
+                PredictableGuesser,
+                'protean',
+                ['protean'],
+                3,
+                word_penalty=word_penalty,
+            )
+            self.assertEqual(result.has_won, has_won)
+
+    def test_table_flip_loses_game(self):
+        result = simulation.play_game(GivingUpGuesser, 'protean', ['protean'], 8)
+        self.assertFalse(result.has_won)
+        self.assertEqual(result.guessed_word, '.......')
+        self.assertEqual(len(result.guess_durations), 1)
+
+    def test_adversarial_game_settles_on_a_word_of_same_length(self):
+        words = ['bad', 'bed', 'bid', 'bod', 'ace', 'protean']
+        result = simulation.play_game(AlphabeticalGuesser, 'bad', words, 26, adversarial=True)
+        self.assertEqual(result.word, 'bod')
+        self.assertTrue(result.has_won)
+        self.assertEqual(result.incorrect_count, 12)
+
+    def test_verbose_reports_progress(self):
+        PredictableGuesser.letters_to_guess = list('ab')
+        with mock.patch('builtins.print') as mock_print:
+            simulation.play_game(PredictableGuesser, 'ab', ['ab'], 8, verbose=True)
+        mock_print.assert_any_call('PredictableGuesser guessed a\n')
+        self.assertEqual(mock_print.call_count, 4)
+
+    def test_instrumented_game_matches_plain_game(self):
+        instrumentation = Instrumentation()
+        index = WordIndex(['latter', 'barrel', 'rabbit', 'bottle'])
+        plain = simulation.play_game(FrequentLetterGuesser, 'rabbit', index, 8)
+        instrumented = simulation.play_game(
+            FrequentLetterGuesser,
+            'rabbit',
+            index,
+            8,
+            instrumentation=instrumentation,
+        )
+        self.assertEqual(
+            instrumented._replace(guess_durations=[]),
+            plain._replace(guess_durations=[])
+        )
+
+        turns = len(instrumented.guess_durations)
+        self.assertEqual(instrumentation.calls['construct'], 1)
+        for phase in ('guess', 'process_guess', 'update_state'):
+            self.assertEqual(instrumentation.calls[phase], turns)
+        self.assertEqual(instrumentation.counters['turns'], turns)
+        self.assertEqual(instrumentation.counters['wins'], 1)
+        self.assertEqual(instrumentation.samples['candidates'][0], 4)
+
+    def test_instrumentation_counts_table_flips(self):
+        instrumentation = Instrumentation()
+        simulation.play_game(
+            GivingUpGuesser,
+            'protean',
+            ['protean'],
+            8,
+            instrumentation=instrumentation,
+        )
+        self.assertEqual(instrumentation.counters['table_flips'], 1)
+        self.assertEqual(instrumentation.counters['wins'], 0)
+        self.assertNotIn('candidates', instrumentation.samples)
+
+
+class SimulateTestCase(TestCase):
+    words = ['protean', 'limn', 'sybaritic', 'toroidal']
+
+    def test_plays_requested_games(self):
+        result = simulation.simulate(AlphabeticalGuesser, self.words, 10, max_guesses=26)
+        self.assertEqual(result.guesser_name, 'AlphabeticalGuesser')
+        self.assertEqual(result.game_count, 10)
+        self.assertEqual(result.win_rate, 1)
+        for game in result.games:
+            self.assertIn(game.word, self.words)
+
+    def test_instruments_games(self):
+        result = simulation.simulate(
+            AlphabeticalGuesser,
+            self.words,
+            10,
+            max_guesses=26,
+            instrumentation_class=Instrumentation,
+        )
+        self.assertIsInstance(result.instrumentation, Instrumentation)
+        self.assertEqual(result.instrumentation.counters['games'], 10)
+        self.assertIsNone(simulation.simulate(AlphabeticalGuesser, self.words, 1).instrumentation)
+
+    def test_accepts_word_index(self):
+        result = simulation.simulate(
+            AlphabeticalGuesser,
+            WordIndex(self.words),
+            5,
+            max_guesses=26
+        )
+        self.assertEqual(result.game_count, 5)
+
+    def test_seed_makes_results_reproducible(self):
+        first = simulation.simulate(AlphabeticalGuesser, self.words, 10, seed=3)
+        second = simulation.simulate(AlphabeticalGuesser, self.words, 10, seed=3)
+        self.assertEqual(
+            [game.word for game in first.games],
+            [game.word for game in second.games]
+        )
+        self.assertEqual(
+            [game.has_won for game in first.games],
+            [game.has_won for game in second.games]
+        )
+
+
+class SampleTargetsTestCase(TestCase):
+    def test_samples_with_seed(self):
+        words = ['protean', 'limn', 'sybaritic', 'toroidal']
+        targets = simulation.sample_targets(words, 20, seed=5)
+        self.assertEqual(len(targets), 20)
+        self.assertTrue(set(targets).issubset(words))
+        self.assertEqual(targets, simulation.sample_targets(words, 20, seed=5))
+
+    def test_samples_weighted_index_by_weight(self):
+        index = WordIndex.from_weighted([('protean', 1), ('limn', 0), ('toroidal', 99)])
+        targets = simulation.sample_targets(index, 200, seed=5)
+        self.assertNotIn('limn', targets)
+        self.assertGreater(targets.count('toroidal'), 150)
+
+
+class SimulateParallelTestCase(TestCase):
+    words = ['protean', 'limn', 'sybaritic', 'toroidal', 'zeitgeist']
+
+    def test_plays_every_target_with_each_guesser(self):
+        results = simulation.simulate_parallel(
+            [AlphabeticalGuesser, GivingUpGuesser],
+            self.words,
+            self.words * 3,
+            max_guesses=26,
+            processes=2,
+            shard_size=4,
+        )
+        self.assertEqual(
+            [result.guesser_name for result in results],
+            ['AlphabeticalGuesser', 'GivingUpGuesser']
+        )
+        self.assertEqual(
+            [game.word for game in results[0].games],
+            self.words * 3
+        )
+        self.assertEqual(results[0].win_rate, 1)
+        self.assertEqual(results[1].game_count, 15)
+        self.assertEqual(results[1].win_rate, 0)
+
+    def test_matches_serial_play(self):
+        results = simulation.simulate_parallel(
+            [AlphabeticalGuesser],
+            WordIndex(self.words),
+            self.words,
+            processes=2,
+            shard_size=2,
+        )
+        self.assertEqual(
+            results[0].games,
+            [
+                simulation.play_game(AlphabeticalGuesser, word, self.words, 8)
+                ._replace(guess_durations=game.guess_durations)
+                for word, game in zip(self.words, results[0].games)
+            ]
+        )
+
+    def test_merges_instrumentation_across_shards(self):
+        results = simulation.simulate_parallel(
+            [AlphabeticalGuesser],
+            self.words,
+            self.words * 3,
+            max_guesses=26,
+            processes=2,
+            shard_size=4,
+            instrumentation_class=Instrumentation,
+        )
+        instrumentation = results[0].instrumentation
+        self.assertEqual(instrumentation.counters['games'], 15)
+        self.assertEqual(instrumentation.calls['construct'], 15)
+
+    def test_merges_memoized_decisions_from_workers(self):
+        DECISION_CACHE.clear()
+        self.addCleanup(DECISION_CACHE.clear)
+        results = simulation.simulate_parallel(
+            [memoize(FrequentLetterGuesser)],
+            self.words,
+            self.words * 2,
+            processes=2,
+            shard_size=5,
+        )
+        turns = sum(len(game.guess_durations) for game in results[0].games)
+        self.assertEqual(DECISION_CACHE.hits + DECISION_CACHE.misses, turns)
+        self.assertGreater(DECISION_CACHE.hits, 0)
+        self.assertGreater(len(DECISION_CACHE), 0)
+
+    def test_merges_budget_stats_from_workers(self):
+        BUDGET_STATS.clear()
+        self.addCleanup(BUDGET_STATS.clear)
+        with mock.patch.object(FrequentLetterGuesser, 'time_budget', 0):
+            results = simulation.simulate_parallel(
+                [FrequentLetterGuesser],
+                self.words,
+                self.words * 2,
+                processes=2,
+                shard_size=5,
+            )
+        turns = sum(len(game.guess_durations) for game in results[0].games)
+        self.assertEqual(BUDGET_STATS.guesses, turns)
+        self.assertGreater(BUDGET_STATS.fallbacks, 0)